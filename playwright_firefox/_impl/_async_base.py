@@ -61,8 +61,10 @@ class AsyncEventContextManager(Generic[T], AbstractAsyncContextManager):
 
 
 class AsyncBase(ImplWrapper):
+    __slots__ = ("_loop",)
+
     def __init__(self, impl_obj: Any) -> None:
-        super().__init__(impl_obj)
+        self._impl_obj = impl_obj
         self._loop = impl_obj._loop
 
     def __str__(self) -> str:
@@ -91,6 +93,8 @@ class AsyncBase(ImplWrapper):
 
 
 class AsyncContextManager(AsyncBase):
+    __slots__ = ()
+
     async def __aenter__(self: Self) -> Self:
         return self
 
@@ -38,7 +38,7 @@ from playwright_firefox._impl._artifact import Artifact
 from playwright_firefox._impl._browser_context import BrowserContext
 from playwright_firefox._impl._cdp_session import CDPSession
 from playwright_firefox._impl._connection import ChannelOwner, from_channel
-from playwright_firefox._impl._errors import is_target_closed_error
+from playwright_firefox._impl._errors import Error, is_target_closed_error
 from playwright_firefox._impl._helper import (
     ColorScheme,
     Contrast,
@@ -170,13 +170,18 @@ class Browser(ChannelOwner):
 
         channel = await self._channel.send("newContext", None, params)
         context = cast(BrowserContext, from_channel(channel))
-        await context._initialize_har_from_options(
-            record_har_content=recordHarContent,
-            record_har_mode=recordHarMode,
-            record_har_omit_content=recordHarOmitContent,
-            record_har_path=recordHarPath,
-            record_har_url_filter=recordHarUrlFilter,
-        )
+        try:
+            await context._initialize_har_from_options(
+                record_har_content=recordHarContent,
+                record_har_mode=recordHarMode,
+                record_har_omit_content=recordHarOmitContent,
+                record_har_path=recordHarPath,
+                record_har_url_filter=recordHarUrlFilter,
+            )
+        except Error:
+            # Unsupported HAR options must not leave the context open.
+            await context.close()
+            raise
         return context
 
     async def new_page(
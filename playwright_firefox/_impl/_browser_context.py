@@ -52,6 +52,7 @@ from playwright_firefox._impl._event_context_manager import EventContextManagerI
 from playwright_firefox._impl._fetch import APIRequestContext
 from playwright_firefox._impl._frame import Frame
 from playwright_firefox._impl._har_router import HarRouter
+from playwright_firefox._impl._har_stream import HarStreamRecorder, is_har_stream
 from playwright_firefox._impl._helper import (
     HarContentPolicy,
     HarMode,
@@ -59,6 +60,7 @@ from playwright_firefox._impl._helper import (
     RouteFromHarNotFoundPolicy,
     RouteHandler,
     RouteHandlerCallback,
+    RouteIndex,
     TimeoutSettings,
     URLMatch,
     WebSocketRouteHandlerCallback,
@@ -77,6 +79,10 @@ from playwright_firefox._impl._network import (
     serialize_headers,
 )
 from playwright_firefox._impl._page import BindingCall, Page, Worker
+from playwright_firefox._impl._response_cache import (
+    ResponseCache,
+    shared_response_cache,
+)
 from playwright_firefox._impl._str_utils import escape_regex_flags
 from playwright_firefox._impl._tracing import Tracing
 from playwright_firefox._impl._waiter import Waiter
@@ -113,17 +119,24 @@ class BrowserContext(ChannelOwner):
             self._browser._contexts.append(self)
         self._pages: List[Page] = []
         self._routes: List[RouteHandler] = []
+        self._route_index = RouteIndex()
         self._web_socket_routes: List[WebSocketRouteHandler] = []
         self._bindings: Dict[str, Any] = {}
         self._timeout_settings = TimeoutSettings(None)
         self._owner_page: Optional[Page] = None
-        self._options: Dict[str, Any] = {'viewport': {'width': 1280, 'height': 720}, 'acceptDownloads': 'accept', 'serviceWorkers': 'block', 'selectorEngines': []}  # initializer["options"]
+        self._options: Dict[str, Any] = {
+            "viewport": {"width": 1280, "height": 720},
+            "acceptDownloads": "accept",
+            "serviceWorkers": "block",
+            "selectorEngines": [],
+        }  # initializer["options"]
         self._background_pages: Set[Page] = set()
         self._service_workers: Set[Worker] = set()
         self._base_url: Optional[str] = self._options.get("baseURL")
         self._videos_dir: Optional[str] = self._options.get("recordVideo")
         self._tracing = cast(Tracing, from_channel(initializer["tracing"]))
         self._har_recorders: Dict[str, HarRecordingMetadata] = {}
+        self._har_streams: List[HarStreamRecorder] = []
         self._request: APIRequestContext = from_channel(initializer["requestContext"])
         self._clock = Clock(self)
         self._channel.on(
@@ -236,7 +249,7 @@ class BrowserContext(ChannelOwner):
     async def _on_route(self, route: Route) -> None:
         route._context = self
         page = route.request._safe_page()
-        route_handlers = self._routes.copy()
+        route_handlers = self._route_index.candidates(self._routes, route.request.url)
         for route_handler in route_handlers:
             # If the page or the context was closed we stall all requests right away.
             if (page and page._close_was_called) or self._closing_or_closed:
@@ -247,6 +260,7 @@ class BrowserContext(ChannelOwner):
                 continue
             if route_handler.will_expire:
                 self._routes.remove(route_handler)
+                self._route_index.invalidate()
             try:
                 handled = await route_handler.handle(route)
             finally:
@@ -434,6 +448,7 @@ class BrowserContext(ChannelOwner):
                 times,
             ),
         )
+        self._route_index.invalidate()
         await self._update_interception_patterns()
 
     async def unroute(
@@ -455,6 +470,7 @@ class BrowserContext(ChannelOwner):
         behavior: Literal["default", "ignoreErrors", "wait"] = None,
     ) -> None:
         self._routes = remaining
+        self._route_index.invalidate()
         # if behavior is not None and behavior != "default":
         #     await asyncio.gather(*map(lambda router: router.stop(behavior), removed))  # type: ignore
         await self._update_interception_patterns()
@@ -492,6 +508,21 @@ class BrowserContext(ChannelOwner):
         update_mode: HarMode = None,
     ) -> None:
         update_content = update_content or "attach"
+        if is_har_stream(str(har)):
+            # The driver only exports a HAR once recording is over, streams are
+            # recorded here so that each entry is written as soon as possible.
+            recorder = HarStreamRecorder(
+                str(har), update_content, update_mode, self._options.get("baseURL"), url
+            )
+            self._har_streams.append(recorder)
+            if page:
+                page.on(Page.Events.RequestFinished, recorder.on_request_finished)
+            else:
+                self.on(
+                    BrowserContext.Events.RequestFinished,
+                    recorder.on_request_finished,
+                )
+            return
         params: Dict[str, Any] = {
             "options": {
                 "zip": str(har).endswith(".zip"),
@@ -539,6 +570,19 @@ class BrowserContext(ChannelOwner):
         self._har_routers.append(router)
         await router.add_context_route(self)
 
+    async def route_cache(
+        self,
+        url: Union[Pattern[str], str] = None,
+        store: ResponseCache = None,
+    ) -> None:
+        cache = store or shared_response_cache()
+        # Async routes await the returned task, the sync API doesn't await the
+        # result of route handlers so it can't be a bare coroutine.
+        await self.route(
+            url=url or "**/*",
+            handler=lambda route, _: asyncio.create_task(cache._handle(route)),
+        )
+
     async def _update_interception_patterns(self) -> None:
         patterns = RouteHandler.prepare_interception_patterns(self._routes)
         await self._channel.send(
@@ -587,6 +631,8 @@ class BrowserContext(ChannelOwner):
                 )
 
         self._dispose_har_routers()
+        for recorder in self._har_streams:
+            recorder.dispose()
         self._tracing._reset_stack_counter()
         self.emit(BrowserContext.Events.Close, self)
 
@@ -599,6 +645,8 @@ class BrowserContext(ChannelOwner):
         await self.request.dispose(reason=reason)
 
         async def _inner_close() -> None:
+            for recorder in self._har_streams:
+                await recorder.close()
             for har_id, params in self._har_recorders.items():
                 har = cast(
                     Artifact,
@@ -45,7 +45,10 @@ from playwright_firefox._impl._helper import (
     locals_to_params,
 )
 from playwright_firefox._impl._json_pipe import JsonPipeTransport
-from playwright_firefox._impl._network import serialize_headers, to_client_certificates_protocol
+from playwright_firefox._impl._network import (
+    serialize_headers,
+    to_client_certificates_protocol,
+)
 from playwright_firefox._impl._waiter import throw_on_timeout
 
 if TYPE_CHECKING:
@@ -174,13 +177,18 @@ class BrowserType(ChannelOwner):
             self, str(tracesDir) if tracesDir is not None else None
         )
         context = cast(BrowserContext, from_channel(result["context"]))
-        await context._initialize_har_from_options(
-            record_har_content=recordHarContent,
-            record_har_mode=recordHarMode,
-            record_har_omit_content=recordHarOmitContent,
-            record_har_path=recordHarPath,
-            record_har_url_filter=recordHarUrlFilter,
-        )
+        try:
+            await context._initialize_har_from_options(
+                record_har_content=recordHarContent,
+                record_har_mode=recordHarMode,
+                record_har_omit_content=recordHarOmitContent,
+                record_har_path=recordHarPath,
+                record_har_url_filter=recordHarUrlFilter,
+            )
+        except Error:
+            # Unsupported HAR options must not leave the browser running.
+            await context.close()
+            raise
         return context
 
     def _user_data_dir(self, userDataDir: Optional[Union[str, Path]]) -> str:
@@ -246,6 +254,7 @@ class BrowserType(ChannelOwner):
             transport,
             self._connection._loop,
             local_utils=self._connection.local_utils,
+            metrics=self._connection._metrics,
         )
         connection.mark_as_remote()
 
@@ -16,10 +16,14 @@ import asyncio
 import collections.abc
 import contextvars
 import datetime
-import inspect
+import functools
+import os
 import sys
+import threading
+import time
 import traceback
 from pathlib import Path
+from types import FrameType, MappingProxyType
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -28,6 +32,8 @@ from typing import (
     List,
     Mapping,
     Optional,
+    Set,
+    Tuple,
     TypedDict,
     Union,
     cast,
@@ -39,8 +45,18 @@ from pyee.asyncio import AsyncIOEventEmitter
 import playwright_firefox
 import playwright_firefox._impl._impl_to_api_mapping
 from playwright_firefox._impl._errors import TargetClosedError, rewrite_error
-from playwright_firefox._impl._greenlets import EventGreenlet
-from playwright_firefox._impl._helper import Error, ParsedMessagePayload, parse_error
+from playwright_firefox._impl._greenlets import (
+    EventGreenlet,
+    GreenletProfiler,
+    is_worker_thread,
+)
+from playwright_firefox._impl._helper import (
+    Error,
+    LazyDict,
+    ParsedMessagePayload,
+    parse_error,
+)
+from playwright_firefox._impl._metrics import ProtocolMetrics, is_metrics_enabled
 from playwright_firefox._impl._transport import Transport
 
 if TYPE_CHECKING:
@@ -50,13 +66,51 @@ if TYPE_CHECKING:
 TimeoutCalculator = Optional[Callable[[Optional[float]], float]]
 
 
-class Channel(AsyncIOEventEmitter):
+# Payload values that never need to be converted.
+_PRIMITIVE_TYPES = frozenset((str, int, float, bool))
+
+
+class LazyEventEmitter(AsyncIOEventEmitter):
+    """An emitter that allocates its listener state on the first listener.
+
+    Most objects never get a listener, they share the empty class level state
+    instead of holding their own dict, lock and set of pending handlers.
+    """
+
+    _events: Dict = MappingProxyType({})  # type: ignore
+    _lock = threading.Lock()
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        self._loop = loop
+
+    @functools.cached_property
+    def _waiting(self) -> Set[asyncio.Future]:  # type: ignore
+        return set()
+
+    def _add_event_handler(self, event: str, k: Any, v: Any) -> None:
+        if "_events" not in self.__dict__:
+            self._events = {}
+            self._lock = threading.Lock()
+        super()._add_event_handler(event, k, v)
+
+    def remove_all_listeners(self, event: Optional[str] = None) -> None:
+        if "_events" in self.__dict__:
+            super().remove_all_listeners(event)
+
+
+class Channel(LazyEventEmitter):
     def __init__(self, connection: "Connection", object: "ChannelOwner") -> None:
         super().__init__()
         self._connection = connection
         self._guid = object._guid
         self._object = object
-        self.on("error", lambda exc: self._connection._on_event_listener_error(exc))
+
+    def _emit_handle_potential_error(self, event: str, error: Any) -> None:
+        # Errors raised by async listeners are reported like those of sync ones.
+        if event == "error":
+            self._connection._on_event_listener_error(error)
+            return
+        super()._emit_handle_potential_error(event, error)
 
     async def send(
         self,
@@ -94,6 +148,14 @@ class Channel(AsyncIOEventEmitter):
         is_internal: bool = False,
         title: str = None,
     ) -> None:
+        if is_worker_thread(self._connection._dispatcher_fiber):
+            # Messages are only sent from the dispatcher thread.
+            self._connection._loop.call_soon_threadsafe(
+                lambda: self.send_no_reply(
+                    method, timeout_calculator, params, is_internal, title
+                )
+            )
+            return
         # No reply messages are used to e.g. waitForEventInfo(after).
         self._connection.wrap_api_call_sync(
             lambda: self._connection._send_message_to_server(
@@ -117,19 +179,17 @@ class Channel(AsyncIOEventEmitter):
             error = self._connection._error
             self._connection._error = None
             raise error
+        transport = self._connection._transport
+        await transport.drain()
+        if transport.on_error_future.done():
+            # Raises the transport error (or CancelledError once disposed).
+            transport.on_error_future.result()
         callback = self._connection._send_message_to_server(
             self._object, method, _augment_params(params, timeout_calculator)
         )
-        done, _ = await asyncio.wait(
-            {
-                self._connection._transport.on_error_future,
-                callback.future,
-            },
-            return_when=asyncio.FIRST_COMPLETED,
-        )
-        if not callback.future.done():
-            callback.future.cancel()
-        result = next(iter(done)).result()
+        # Cancelling the calling task cancels the callback future as well, transport
+        # failures are propagated to it by Connection._on_transport_error.
+        result = await callback.future
         # Protocol now has named return values, assume result is one level deeper unless
         # there is explicit ambiguity.
         if not result:
@@ -144,7 +204,7 @@ class Channel(AsyncIOEventEmitter):
         return result[key]
 
 
-class ChannelOwner(AsyncIOEventEmitter):
+class ChannelOwner(LazyEventEmitter):
     def __init__(
         self,
         parent: Union["ChannelOwner", "Connection"],
@@ -218,26 +278,14 @@ class ChannelOwner(AsyncIOEventEmitter):
 
 
 class ProtocolCallback:
-    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
-        self.stack_trace: traceback.StackSummary
-        self.no_reply: bool
-        self.future = loop.create_future()
-        # The outer task can get cancelled by the user, this forwards the cancellation to the inner task.
-        current_task = asyncio.current_task()
-
-        def cb(task: asyncio.Task) -> None:
-            if current_task:
-                current_task.remove_done_callback(cb)
-            if task.cancelled():
-                self.future.cancel()
-
-        if current_task:
-            current_task.add_done_callback(cb)
-            self.future.add_done_callback(
-                lambda _: (
-                    current_task.remove_done_callback(cb) if current_task else None
-                )
-            )
+    __slots__ = ("future", "no_reply", "stack_frame", "stack_frames")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, no_reply: bool) -> None:
+        self.future: asyncio.Future = loop.create_future()
+        self.no_reply = no_reply
+        # Frame of a sync API caller, blocked until the call completes.
+        self.stack_frame: Optional[FrameType] = None
+        self.stack_frames: Optional[CapturedFrames] = None
 
 
 class RootChannelOwner(ChannelOwner):
@@ -264,11 +312,18 @@ class Connection(EventEmitter):
         transport: Transport,
         loop: asyncio.AbstractEventLoop,
         local_utils: Optional["LocalUtils"] = None,
+        metrics: Optional[ProtocolMetrics] = None,
     ) -> None:
         super().__init__()
         self._dispatcher_fiber = dispatcher_fiber
         self._transport = transport
-        self._transport.on_message = lambda msg: self.dispatch(msg)
+        self._transport.on_message = lambda msg, size: self.dispatch(msg, size)
+        self._transport.on_error_future.add_done_callback(self._on_transport_error)
+        self._metrics = metrics or (ProtocolMetrics() if is_metrics_enabled() else None)
+        # Set by the sync context manager, greenlets are only used by the sync API.
+        self._greenlet_profiler: Optional[GreenletProfiler] = None
+        if self._metrics:
+            self._transport.on_flush = self._metrics.on_flush
         self._waiting_for_object: Dict[str, Callable[[ChannelOwner], None]] = {}
         self._last_id = 0
         self._objects: Dict[str, ChannelOwner] = {}
@@ -281,9 +336,11 @@ class Connection(EventEmitter):
         self._error: Optional[BaseException] = None
         self.is_remote = False
         self._init_task: Optional[asyncio.Task] = None
-        self._api_zone: contextvars.ContextVar[Optional[ParsedStackTrace]] = (
+        self._api_zone: contextvars.ContextVar[Optional[CallSite]] = (
             contextvars.ContextVar("ApiZone", default=None)
         )
+        # When set, the user's call site is only resolved for tracing and errors.
+        self._lazy_call_sites = bool(os.environ.get("PLAYWRIGHT_LAZY_CALL_SITES"))
         self._local_utils: Optional["LocalUtils"] = local_utils
         self._tracing_count = 0
         self._closed_error: Optional[Exception] = None
@@ -328,6 +385,9 @@ class Connection(EventEmitter):
             self._init_task.cancel()
         for ws_connection in self._child_ws_connections:
             ws_connection._transport.dispose()
+        if self._metrics:
+            for callback in self._callbacks.values():
+                self._metrics.on_response(callback, True)
         for callback in self._callbacks.values():
             # To prevent 'Future exception was never retrieved' we ignore all callbacks that are no_reply.
             if callback.no_reply:
@@ -338,6 +398,19 @@ class Connection(EventEmitter):
         self._callbacks.clear()
         self.emit("close")
 
+    def _on_transport_error(self, future: asyncio.Future) -> None:
+        # Fail every pending call once, callers only await their own future.
+        for callback in self._callbacks.values():
+            if self._metrics:
+                self._metrics.on_response(callback, True)
+            if callback.no_reply or callback.future.done():
+                continue
+            if future.cancelled():
+                callback.future.cancel()
+            else:
+                callback.future.set_exception(cast(BaseException, future.exception()))
+        self._callbacks.clear()
+
     def call_on_object_with_known_name(
         self, guid: str, callback: Callable[[ChannelOwner], None]
     ) -> None:
@@ -360,56 +433,61 @@ class Connection(EventEmitter):
             )
         self._last_id += 1
         id = self._last_id
-        callback = ProtocolCallback(self._loop)
+        callback = ProtocolCallback(self._loop, no_reply)
         task = asyncio.current_task(self._loop)
-        callback.stack_trace = cast(
-            traceback.StackSummary,
-            getattr(task, "__pw_stack_trace__", traceback.extract_stack(limit=10)),
-        )
-        callback.no_reply = no_reply
+        callback.stack_frame = getattr(task, "__pw_frame__", None)
+        if callback.stack_frame is None and not self._lazy_call_sites:
+            # Only formatted if the call fails. In lazy mode errors keep the stack
+            # reported by the driver instead.
+            callback.stack_frames = capture_frames(sys._getframe(), limit=10)
         self._callbacks[id] = callback
-        stack_trace_information = cast(ParsedStackTrace, self._api_zone.get())
-        frames = stack_trace_information.get("frames", [])
-        location = (
-            {
+        call_site = cast(CallSite, self._api_zone.get())
+        metadata: Dict[str, Any] = {
+            "wallTime": int(datetime.datetime.now().timestamp() * 1000),
+        }
+        if self._lazy_call_sites and self._tracing_count == 0:
+            # The user's frames are only consumed by tracing, only the frame the
+            # call was made from is resolved for the location.
+            stack_trace_information = call_site.parse(max_frames=1)
+        else:
+            stack_trace_information = call_site.parse()
+        frames = stack_trace_information["frames"]
+        metadata["apiName"] = stack_trace_information["apiName"]
+        metadata["internal"] = not stack_trace_information["apiName"]
+        if frames:
+            metadata["location"] = {
                 "file": frames[0]["file"],
                 "line": frames[0]["line"],
                 "column": frames[0]["column"],
             }
-            if frames
-            else None
-        )
-        metadata = {
-            "wallTime": int(datetime.datetime.now().timestamp() * 1000),
-            "apiName": stack_trace_information["apiName"],
-            "internal": not stack_trace_information["apiName"],
-        }
-        if location:
-            metadata["location"] = location  # type: ignore
-        title = stack_trace_information["title"]
-        if title:
-            metadata["title"] = title
+        if call_site.title:
+            metadata["title"] = call_site.title
         message = {
             "id": id,
             "guid": object._guid,
             "method": method,
-            "params": self._replace_channels_with_guids(params),
+            "params": self._params_to_wire(params),
             "metadata": metadata,
         }
         if self._tracing_count > 0 and frames and object._guid != "localUtils":
             self.local_utils.add_stack_to_tracing_no_reply(id, frames)
 
-        self._transport.send(message)
-        self._callbacks[id] = callback
+        size = self._transport.send(message)
+        if self._metrics:
+            self._metrics.on_request(callback, f"{object._type}.{method}", size)
 
         return callback
 
-    def dispatch(self, msg: ParsedMessagePayload) -> None:
+    def dispatch(self, msg: ParsedMessagePayload, size: int = 0) -> None:
         if self._closed_error:
             return
         id = msg.get("id")
         if id:
             callback = self._callbacks.pop(id)
+            if self._metrics:
+                self._metrics.on_response(
+                    callback, bool(msg.get("error") and not msg.get("result")), size
+                )
             if callback.future.cancelled():
                 return
             # No reply messages are used to e.g. waitForEventInfo(after) which returns exceptions on page close.
@@ -421,7 +499,11 @@ class Connection(EventEmitter):
                 parsed_error = parse_error(
                     error["error"], format_call_log(msg.get("log"))  # type: ignore
                 )
-                parsed_error._stack = "".join(callback.stack_trace.format())
+                stack_frames = callback.stack_frames
+                if callback.stack_frame is not None:
+                    stack_frames = capture_frames(callback.stack_frame, limit=10)
+                if stack_frames is not None:
+                    parsed_error._stack = "".join(_stack_summary(stack_frames).format())
                 callback.future.set_exception(parsed_error)
             else:
                 result = self._replace_guids_with_channels(msg.get("result"))
@@ -456,10 +538,22 @@ class Connection(EventEmitter):
             self._objects[guid]._dispose(cast(Optional[str], params.get("reason")))
             return
         object = self._objects[guid]
-        should_replace_guids_with_channels = "jsonPipe@" not in guid
+        listeners = object._channel.listeners(method)
+        if not listeners:
+            # Nobody listens to this event, don't pay for converting its params.
+            if self._metrics:
+                self._metrics.on_event(f"{object._type}.{method}", 0, size)
+            return
+        event_params: Any = params
+        if "jsonPipe@" not in guid:
+            if params and params.get("guid") not in self._objects:
+                event_params = EventParams(self, cast(Dict, params))
+            else:
+                event_params = self._replace_guids_with_channels(params)
+        start = time.perf_counter() if self._metrics else 0
         try:
             if self._is_sync:
-                for listener in object._channel.listeners(method):
+                for listener in listeners:
                     # Event handlers like route/locatorHandlerTriggered require us to perform async work.
                     # In order to report their potential errors to the user, we need to catch it and store it in the connection
                     def _done_callback(future: asyncio.Future) -> None:
@@ -476,19 +570,15 @@ class Connection(EventEmitter):
                     # and switch to them in order, until they block inside and pass control to each
                     # other and then eventually back to dispatcher as listener functions return.
                     g = EventGreenlet(_listener_with_error_handler_attached)
-                    if should_replace_guids_with_channels:
-                        g.switch(self._replace_guids_with_channels(params))
-                    else:
-                        g.switch(params)
+                    g.switch(event_params)
             else:
-                if should_replace_guids_with_channels:
-                    object._channel.emit(
-                        method, self._replace_guids_with_channels(params)
-                    )
-                else:
-                    object._channel.emit(method, params)
+                object._channel.emit(method, event_params)
         except BaseException as exc:
             self._on_event_listener_error(exc)
+        if self._metrics:
+            self._metrics.on_event(
+                f"{object._type}.{method}", (time.perf_counter() - start) * 1000, size
+            )
 
     def _on_event_listener_error(self, exc: BaseException) -> None:
         print("Error occurred in event listener", file=sys.stderr)
@@ -499,45 +589,74 @@ class Connection(EventEmitter):
     def _create_remote_object(
         self, parent: ChannelOwner, type: str, guid: str, initializer: Dict
     ) -> ChannelOwner:
-        initializer = self._replace_guids_with_channels(initializer)
-        result = self._object_factory(parent, type, guid, initializer)
+        result = self._object_factory(
+            parent, type, guid, Initializer(self, initializer)
+        )
         if guid in self._waiting_for_object:
             self._waiting_for_object.pop(guid)(result)
         return result
 
+    def _params_to_wire(self, params: Mapping) -> Dict:
+        # Drops None values from (nested) dicts and replaces channels with guids
+        # while copying the params once.
+        result = {}
+        for key, value in params.items():
+            if value is None:
+                continue
+            if type(value) in _PRIMITIVE_TYPES:
+                result[key] = value
+            elif isinstance(value, dict):
+                result[key] = self._params_to_wire(value)
+            else:
+                result[key] = self._replace_channels_with_guids(value)
+        return result
+
     def _replace_channels_with_guids(
         self,
         payload: Any,
     ) -> Any:
-        if payload is None:
+        if payload is None or type(payload) in _PRIMITIVE_TYPES:
             return payload
-        if isinstance(payload, Path):
-            return str(payload)
-        if isinstance(payload, collections.abc.Sequence) and not isinstance(
-            payload, str
-        ):
-            return list(map(self._replace_channels_with_guids, payload))
         if isinstance(payload, Channel):
             return dict(guid=payload._guid)
         if isinstance(payload, dict):
             result = {}
             for key, value in payload.items():
-                result[key] = self._replace_channels_with_guids(value)
+                if type(value) not in _PRIMITIVE_TYPES:
+                    value = self._replace_channels_with_guids(value)
+                result[key] = value
             return result
+        if isinstance(payload, list):
+            items = []
+            for value in payload:
+                if type(value) not in _PRIMITIVE_TYPES:
+                    value = self._replace_channels_with_guids(value)
+                items.append(value)
+            return items
+        if isinstance(payload, Path):
+            return str(payload)
+        if isinstance(payload, collections.abc.Sequence) and not isinstance(
+            payload, str
+        ):
+            return list(map(self._replace_channels_with_guids, payload))
         return payload
 
     def _replace_guids_with_channels(self, payload: Any) -> Any:
-        if payload is None:
-            return payload
-        if isinstance(payload, list):
-            return list(map(self._replace_guids_with_channels, payload))
+        # Payloads come straight from the transport and are not shared, they are
+        # converted in place instead of being copied.
         if isinstance(payload, dict):
-            if payload.get("guid") in self._objects:
-                return self._objects[payload["guid"]]._channel
-            result = {}
+            guid = payload.get("guid")
+            if guid in self._objects:
+                return self._objects[guid]._channel
             for key, value in payload.items():
-                result[key] = self._replace_guids_with_channels(value)
-            return result
+                if isinstance(value, (dict, list)):
+                    payload[key] = self._replace_guids_with_channels(value)
+            return payload
+        if isinstance(payload, list):
+            for index, value in enumerate(payload):
+                if isinstance(value, (dict, list)):
+                    payload[index] = self._replace_guids_with_channels(value)
+            return payload
         return payload
 
     async def wrap_api_call(
@@ -545,17 +664,14 @@ class Connection(EventEmitter):
     ) -> Any:
         if self._api_zone.get():
             return await cb()
-        task = asyncio.current_task(self._loop)
-        st: List[inspect.FrameInfo] = getattr(
-            task, "__pw_stack__", None
-        ) or inspect.stack(0)
-
-        parsed_st = _extract_stack_trace_information_from_stack(st, is_internal, title)
-        self._api_zone.set(parsed_st)
+        call_site = self._capture_call_site(is_internal, title)
+        self._api_zone.set(call_site)
         try:
             return await cb()
         except Exception as error:
-            raise rewrite_error(error, f"{parsed_st['apiName']}: {error}") from None
+            raise rewrite_error(
+                error, f"{call_site.parse()['apiName']}: {error}"
+            ) from None
         finally:
             self._api_zone.set(None)
 
@@ -564,19 +680,67 @@ class Connection(EventEmitter):
     ) -> Any:
         if self._api_zone.get():
             return cb()
-        task = asyncio.current_task(self._loop)
-        st: List[inspect.FrameInfo] = getattr(
-            task, "__pw_stack__", None
-        ) or inspect.stack(0)
-        parsed_st = _extract_stack_trace_information_from_stack(st, is_internal, title)
-        self._api_zone.set(parsed_st)
+        call_site = self._capture_call_site(is_internal, title)
+        self._api_zone.set(call_site)
         try:
             return cb()
         except Exception as error:
-            raise rewrite_error(error, f"{parsed_st['apiName']}: {error}") from None
+            raise rewrite_error(
+                error, f"{call_site.parse()['apiName']}: {error}"
+            ) from None
         finally:
             self._api_zone.set(None)
 
+    def _capture_call_site(self, is_internal: bool, title: Optional[str]) -> "CallSite":
+        task = asyncio.current_task(self._loop)
+        # Calls made through the sync API run in a task, but the user's frames
+        # are those of the greenlet blocked in SyncBase._sync.
+        frame: Optional[FrameType] = getattr(task, "__pw_frame__", None)
+        if frame:
+            return CallSite(frame, None, is_internal, title)
+        frames: Optional[CapturedFrames] = getattr(task, "__pw_stack__", None)
+        if frames:
+            return CallSite(None, frames, is_internal, title)
+        # Skip this method and wrap_api_call itself.
+        return CallSite(sys._getframe(2), None, is_internal, title)
+
+
+class EventParams(LazyDict):
+    """Event params whose guids are replaced with channels on first access.
+
+    Listeners usually read a few fields only, so nested objects are only walked
+    when they are read.
+    """
+
+    __slots__ = ("_connection",)
+
+    def __init__(self, connection: Connection, params: Dict) -> None:
+        super().__init__(
+            params,
+            {key for key, value in params.items() if isinstance(value, (dict, list))},
+        )
+        self._connection = connection
+
+    def _convert(self, key: str, value: Any) -> Any:
+        return self._connection._replace_guids_with_channels(value)
+
+
+class Initializer(EventParams):
+    """An initializer whose nested values are converted on first access.
+
+    References to other objects are resolved right away, the objects may be
+    disposed before the field is read. Everything else, like headers, is only
+    walked when it is read.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, connection: Connection, initializer: Dict) -> None:
+        for key, value in initializer.items():
+            if isinstance(value, dict) and value.get("guid") in connection._objects:
+                initializer[key] = connection._objects[value["guid"]]._channel
+        super().__init__(connection, initializer)
+
 
 def from_channel(channel: Channel) -> Any:
     return channel._object
@@ -599,43 +763,114 @@ class ParsedStackTrace(TypedDict):
     title: Optional[str]
 
 
+# A snapshot of the stack as (frame, line number) pairs, innermost first. Taking
+# it only walks f_back, source files are looked up when it gets formatted.
+CapturedFrames = List[Tuple[FrameType, int]]
+
+_playwright_module_path = str(Path(playwright_firefox.__file__).parents[0])
+
+
+def capture_frames(
+    frame: Optional[FrameType], limit: Optional[int] = None
+) -> CapturedFrames:
+    frames: CapturedFrames = []
+    while frame is not None:
+        if limit is not None and len(frames) >= limit:
+            break
+        frames.append((frame, frame.f_lineno))
+        frame = frame.f_back
+    return frames
+
+
+def _stack_summary(frames: CapturedFrames) -> traceback.StackSummary:
+    summary = traceback.StackSummary.extract(iter(frames), lookup_lines=False)
+    summary.reverse()
+    return summary
+
+
+class CallSite:
+    """The user code location an API call was made from.
+
+    Only a pointer to the calling frame is kept, the stack is walked when the
+    apiName or frames are first needed. This happens while the call is still in
+    progress, so the calling frames are still at the same line.
+    """
+
+    __slots__ = ("_frame", "_frames", "is_internal", "title", "_parsed", "_truncated")
+
+    def __init__(
+        self,
+        frame: Optional[FrameType],
+        frames: Optional[CapturedFrames],
+        is_internal: bool,
+        title: Optional[str],
+    ) -> None:
+        self._frame = frame
+        self._frames = frames
+        self.is_internal = is_internal
+        self.title = title
+        self._parsed: Optional[ParsedStackTrace] = None
+        self._truncated = False
+
+    def parse(self, max_frames: Optional[int] = None) -> ParsedStackTrace:
+        """Resolves the apiName and at most max_frames of the user's frames."""
+        if self._parsed is None or (self._truncated and max_frames is None):
+            if self._frames is None:
+                self._frames = capture_frames(self._frame)
+                self._frame = None
+            self._parsed = _extract_stack_trace_information_from_stack(
+                self._frames, self.is_internal, self.title, max_frames
+            )
+            self._truncated = max_frames is not None
+            if not self._truncated:
+                self._frames = None
+        return self._parsed
+
+
+def _method_name(frame: FrameType) -> str:
+    method_name = ""
+    if "self" in frame.f_locals:
+        method_name = frame.f_locals["self"].__class__.__name__ + "."
+    return method_name + frame.f_code.co_name
+
+
 def _extract_stack_trace_information_from_stack(
-    st: List[inspect.FrameInfo], is_internal: bool, title: str = None
+    st: CapturedFrames,
+    is_internal: bool,
+    title: str = None,
+    max_frames: Optional[int] = None,
 ) -> ParsedStackTrace:
-    playwright_module_path = str(Path(playwright_firefox.__file__).parents[0])
-    last_internal_api_name = ""
-    api_name = ""
+    impl_to_api_mapping_path = playwright_firefox._impl._impl_to_api_mapping.__file__
+    last_internal_frame: Optional[FrameType] = None
+    api_frame: Optional[FrameType] = None
     parsed_frames: List[StackFrame] = []
-    for frame in st:
+    for frame, lineno in st:
+        filename = frame.f_code.co_filename
         # Sync and Async implementations can have event handlers. When these are sync, they
         # get evaluated in the context of the event loop, so they contain the stack trace of when
         # the message was received. _impl_to_api_mapping is glue between the user-code and internal
         # code to translate impl classes to api classes. We want to ignore these frames.
-        if playwright_firefox._impl._impl_to_api_mapping.__file__ == frame.filename:
+        if impl_to_api_mapping_path == filename:
+            continue
+        if filename.startswith(_playwright_module_path):
+            last_internal_frame = frame
             continue
-        is_playwright_internal = frame.filename.startswith(playwright_module_path)
-
-        method_name = ""
-        if "self" in frame[0].f_locals:
-            method_name = frame[0].f_locals["self"].__class__.__name__ + "."
-        method_name += frame[0].f_code.co_name
 
-        if not is_playwright_internal:
+        if max_frames is None or len(parsed_frames) < max_frames:
             parsed_frames.append(
                 {
-                    "file": frame.filename,
-                    "line": frame.lineno,
+                    "file": filename,
+                    "line": lineno,
                     "column": 0,
-                    "function": method_name,
+                    "function": _method_name(frame),
                 }
             )
-        if is_playwright_internal:
-            last_internal_api_name = method_name
-        elif last_internal_api_name:
-            api_name = last_internal_api_name
-            last_internal_api_name = ""
-    if not api_name:
-        api_name = last_internal_api_name
+        if last_internal_frame:
+            api_frame = last_internal_frame
+            last_internal_frame = None
+    if not api_frame:
+        api_frame = last_internal_frame
+    api_name = _method_name(api_frame) if api_frame else ""
 
     return {
         "frames": parsed_frames,
@@ -651,17 +886,10 @@ def _augment_params(
     if params is None:
         params = {}
     if timeout_calculator:
-        params["timeout"] = timeout_calculator(params.get("timeout"))
-    return _filter_none(params)
-
-
-def _filter_none(d: Mapping) -> Dict:
-    result = {}
-    for k, v in d.items():
-        if v is None:
-            continue
-        result[k] = _filter_none(v) if isinstance(v, dict) else v
-    return result
+        # Callers may reuse their params across calls, they are never modified.
+        params = {**params, "timeout": timeout_calculator(params.get("timeout"))}
+    # None values are dropped by Connection._params_to_wire, which copies them.
+    return params
 
 
 def format_call_log(log: Optional[List[str]]) -> str:
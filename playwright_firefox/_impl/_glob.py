@@ -62,3 +62,11 @@ def glob_to_regex_pattern(glob: str) -> str:
 
     tokens.append("$")
     return "".join(tokens)
+
+
+def glob_literal_prefix(glob: str) -> str:
+    """The leading part of the glob that matching URLs start with verbatim."""
+    for i, c in enumerate(glob):
+        if c in ("*", "{", "\\"):
+            return glob[:i]
+    return glob
@@ -11,11 +11,18 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import json
 import os
-from typing import Tuple
+import threading
+import time
+from pathlib import Path
+from types import FrameType
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import greenlet
 
+import playwright_firefox
+
 
 def _greenlet_trace_callback(
     event: str, args: Tuple[greenlet.greenlet, greenlet.greenlet]
@@ -30,10 +37,20 @@ if os.environ.get("INTERNAL_PW_GREENLET_DEBUG"):
 
 
 class MainGreenlet(greenlet.greenlet):
+    # Set when the dispatcher runs in a thread of its own and serves calls made
+    # from other threads, see sync_playwright(thread_safe=True).
+    thread_id: Optional[int] = None
+
     def __str__(self) -> str:
         return "<MainGreenlet>"
 
 
+def is_worker_thread(dispatcher_fiber: Any) -> bool:
+    """Whether the caller runs outside of the thread of a thread safe dispatcher."""
+    thread_id = getattr(dispatcher_fiber, "thread_id", None)
+    return thread_id is not None and thread_id != threading.get_ident()
+
+
 class RouteGreenlet(greenlet.greenlet):
     def __str__(self) -> str:
         return "<RouteGreenlet>"
@@ -47,3 +64,127 @@ class LocatorHandlerGreenlet(greenlet.greenlet):
 class EventGreenlet(greenlet.greenlet):
     def __str__(self) -> str:
         return "<EventGreenlet>"
+
+
+# Greenlets running user callbacks, the dispatcher is blocked while they run.
+_HANDLER_GREENLETS = ("EventGreenlet", "RouteGreenlet", "LocatorHandlerGreenlet")
+
+_playwright_module_path = str(Path(playwright_firefox.__file__).parents[0])
+
+TraceCallback = Callable[[str, Tuple[greenlet.greenlet, greenlet.greenlet]], None]
+
+
+def create_greenlet_profiler() -> Optional["GreenletProfiler"]:
+    """PLAYWRIGHT_GREENLET_PROFILE=1 profiles the sync dispatcher,
+    PLAYWRIGHT_GREENLET_TRACE=<path> also writes a Chrome trace to path."""
+    trace_path = os.environ.get("PLAYWRIGHT_GREENLET_TRACE")
+    if trace_path or os.environ.get("PLAYWRIGHT_GREENLET_PROFILE"):
+        return GreenletProfiler(trace_path)
+    return None
+
+
+def _user_location(frame: Optional[FrameType]) -> str:
+    # The innermost frame outside of this package, i.e. the user's handler.
+    while frame:
+        if not frame.f_code.co_filename.startswith(_playwright_module_path):
+            return (
+                f"{frame.f_code.co_filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+            )
+        frame = frame.f_back
+    return ""
+
+
+class GreenletProfiler:
+    """Counts the greenlet switches of the thread running the sync dispatcher
+    and times how long each kind of greenlet runs before switching away.
+
+    The dispatcher (MainGreenlet) can't read from the driver while a handler
+    greenlet runs, so the longest handler span is the longest stall of the
+    session. Spans can also be written as Chrome trace events, to be opened in
+    chrome://tracing or Perfetto.
+    """
+
+    def __init__(self, trace_path: Optional[str] = None) -> None:
+        self._trace_path = trace_path
+        self._switches: Dict[str, int] = {}
+        self._time_ms: Dict[str, float] = {}
+        self._longest_handler: Optional[Dict[str, Any]] = None
+        # (greenlet kind, start, duration, location) per span when tracing.
+        self._spans: List[Tuple[str, float, float, str]] = []
+        self._started_at = time.perf_counter()
+        self._span_start = self._started_at
+        self._thread_id = 0
+        self._previous_trace: Optional[TraceCallback] = None
+
+    def install(self) -> None:
+        # Greenlet tracing is per thread, this must run in the dispatcher thread.
+        self._thread_id = threading.get_ident()
+        self._span_start = time.perf_counter()
+        self._previous_trace = greenlet.settrace(self._on_trace)
+
+    def uninstall(self) -> None:
+        greenlet.settrace(self._previous_trace)
+        if self._trace_path:
+            self.write_trace(self._trace_path)
+
+    def _on_trace(
+        self, event: str, args: Tuple[greenlet.greenlet, greenlet.greenlet]
+    ) -> None:
+        if self._previous_trace:
+            self._previous_trace(event, args)
+        if event not in ("switch", "throw"):
+            return
+        origin, target = args
+        now = time.perf_counter()
+        kind = type(origin).__name__
+        duration_ms = (now - self._span_start) * 1000
+        self._time_ms[kind] = self._time_ms.get(kind, 0) + duration_ms
+        target_kind = type(target).__name__
+        self._switches[target_kind] = self._switches.get(target_kind, 0) + 1
+        location = None
+        if kind in _HANDLER_GREENLETS and (
+            not self._longest_handler or duration_ms > self._longest_handler["ms"]
+        ):
+            location = _user_location(origin.gr_frame)
+            self._longest_handler = {
+                "greenlet": kind,
+                "ms": duration_ms,
+                "location": location,
+            }
+        if self._trace_path:
+            if location is None and kind in _HANDLER_GREENLETS:
+                location = _user_location(origin.gr_frame)
+            self._spans.append((kind, self._span_start, duration_ms, location or ""))
+        self._span_start = now
+
+    def snapshot(self) -> Dict[str, Any]:
+        handler_ms = sum(self._time_ms.get(kind, 0) for kind in _HANDLER_GREENLETS)
+        dispatcher_ms = self._time_ms.get("MainGreenlet", 0)
+        return {
+            "switches": dict(self._switches),
+            "timeMs": dict(self._time_ms),
+            "dispatcherMs": dispatcher_ms,
+            "handlerMs": handler_ms,
+            "callerMs": sum(self._time_ms.values()) - dispatcher_ms - handler_ms,
+            "longestHandler": (
+                dict(self._longest_handler) if self._longest_handler else None
+            ),
+        }
+
+    def write_trace(self, path: str) -> None:
+        pid = os.getpid()
+        events = [
+            {
+                "name": kind,
+                "cat": "greenlet",
+                "ph": "X",
+                "ts": (start - self._started_at) * 1e6,
+                "dur": duration_ms * 1000,
+                "pid": pid,
+                "tid": self._thread_id,
+                **({"args": {"location": location}} if location else {}),
+            }
+            for kind, start, duration_ms, location in self._spans
+        ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
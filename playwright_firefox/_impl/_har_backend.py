@@ -0,0 +1,276 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import base64
+import hashlib
+import os
+import re
+import zipfile
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple, Union
+from urllib.parse import urljoin
+
+from playwright_firefox._impl._api_structures import HeadersArray
+from playwright_firefox._impl._errors import Error
+from playwright_firefox._impl._har_stream import is_har_stream, read_har_stream
+from playwright_firefox._impl._helper import HarLookupResult, header_value
+from playwright_firefox._impl._json_codec import get_json_codec
+
+if TYPE_CHECKING:  # pragma: no cover
+    from playwright_firefox._impl._network import Request
+
+_REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+
+def is_in_process_har_enabled() -> bool:
+    """Whether route_from_har replays in process. The driver looks the requests
+    up by default, PLAYWRIGHT_HAR_BACKEND=python opts in to HarBackend."""
+    backend = os.environ.get("PLAYWRIGHT_HAR_BACKEND") or "driver"
+    if backend not in ("python", "driver"):
+        raise Error(
+            f'PLAYWRIGHT_HAR_BACKEND must be "python" or "driver", got {backend!r}'
+        )
+    return backend == "python"
+
+
+class _HarEntry:
+    __slots__ = (
+        "url",
+        "method",
+        "request_headers",
+        "post_data",
+        "post_data_digest",
+        "status",
+        "headers",
+        "content",
+        "location",
+    )
+
+    def __init__(self, entry: Dict) -> None:
+        request = entry["request"]
+        response = entry["response"]
+        self.url: str = request["url"]
+        self.method: str = request["method"]
+        self.request_headers: HeadersArray = request.get("headers", [])
+        self.post_data: Optional[Dict] = request.get("postData")
+        # Computed on first use, the body itself is not kept.
+        self.post_data_digest: Optional[bytes] = None
+        self.status: int = response["status"]
+        self.headers: HeadersArray = response.get("headers", [])
+        self.content: Dict = response.get("content", {})
+        self.location = header_value(self.headers, "location")
+
+
+class HarBackend:
+    """Looks requests up in a HAR file like the driver's HAR backend does.
+
+    The HAR is loaded once and its entries are indexed by method and URL, POST
+    bodies are compared by digest. Bodies stored as attachments, next to the
+    HAR or in its zip, are only read when an entry is used.
+    """
+
+    def __init__(
+        self,
+        har: Any,
+        base_dir: Optional[str] = None,
+        zip_file: Optional[zipfile.ZipFile] = None,
+    ) -> None:
+        self._base_dir = base_dir
+        self._zip_file = zip_file
+        self._entries: Dict[Tuple[str, str], List[_HarEntry]] = {}
+        # Like with the driver, a malformed HAR fails the lookups rather than
+        # route_from_har, so that requests can fall back.
+        self._error: Optional[str] = None
+        try:
+            for entry in har["log"]["entries"]:
+                har_entry = _HarEntry(entry)
+                self._entries.setdefault((har_entry.method, har_entry.url), []).append(
+                    har_entry
+                )
+        except (KeyError, TypeError) as e:
+            self._entries.clear()
+            self._error = f"Invalid HAR file: {e!r}"
+
+    @staticmethod
+    async def open(file: str) -> "HarBackend":
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, HarBackend._load, file)
+
+    @staticmethod
+    def _load(file: str) -> "HarBackend":
+        try:
+            return HarBackend._read(file)
+        except (OSError, ValueError, zipfile.BadZipFile) as e:
+            raise Error(f"Failed to read HAR file {file}: {e}") from None
+
+    @staticmethod
+    def _read(file: str) -> "HarBackend":
+        codec = get_json_codec()
+        if file.endswith(".zip"):
+            zip_file = zipfile.ZipFile(file)
+            try:
+                har_name = next(
+                    (name for name in zip_file.namelist() if name.endswith(".har")),
+                    None,
+                )
+                if not har_name:
+                    raise Error("Specified archive does not have a .har file")
+                har = codec.decode(zip_file.read(har_name))
+            except BaseException:
+                zip_file.close()
+                raise
+            return HarBackend(har, zip_file=zip_file)
+        if is_har_stream(file):
+            har = read_har_stream(file)
+        else:
+            with open(file, "rb") as f:
+                har = codec.decode(f.read())
+        return HarBackend(har, base_dir=os.path.dirname(os.path.abspath(file)))
+
+    def dispose(self) -> None:
+        if self._zip_file:
+            self._zip_file.close()
+            self._zip_file = None
+
+    async def lookup(self, request: "Request") -> HarLookupResult:
+        if self._error:
+            return {"action": "error", "message": f"HAR error: {self._error}"}
+        try:
+            entry = await self._find_entry(request)
+        except Error as e:
+            return {"action": "error", "message": f"HAR error: {e.message}"}
+        if not entry:
+            return {"action": "noentry"}
+        # A redirected navigation is restarted with the final URL, so that the
+        # URL of the document changes.
+        if entry.url != request.url and request.is_navigation_request():
+            return {"action": "redirect", "redirectURL": entry.url}
+        try:
+            body = self._load_content(entry.content)
+        except Exception as e:
+            return {"action": "error", "message": str(e)}
+        return {
+            "action": "fulfill",
+            "status": entry.status,
+            "headers": entry.headers,
+            "body": body,
+        }
+
+    async def _find_entry(self, request: "Request") -> Optional[_HarEntry]:
+        url = request.url
+        method = request.method
+        post_data = request.post_data_buffer
+        post_data_digest = hashlib.sha1(post_data).digest() if post_data else None
+        # The raw headers cost a round trip, they are only fetched when needed.
+        headers: Optional[HeadersArray] = None
+        visited: Set[_HarEntry] = set()
+        while True:
+            candidates: List[_HarEntry] = []
+            for candidate in self._entries.get((method, url), []):
+                if method == "POST" and post_data and candidate.post_data:
+                    if self._post_data_digest(candidate) != post_data_digest:
+                        entry_boundary = _multipart_boundary(candidate.request_headers)
+                        if not entry_boundary:
+                            continue
+                        if headers is None:
+                            headers = await request.headers_array()
+                        if not self._is_same_multipart(
+                            candidate, entry_boundary, post_data, headers
+                        ):
+                            continue
+                candidates.append(candidate)
+            if not candidates:
+                return None
+
+            entry = candidates[0]
+            # The candidate with the most matching headers wins, the first one
+            # on a tie.
+            if len(candidates) > 1:
+                if headers is None:
+                    headers = await request.headers_array()
+                header_set = {f"{h['name'].lower()}:{h['value']}" for h in headers}
+                entry = max(
+                    candidates,
+                    key=lambda c: _count_matching_headers(
+                        c.request_headers, header_set
+                    ),
+                )
+
+            if entry in visited:
+                raise Error(f"Found redirect cycle for {url}")
+            visited.add(entry)
+
+            if entry.status in _REDIRECT_STATUSES and entry.location is not None:
+                url = urljoin(url, entry.location)
+                if (entry.status in (301, 302) and method == "POST") or (
+                    entry.status == 303 and method not in ("GET", "HEAD")
+                ):
+                    method = "GET"
+                continue
+            return entry
+
+    def _post_data_digest(self, entry: _HarEntry) -> bytes:
+        if entry.post_data_digest is None:
+            entry.post_data_digest = hashlib.sha1(
+                _to_bytes(self._load_content(entry.post_data or {}))
+            ).digest()
+        return entry.post_data_digest
+
+    def _is_same_multipart(
+        self,
+        entry: _HarEntry,
+        entry_boundary: str,
+        post_data: bytes,
+        headers: HeadersArray,
+    ) -> bool:
+        # Multipart boundaries change between requests, the bodies are compared
+        # without them.
+        boundary = _multipart_boundary(headers)
+        if not boundary:
+            return False
+        entry_post_data = _to_bytes(self._load_content(entry.post_data or {}))
+        return post_data.decode(errors="replace").replace(
+            boundary, ""
+        ) == entry_post_data.decode(errors="replace").replace(entry_boundary, "")
+
+    def _load_content(self, content: Dict) -> Union[str, bytes]:
+        file = content.get("_file")
+        if file:
+            if self._zip_file:
+                return self._zip_file.read(file)
+            assert self._base_dir
+            with open(os.path.join(self._base_dir, file), "rb") as f:
+                return f.read()
+        text = content.get("text") or ""
+        if content.get("encoding") == "base64":
+            return base64.b64decode(text)
+        return text
+
+
+def _count_matching_headers(har_headers: HeadersArray, header_set: Set[str]) -> int:
+    return sum(
+        1 for h in har_headers if f"{h['name'].lower()}:{h['value']}" in header_set
+    )
+
+
+def _multipart_boundary(headers: HeadersArray) -> Optional[str]:
+    content_type = header_value(headers, "content-type")
+    if not content_type or "multipart/form-data" not in content_type:
+        return None
+    match = re.search(r"boundary=(\S+)", content_type)
+    return match.group(1) if match else None
+
+
+def _to_bytes(body: Union[str, bytes]) -> bytes:
+    return body.encode() if isinstance(body, str) else body
@@ -16,6 +16,8 @@ import base64
 from typing import TYPE_CHECKING, Optional, cast
 
 from playwright_firefox._impl._api_structures import HeadersArray
+from playwright_firefox._impl._har_backend import HarBackend, is_in_process_har_enabled
+from playwright_firefox._impl._har_stream import is_har_stream
 from playwright_firefox._impl._helper import (
     HarLookupResult,
     RouteFromHarNotFoundPolicy,
@@ -33,12 +35,15 @@ class HarRouter:
     def __init__(
         self,
         local_utils: LocalUtils,
-        har_id: str,
+        har_id: Optional[str],
         not_found_action: RouteFromHarNotFoundPolicy,
         url_matcher: Optional[URLMatch] = None,
+        backend: Optional[HarBackend] = None,
     ) -> None:
         self._local_utils: LocalUtils = local_utils
-        self._har_id: str = har_id
+        # Either the HAR is open in the driver or replayed by the backend.
+        self._har_id: Optional[str] = har_id
+        self._backend = backend
         self._not_found_action: RouteFromHarNotFoundPolicy = not_found_action
         self._options_url_match: Optional[URLMatch] = url_matcher
 
@@ -49,6 +54,15 @@ class HarRouter:
         not_found_action: RouteFromHarNotFoundPolicy,
         url_matcher: Optional[URLMatch] = None,
     ) -> "HarRouter":
+        # The driver cannot read HAR streams, they are always replayed here.
+        if is_har_stream(file) or is_in_process_har_enabled():
+            return HarRouter(
+                local_utils=local_utils,
+                har_id=None,
+                not_found_action=not_found_action,
+                url_matcher=url_matcher,
+                backend=await HarBackend.open(file),
+            )
         har_id = await local_utils._channel.send("harOpen", None, {"file": file})
         return HarRouter(
             local_utils=local_utils,
@@ -57,9 +71,12 @@ class HarRouter:
             url_matcher=url_matcher,
         )
 
-    async def _handle(self, route: "Route") -> None:
+    async def _lookup(self, route: "Route") -> HarLookupResult:
         request = route.request
-        response: HarLookupResult = await self._local_utils.har_lookup(
+        if self._backend:
+            return await self._backend.lookup(request)
+        assert self._har_id
+        response = await self._local_utils.har_lookup(
             harId=self._har_id,
             url=request.url,
             method=request.method,
@@ -67,6 +84,12 @@ class HarRouter:
             postData=request.post_data_buffer,
             isNavigationRequest=request.is_navigation_request(),
         )
+        if response.get("body") is not None:
+            response["body"] = base64.b64decode(cast(str, response["body"]))
+        return response
+
+    async def _handle(self, route: "Route") -> None:
+        response = await self._lookup(route)
         action = response["action"]
         if action == "redirect":
             redirect_url = response["redirectURL"]
@@ -90,7 +113,7 @@ class HarRouter:
                     v["name"]: v["value"]
                     for v in cast(HeadersArray, response.get("headers", []))
                 },
-                body=base64.b64decode(body),
+                body=body,
             )
             return
 
@@ -117,6 +140,9 @@ class HarRouter:
         )
 
     def dispose(self) -> None:
+        if self._backend:
+            self._backend.dispose()
+            return
         asyncio.create_task(
             self._local_utils._channel.send("harClose", None, {"harId": self._har_id})
         )
@@ -0,0 +1,331 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import base64
+import hashlib
+import mimetypes
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import IO, TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Set
+from urllib.parse import parse_qsl, urlparse
+
+from playwright_firefox._impl._errors import Error
+from playwright_firefox._impl._helper import (
+    HarContentPolicy,
+    HarMode,
+    URLMatch,
+    async_writefile,
+    header_value,
+    make_dirs_for_file,
+    url_matches,
+)
+from playwright_firefox._impl._json_codec import get_json_codec
+
+if TYPE_CHECKING:  # pragma: no cover
+    from playwright_firefox._impl._network import Request
+
+_TEXT_MIME_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-www-form-urlencoded",
+    "image/svg+xml",
+)
+
+
+def is_har_stream(path: str) -> bool:
+    """Whether HAR entries are streamed to path, one JSON entry per line,
+    rather than exported by the driver when the context closes."""
+    return path.endswith(".ndjson")
+
+
+def har_stream_rotate_bytes() -> Optional[int]:
+    """The size from which a new HAR stream segment is started, from
+    PLAYWRIGHT_HAR_ROTATE_BYTES."""
+    value = os.environ.get("PLAYWRIGHT_HAR_ROTATE_BYTES")
+    if not value:
+        return None
+    try:
+        return max(int(value), 1)
+    except ValueError:
+        raise Error(
+            f"PLAYWRIGHT_HAR_ROTATE_BYTES must be a number of bytes, got {value!r}"
+        )
+
+
+def har_stream_rotate_seconds() -> Optional[float]:
+    """The age from which a new HAR stream segment is started, from
+    PLAYWRIGHT_HAR_ROTATE_SECONDS."""
+    value = os.environ.get("PLAYWRIGHT_HAR_ROTATE_SECONDS")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        raise Error(
+            f"PLAYWRIGHT_HAR_ROTATE_SECONDS must be a number of seconds, got {value!r}"
+        )
+
+
+def har_stream_segments(path: str) -> Iterator[str]:
+    """The segments of a HAR stream in the order they were written:
+    session.ndjson, session.1.ndjson, session.2.ndjson and so on."""
+    yield path
+    stem = path[: -len(".ndjson")]
+    index = 1
+    while os.path.exists(f"{stem}.{index}.ndjson"):
+        yield f"{stem}.{index}.ndjson"
+        index += 1
+
+
+def read_har_stream(path: str) -> Dict:
+    """Reads the entries of all the segments of a HAR stream into a HAR."""
+    codec = get_json_codec()
+    entries: List[Any] = []
+    for segment in har_stream_segments(path):
+        with open(segment, "rb") as f:
+            lines = f.read().splitlines()
+        for i, line in enumerate(lines):
+            if not line.strip():
+                continue
+            try:
+                entries.append(codec.decode(line))
+            except Exception:
+                # The last entry of a recording that was interrupted can be
+                # incomplete.
+                if i != len(lines) - 1:
+                    raise
+    return {"log": {"version": "1.2", "entries": entries}}
+
+
+class HarStreamRecorder:
+    """Records the requests of a context or page as HAR entries, written to
+    disk and flushed as soon as each request has finished.
+
+    Nothing is kept in memory once an entry is written, which lets long
+    running contexts record without the driver accumulating the HAR. Entries
+    are always recorded in full, with their bodies.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        content: HarContentPolicy,
+        mode: Optional[HarMode] = None,
+        base_url: Optional[str] = None,
+        url: Optional[URLMatch] = None,
+    ) -> None:
+        if content == "omit":
+            raise Error(
+                'Content "omit" is not supported when recording a HAR stream (.ndjson)'
+            )
+        if mode == "minimal":
+            raise Error(
+                'Mode "minimal" is not supported when recording a HAR stream (.ndjson)'
+            )
+        self._path = path
+        self._dir = os.path.dirname(os.path.abspath(path))
+        self._content = content
+        self._base_url = base_url
+        self._url = url
+        self._rotate_bytes = har_stream_rotate_bytes()
+        self._rotate_seconds = har_stream_rotate_seconds()
+        self._codec = get_json_codec()
+        self._segment = 0
+        self._segment_started = time.monotonic()
+        make_dirs_for_file(path)
+        self._file: Optional[IO[bytes]] = open(path, "wb")
+        # Encoded entries waiting for the writer, which writes them in the
+        # default executor. The lock guards the file against dispose().
+        self._lines: List[bytes] = []
+        self._writer: Optional[asyncio.Task] = None
+        self._file_lock = threading.Lock()
+        self._pending: Set[asyncio.Task] = set()
+        self._attachments: Set[str] = set()
+        # Segments left over from a previous recording to the same path would
+        # otherwise be read back with this one.
+        for segment in list(har_stream_segments(path))[1:]:
+            os.remove(segment)
+
+    def on_request_finished(self, request: "Request") -> None:
+        if self._file is None:
+            return
+        if self._url and not url_matches(self._base_url, request.url, self._url):
+            return
+        task = asyncio.create_task(self._record(request))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _record(self, request: "Request") -> None:
+        try:
+            entry = await self._entry(request)
+        except Error:
+            # The request or its page went away before it could be recorded.
+            return
+        if entry:
+            self._lines.append(self._codec.encode(entry) + b"\n")
+            if not self._writer:
+                self._writer = asyncio.create_task(self._write_lines())
+
+    async def _write_lines(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while self._lines:
+                lines = self._lines
+                self._lines = []
+                await loop.run_in_executor(None, self._write, lines)
+        finally:
+            self._writer = None
+
+    async def _entry(self, request: "Request") -> Optional[Dict]:
+        response = await request.response()
+        if not response:
+            return None
+        request_headers = await request.headers_array()
+        response_headers = await response.headers_array()
+        timing = request.timing
+        started = datetime.fromtimestamp(timing["startTime"] / 1000, timezone.utc)
+        mime_type = header_value(response_headers, "content-type") or "x-unknown"
+        content: Dict[str, Any] = {"size": -1, "mimeType": mime_type}
+        try:
+            body = await response.body()
+        except Error:
+            # Redirects and some cached responses have no body.
+            body = None
+        if body is not None:
+            content["size"] = len(body)
+            await self._add_content(content, body, mime_type)
+        har_request: Dict[str, Any] = {
+            "method": request.method,
+            "url": request.url,
+            "httpVersion": "HTTP/1.1",
+            "cookies": [],
+            "headers": request_headers,
+            "queryString": [
+                {"name": name, "value": value}
+                for name, value in parse_qsl(
+                    urlparse(request.url).query, keep_blank_values=True
+                )
+            ],
+            "headersSize": -1,
+            "bodySize": -1,
+        }
+        post_data = request.post_data_buffer
+        if post_data is not None:
+            har_request["bodySize"] = len(post_data)
+            post_data_content: Dict[str, Any] = {
+                "mimeType": header_value(request_headers, "content-type") or ""
+            }
+            await self._add_content(
+                post_data_content, post_data, post_data_content["mimeType"]
+            )
+            har_request["postData"] = post_data_content
+        return {
+            "startedDateTime": started.isoformat(timespec="milliseconds").replace(
+                "+00:00", "Z"
+            ),
+            "time": max(timing["responseEnd"], 0),
+            "request": har_request,
+            "response": {
+                "status": response.status,
+                "statusText": response.status_text,
+                "httpVersion": "HTTP/1.1",
+                "cookies": [],
+                "headers": response_headers,
+                "content": content,
+                "redirectURL": header_value(response_headers, "location") or "",
+                "headersSize": -1,
+                "bodySize": content["size"],
+            },
+            "cache": {},
+            "timings": {
+                "send": -1,
+                "wait": max(timing["responseStart"] - timing["requestStart"], -1),
+                "receive": max(timing["responseEnd"] - timing["responseStart"], -1),
+            },
+        }
+
+    async def _add_content(
+        self, content: Dict[str, Any], body: bytes, mime_type: str
+    ) -> None:
+        if self._content == "attach":
+            # Like the driver, attachments are named after their digest so
+            # that identical bodies are only stored once.
+            extension = mimetypes.guess_extension(mime_type.split(";")[0]) or ".dat"
+            name = hashlib.sha1(body).hexdigest() + extension
+            if name not in self._attachments:
+                self._attachments.add(name)
+                await async_writefile(os.path.join(self._dir, name), body)
+            content["_file"] = name
+            return
+        if _is_text(mime_type):
+            try:
+                content["text"] = body.decode()
+                return
+            except UnicodeDecodeError:
+                pass
+        content["text"] = base64.b64encode(body).decode()
+        content["encoding"] = "base64"
+
+    def _write(self, lines: List[bytes]) -> None:
+        with self._file_lock:
+            for line in lines:
+                if self._file is None:
+                    return
+                self._file.write(line)
+                if (
+                    self._rotate_bytes is not None
+                    and self._file.tell() >= self._rotate_bytes
+                ) or (
+                    self._rotate_seconds is not None
+                    and time.monotonic() - self._segment_started >= self._rotate_seconds
+                ):
+                    self._rotate()
+            if self._file:
+                self._file.flush()
+
+    def _rotate(self) -> None:
+        assert self._file
+        self._file.close()
+        self._segment += 1
+        self._segment_started = time.monotonic()
+        self._file = open(
+            f"{self._path[: -len('.ndjson')]}.{self._segment}.ndjson", "wb"
+        )
+
+    async def close(self) -> None:
+        """Waits for the requests being recorded and closes the stream."""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        if self._writer:
+            await self._writer
+        self.dispose()
+
+    def dispose(self) -> None:
+        with self._file_lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+
+def _is_text(mime_type: str) -> bool:
+    mime_type = mime_type.split(";")[0].strip().lower()
+    return (
+        mime_type.startswith("text/")
+        or mime_type.endswith("+json")
+        or mime_type in _TEXT_MIME_TYPES
+    )
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import asyncio
+import functools
 import math
 import os
 import re
@@ -24,11 +25,13 @@ from typing import (
     Any,
     Callable,
     Dict,
+    Iterator,
     List,
     Literal,
     Optional,
     Pattern,
     Set,
+    Tuple,
     TypedDict,
     TypeVar,
     Union,
@@ -44,13 +47,18 @@ from playwright_firefox._impl._errors import (
     is_target_closed_error,
     rewrite_error,
 )
-from playwright_firefox._impl._glob import glob_to_regex_pattern
+from playwright_firefox._impl._glob import glob_literal_prefix, glob_to_regex_pattern
 from playwright_firefox._impl._greenlets import RouteGreenlet
 from playwright_firefox._impl._str_utils import escape_regex_flags
 
 if TYPE_CHECKING:  # pragma: no cover
     from playwright_firefox._impl._api_structures import HeadersArray
-    from playwright_firefox._impl._network import Request, Response, Route, WebSocketRoute
+    from playwright_firefox._impl._network import (
+        Request,
+        Response,
+        Route,
+        WebSocketRoute,
+    )
 
 URLMatch = Union[str, Pattern[str], Callable[[str], bool]]
 URLMatchRequest = Union[str, Pattern[str], Callable[["Request"], bool]]
@@ -152,14 +160,32 @@ def url_matches(
     if not match:
         return True
     if isinstance(match, str):
-        match = re.compile(
-            resolve_glob_to_regex_pattern(base_url, match, websocket_url)
-        )
+        match = compile_glob(base_url, match, bool(websocket_url))
     if isinstance(match, Pattern):
         return bool(match.search(url_string))
     return match(url_string)
 
 
+def url_matcher(
+    base_url: Optional[str], match: Optional[URLMatch], websocket_url: bool = False
+) -> Optional[URLMatch]:
+    """Precompiles a URL match for url_matches, globs are resolved once."""
+    # An empty glob matches everything, like in url_matches.
+    if match and isinstance(match, str):
+        return compile_glob(base_url, match, websocket_url)
+    return match
+
+
+# Resolving and compiling a glob costs a URL parse and a regex compile, the same
+# globs are matched against every request. The size is bounded as globs can be
+# built from dynamic values.
+@functools.lru_cache(maxsize=1024)
+def compile_glob(
+    base_url: Optional[str], glob: str, websocket_url: bool
+) -> Pattern[str]:
+    return re.compile(resolve_glob_to_regex_pattern(base_url, glob, websocket_url))
+
+
 def resolve_glob_to_regex_pattern(
     base_url: Optional[str], glob: str, websocket_url: bool = None
 ) -> str:
@@ -257,7 +283,8 @@ class HarLookupResult(TypedDict, total=False):
     redirectURL: Optional[str]
     status: Optional[int]
     headers: Optional["HeadersArray"]
-    body: Optional[str]
+    # Base64 from the driver, the in process HAR backend returns the body as is.
+    body: Optional[Union[str, bytes]]
 
 
 DEFAULT_PLAYWRIGHT_TIMEOUT_IN_MILLISECONDS = 30000
@@ -383,6 +410,13 @@ class RouteHandler:
     ):
         self._base_url = base_url
         self.url = url
+        self._url_matcher = url_matcher(base_url, url)
+        # Only URLs starting with this prefix can match, see RouteIndex.
+        self.url_prefix = (
+            glob_literal_prefix(resolve_glob_base(base_url, url))
+            if url and isinstance(url, str)
+            else ""
+        )
         self.handler = handler
         self._times = times if times else math.inf
         self._handled_count = 0
@@ -391,7 +425,7 @@ class RouteHandler:
         self._active_invocations: Set[RouteHandlerInvocation] = set()
 
     def matches(self, request_url: str) -> bool:
-        return url_matches(self._base_url, request_url, self.url)
+        return url_matches(self._base_url, request_url, self._url_matcher)
 
     async def handle(self, route: "Route") -> bool:
         handler_invocation = RouteHandlerInvocation(
@@ -484,6 +518,148 @@ class RouteHandler:
         return patterns
 
 
+class RouteIndex:
+    """Narrows down the route handlers to test against a request URL.
+
+    Glob handlers are filed under the literal prefix of their resolved glob, a
+    URL is only tested against those filed under one of its own prefixes. Regex
+    and predicate handlers have an empty prefix and are always tested. The
+    candidates keep the order of the handlers and are still tested with
+    RouteHandler.matches, so the first match and times semantics don't change.
+    Owners call invalidate() whenever they change the handlers, the index is
+    rebuilt on the next lookup.
+    """
+
+    def __init__(self) -> None:
+        self._version = 0
+        self._built_version = -1
+        self._by_prefix: Dict[str, List[Tuple[int, RouteHandler]]] = {}
+        self._prefix_lengths: List[int] = []
+
+    def invalidate(self) -> None:
+        self._version += 1
+
+    def candidates(self, handlers: List[RouteHandler], url: str) -> List[RouteHandler]:
+        if self._built_version != self._version:
+            self._build(handlers)
+        found: List[Tuple[int, RouteHandler]] = []
+        for length in self._prefix_lengths:
+            if length > len(url):
+                break
+            bucket = self._by_prefix.get(url[:length])
+            if bucket:
+                found.extend(bucket)
+        if len(found) > 1:
+            found.sort(key=lambda entry: entry[0])
+        return [handler for _, handler in found]
+
+    def _build(self, handlers: List[RouteHandler]) -> None:
+        self._built_version = self._version
+        self._by_prefix = {}
+        for position, handler in enumerate(handlers):
+            self._by_prefix.setdefault(handler.url_prefix, []).append(
+                (position, handler)
+            )
+        self._prefix_lengths = sorted({len(prefix) for prefix in self._by_prefix})
+
+
+class LazyDict(dict):
+    """A dict whose values are converted the first time they are read.
+
+    The keys in _pending hold values that were not converted yet. Everything
+    that reads values goes through __getitem__, including copies made with
+    dict(), {**}, copy() or json, so unconverted values are never exposed.
+    Values that are set are stored as is.
+    """
+
+    __slots__ = ("_pending",)
+
+    def __init__(self, items: Any, pending: Set[str]) -> None:
+        super().__init__(items)
+        self._pending = pending
+
+    def _convert(self, key: str, value: Any) -> Any:
+        """Returns the value stored for key in place of the raw one.
+
+        Subclasses override it, values are kept as is by default.
+        """
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._pending:
+            self._pending.discard(key)
+            value = self._convert(key, dict.__getitem__(self, key))
+            dict.__setitem__(self, key, value)
+            return value
+        return dict.__getitem__(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._pending.discard(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        self._pending.discard(key)
+        dict.__delitem__(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        # dict(), {**} and dict.update() only copy a dict subclass through
+        # keys() and __getitem__ when it overrides __iter__.
+        return dict.__iter__(self)
+
+    def __eq__(self, other: object) -> bool:
+        self._convert_all()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    def __repr__(self) -> str:
+        self._convert_all()
+        return dict.__repr__(self)
+
+    def __reduce__(self) -> Any:
+        return (dict, (self.copy(),))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        return default
+
+    def values(self) -> Any:
+        return [self[key] for key in self]
+
+    def items(self) -> Any:
+        return [(key, self[key]) for key in self]
+
+    def copy(self) -> Dict:
+        return {key: self[key] for key in self}
+
+    def pop(self, key: str, *default: Any) -> Any:
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        return dict.pop(self, key, *default)
+
+    def popitem(self) -> Tuple[str, Any]:
+        key = next(reversed(self.keys()))
+        return key, self.pop(key)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def _convert_all(self) -> None:
+        for key in list(self._pending):
+            self[key]
+
+
 to_snake_case_regex = re.compile("((?<=[a-z0-9])[A-Z]|(?!^)[A-Z](?=[a-z]))")
 
 
@@ -533,6 +709,14 @@ def object_to_array(obj: Optional[Dict]) -> Optional[List[NameValue]]:
     return result
 
 
+def header_value(headers: "HeadersArray", name: str) -> Optional[str]:
+    """The first value of the header with the lowercase name."""
+    return next(
+        (header["value"] for header in headers if header["name"].lower() == name),
+        None,
+    )
+
+
 def is_file_payload(value: Optional[Any]) -> bool:
     return (
         isinstance(value, dict)
@@ -21,8 +21,13 @@ from playwright_firefox._impl._map import Map
 API_ATTR = "_pw_api_instance_"
 IMPL_ATTR = "_pw_impl_instance_"
 
+# Leaf values that are returned as is, without a mapping lookup.
+_PRIMITIVE_TYPES = frozenset((str, int, float, bool, bytes))
+
 
 class ImplWrapper:
+    __slots__ = ("_impl_obj", "__weakref__")
+
     def __init__(self, impl_obj: Any) -> None:
         self._impl_obj = impl_obj
 
@@ -40,13 +45,13 @@ class ImplToApiMapping:
     def from_maybe_impl(
         self, obj: Any, visited: Optional[Map[Any, Union[List, Dict]]] = None
     ) -> Any:
+        if not obj or type(obj) in _PRIMITIVE_TYPES:
+            return obj
         # Python does share default arguments between calls, so we need to
         # create a new map if it is not provided.
-        if not visited:
-            visited = Map()
-        if not obj:
-            return obj
         if isinstance(obj, dict):
+            if not visited:
+                visited = Map()
             if obj in visited:
                 return visited[obj]
             o: Dict = {}
@@ -55,6 +60,8 @@ class ImplToApiMapping:
                 o[name] = self.from_maybe_impl(value, visited)
             return o
         if isinstance(obj, list):
+            if not visited:
+                visited = Map()
             if obj in visited:
                 return visited[obj]
             a: List = []
@@ -118,16 +125,10 @@ class ImplToApiMapping:
             raise Error("Maximum argument depth exceeded")
 
     def wrap_handler(self, handler: Callable[..., Any]) -> Callable[..., None]:
-        def wrapper_func(*args: Any) -> Any:
-            arg_count = len(inspect.signature(handler).parameters)
-            return handler(
-                *list(map(lambda a: self.from_maybe_impl(a), args))[:arg_count]
-            )
-
         if inspect.ismethod(handler):
             wrapper = getattr(handler.__self__, IMPL_ATTR + handler.__name__, None)
             if not wrapper:
-                wrapper = wrapper_func
+                wrapper = self._create_handler_wrapper(handler)
                 setattr(
                     handler.__self__,
                     IMPL_ATTR + handler.__name__,
@@ -137,6 +138,18 @@ class ImplToApiMapping:
 
         wrapper = getattr(handler, IMPL_ATTR, None)
         if not wrapper:
-            wrapper = wrapper_func
+            wrapper = self._create_handler_wrapper(handler)
             setattr(handler, IMPL_ATTR, wrapper)
         return wrapper
+
+    def _create_handler_wrapper(
+        self, handler: Callable[..., Any]
+    ) -> Callable[..., None]:
+        # The signature is inspected once, when the handler is registered.
+        arg_count = len(inspect.signature(handler).parameters)
+        from_maybe_impl = self.from_maybe_impl
+
+        def wrapper_func(*args: Any) -> Any:
+            return handler(*[from_maybe_impl(a) for a in args[:arg_count]])
+
+        return wrapper_func
@@ -0,0 +1,112 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Type, Union
+
+
+class JsonCodec(ABC):
+    name: str
+
+    @abstractmethod
+    def encode(self, obj: Any) -> bytes:
+        pass
+
+    @abstractmethod
+    def decode(self, data: Union[str, bytes, bytearray]) -> Any:
+        pass
+
+
+class StdlibJsonCodec(JsonCodec):
+    name = "json"
+
+    def encode(self, obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    def decode(self, data: Union[str, bytes, bytearray]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+
+    def encode(self, obj: Any) -> bytes:
+        try:
+            return self._orjson.dumps(obj)
+        except TypeError:
+            # orjson is stricter than the stdlib (e.g. non-str keys, ints wider
+            # than 64 bits), keep the previous behaviour for such messages.
+            return json.dumps(obj).encode()
+
+    def decode(self, data: Union[str, bytes, bytearray]) -> Any:
+        return self._orjson.loads(data)
+
+
+class MsgspecCodec(JsonCodec):
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+        self._encode_errors = (TypeError, ValueError, msgspec.MsgspecError)
+
+    def encode(self, obj: Any) -> bytes:
+        try:
+            return self._encoder.encode(obj)
+        except self._encode_errors:
+            return json.dumps(obj).encode()
+
+    def decode(self, data: Union[str, bytes, bytearray]) -> Any:
+        return self._decoder.decode(data)
+
+
+JSON_CODECS: Dict[str, Type[JsonCodec]] = {
+    "json": StdlibJsonCodec,
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+}
+
+# Preference order when no codec was requested explicitly.
+_AUTO_CODECS = ["orjson", "msgspec"]
+
+
+def get_json_codec(name: Optional[str] = None) -> JsonCodec:
+    """Resolves the codec used for driver protocol messages.
+
+    The name defaults to the PLAYWRIGHT_JSON_CODEC environment variable. "auto"
+    picks the fastest installed codec and falls back to the stdlib.
+    """
+    if name is None:
+        name = os.environ.get("PLAYWRIGHT_JSON_CODEC") or "auto"
+    if name == "auto":
+        for candidate in _AUTO_CODECS:
+            try:
+                return JSON_CODECS[candidate]()
+            except ImportError:
+                continue
+        return StdlibJsonCodec()
+    if name not in JSON_CODECS:
+        raise ValueError(
+            f"Unknown JSON codec '{name}', expected one of: auto, {', '.join(JSON_CODECS)}"
+        )
+    return JSON_CODECS[name]()
@@ -51,7 +51,7 @@ class JsonPipeTransport(AsyncIOEventEmitter, Transport):
         def handle_message(message: Dict) -> None:
             if self._stop_requested:
                 return
-            self.on_message(cast(ParsedMessagePayload, message))
+            self.on_message(cast(ParsedMessagePayload, message), 0)
 
         def handle_closed(reason: Optional[str]) -> None:
             self.emit("close", reason)
@@ -71,7 +71,9 @@ class JsonPipeTransport(AsyncIOEventEmitter, Transport):
     async def run(self) -> None:
         await self._stopped_future
 
-    def send(self, message: Dict) -> None:
+    def send(self, message: Dict) -> int:
         if self._stop_requested:
             raise Error("Playwright connection closed")
         self._pipe_channel.send_no_reply("send", None, {"message": message})
+        # The message is encoded as part of a message of the parent connection.
+        return 0
@@ -13,11 +13,15 @@
 # limitations under the License.
 
 import base64
-from typing import Dict, List, Optional, cast
+from typing import Dict, List, Optional, Tuple, cast
 
 from playwright_firefox._impl._api_structures import HeadersArray
 from playwright_firefox._impl._connection import ChannelOwner, StackFrame
-from playwright_firefox._impl._helper import HarLookupResult, locals_to_params
+from playwright_firefox._impl._helper import (
+    HarLookupResult,
+    LazyDict,
+    locals_to_params,
+)
 
 
 class LocalUtils(ChannelOwner):
@@ -25,10 +29,7 @@ class LocalUtils(ChannelOwner):
         self, parent: ChannelOwner, type: str, guid: str, initializer: Dict
     ) -> None:
         super().__init__(parent, type, guid, initializer)
-        self.devices = {
-            device["name"]: parse_device_descriptor(device["descriptor"])
-            for device in initializer["deviceDescriptors"]
-        }
+        self._device_descriptors: List[Dict] = initializer["deviceDescriptors"]
 
     async def zip(self, params: Dict) -> None:
         await self._channel.send("zip", None, params)
@@ -82,6 +83,41 @@ class LocalUtils(ChannelOwner):
         )
 
 
+# Device name -> (descriptor from the driver, parsed descriptor), shared by all
+# the connections of the process. Connections to the same driver version send
+# the same descriptors, so each one is parsed once.
+_parsed_descriptors: Dict[str, Tuple[Dict, Dict]] = {}
+
+
+class DeviceDescriptors(LazyDict):
+    """Device descriptors by name, parsed on first access. Lookups return a
+    copy of the descriptor, which callers can modify."""
+
+    __slots__ = ()
+
+    def __init__(self, descriptors: List[Dict]) -> None:
+        super().__init__(
+            ((device["name"], device["descriptor"]) for device in descriptors),
+            {device["name"] for device in descriptors},
+        )
+
+    def _convert(self, name: str, descriptor: Dict) -> Dict:
+        cached = _parsed_descriptors.get(name)
+        if cached and cached[0] == descriptor:
+            return cached[1]
+        parsed = parse_device_descriptor(descriptor)
+        _parsed_descriptors[name] = (descriptor, parsed)
+        return parsed
+
+    def __getitem__(self, name: str) -> Dict:
+        # Parsed descriptors are shared, callers get their own copy to modify.
+        descriptor = super().__getitem__(name)
+        return {
+            key: dict(value) if isinstance(value, dict) else value
+            for key, value in descriptor.items()
+        }
+
+
 def parse_device_descriptor(dict: Dict) -> Dict:
     return {
         "user_agent": dict["userAgent"],
@@ -0,0 +1,194 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bisect
+import os
+import sys
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Tuple
+
+# Upper bounds (in milliseconds) of the latency histogram buckets, the last
+# bucket collects everything above.
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+MetricsListener = Callable[[Dict[str, Any]], Any]
+
+
+def is_metrics_enabled() -> bool:
+    return bool(os.environ.get("PLAYWRIGHT_PROTOCOL_METRICS"))
+
+
+class _MethodStats:
+    __slots__ = (
+        "count",
+        "errors",
+        "total_ms",
+        "max_ms",
+        "buckets",
+        "request_bytes",
+        "response_bytes",
+    )
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        histogram = {
+            str(bound): count for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets)
+        }
+        histogram["+Inf"] = self.buckets[-1]
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "totalMs": self.total_ms,
+            "maxMs": self.max_ms,
+            "latencyHistogram": histogram,
+            "requestBytes": self.request_bytes,
+            "responseBytes": self.response_bytes,
+        }
+
+
+class _EventStats:
+    __slots__ = ("count", "listener_ms", "max_listener_ms", "bytes")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.listener_ms = 0.0
+        self.max_listener_ms = 0.0
+        self.bytes = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "listenerMs": self.listener_ms,
+            "maxListenerMs": self.max_listener_ms,
+            "bytes": self.bytes,
+        }
+
+
+class ProtocolMetrics:
+    """Opt-in protocol instrumentation shared by a connection and its children.
+
+    Calls are keyed as "<ObjectType>.<method>" and events as "<ObjectType>.<event>".
+    Sizes are those of the frames written to and read from the driver, messages
+    of connections made with BrowserType.connect travel inside the frames of
+    the parent connection and are counted as 0 bytes.
+    """
+
+    def __init__(self) -> None:
+        self._methods: Dict[str, _MethodStats] = {}
+        self._events: Dict[str, _EventStats] = {}
+        # Pending call -> (method key, start time, request bytes).
+        self._in_flight: Dict[Any, Tuple[str, float, int]] = {}
+        self._listeners: List[MetricsListener] = []
+        self._writes = 0
+        self._written_messages = 0
+        self._max_coalesced_messages = 0
+        self._max_buffered_bytes = 0
+
+    def add_listener(self, listener: MetricsListener) -> None:
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: MetricsListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def on_flush(self, messages: int, buffered: int) -> None:
+        self._writes += 1
+        self._written_messages += messages
+        self._max_coalesced_messages = max(self._max_coalesced_messages, messages)
+        self._max_buffered_bytes = max(self._max_buffered_bytes, buffered)
+
+    def on_request(self, call: Any, key: str, request_bytes: int) -> None:
+        self._in_flight[call] = (key, time.perf_counter(), request_bytes)
+
+    def on_response(self, call: Any, is_error: bool, response_bytes: int = 0) -> None:
+        entry = self._in_flight.pop(call, None)
+        if not entry:
+            return
+        key, start, request_bytes = entry
+        duration_ms = (time.perf_counter() - start) * 1000
+        stats = self._methods.get(key)
+        if not stats:
+            stats = self._methods[key] = _MethodStats()
+        stats.count += 1
+        if is_error:
+            stats.errors += 1
+        stats.total_ms += duration_ms
+        stats.max_ms = max(stats.max_ms, duration_ms)
+        stats.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, duration_ms)] += 1
+        stats.request_bytes += request_bytes
+        stats.response_bytes += response_bytes
+        if self._listeners:
+            self._notify(
+                {
+                    "type": "call",
+                    "method": key,
+                    "durationMs": duration_ms,
+                    "requestBytes": request_bytes,
+                    "responseBytes": response_bytes,
+                    "error": is_error,
+                }
+            )
+
+    def on_event(self, key: str, listener_ms: float, size: int) -> None:
+        stats = self._events.get(key)
+        if not stats:
+            stats = self._events[key] = _EventStats()
+        stats.count += 1
+        stats.listener_ms += listener_ms
+        stats.max_listener_ms = max(stats.max_listener_ms, listener_ms)
+        stats.bytes += size
+        if self._listeners:
+            self._notify(
+                {
+                    "type": "event",
+                    "event": key,
+                    "listenerMs": listener_ms,
+                    "bytes": size,
+                }
+            )
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "inFlight": len(self._in_flight),
+            "methods": {
+                key: stats.snapshot() for key, stats in sorted(self._methods.items())
+            },
+            "events": {
+                key: stats.snapshot() for key, stats in sorted(self._events.items())
+            },
+            "transport": {
+                "writes": self._writes,
+                "writtenMessages": self._written_messages,
+                "maxCoalescedMessages": self._max_coalesced_messages,
+                "maxBufferedBytes": self._max_buffered_bytes,
+            },
+        }
+
+    def _notify(self, sample: Dict[str, Any]) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(sample)
+            except Exception:
+                # An exporter must never break the protocol dispatch.
+                print("Error occurred in metrics listener", file=sys.stderr)
+                traceback.print_exc(file=sys.stderr)
@@ -14,11 +14,12 @@
 
 import asyncio
 import base64
-import inspect
+import functools
 import json
 import json as json_utils
 import mimetypes
 import re
+import sys
 from collections import defaultdict
 from pathlib import Path
 from types import SimpleNamespace
@@ -47,6 +48,7 @@ from playwright_firefox._impl._api_structures import (
 )
 from playwright_firefox._impl._connection import (
     ChannelOwner,
+    capture_frames,
     from_channel,
     from_nullable_channel,
 )
@@ -57,6 +59,7 @@ from playwright_firefox._impl._helper import (
     WebSocketRouteHandlerCallback,
     async_readfile,
     locals_to_params,
+    url_matcher,
     url_matches,
 )
 from playwright_firefox._impl._str_utils import escape_regex_flags
@@ -77,6 +80,8 @@ class FallbackOverrideParameters(TypedDict, total=False):
 
 
 class SerializedFallbackOverrides:
+    __slots__ = ("url", "method", "headers", "post_data_buffer")
+
     def __init__(self) -> None:
         self.url: Optional[str] = None
         self.method: Optional[str] = None
@@ -149,7 +154,6 @@ class Request(ChannelOwner):
             "responseStart": -1,
             "responseEnd": -1,
         }
-        self._provisional_headers = RawHeaders(self._initializer["headers"])
         self._all_headers_future: Optional[asyncio.Future[RawHeaders]] = None
         self._fallback_overrides: SerializedFallbackOverrides = (
             SerializedFallbackOverrides()
@@ -158,6 +162,11 @@ class Request(ChannelOwner):
     def __repr__(self) -> str:
         return f"<Request url={self.url!r} method={self.method!r}>"
 
+    @functools.cached_property
+    def _provisional_headers(self) -> "RawHeaders":
+        # The headers in the initializer are only walked when they are read.
+        return RawHeaders(self._initializer["headers"])
+
     def _apply_fallback_overrides(self, overrides: FallbackOverrideParameters) -> None:
         self._fallback_overrides.url = overrides.get(
             "url", self._fallback_overrides.url
@@ -573,11 +582,17 @@ class Route(ChannelOwner):
     async def _race_with_page_close(self, future: Coroutine) -> None:
         fut = asyncio.create_task(future)
         # Rewrite the user's stack to the new task which runs in the background.
-        setattr(
-            fut,
-            "__pw_stack__",
-            getattr(asyncio.current_task(self._loop), "__pw_stack__", inspect.stack(0)),
-        )
+        current_task = asyncio.current_task(self._loop)
+        sync_frame = getattr(current_task, "__pw_frame__", None)
+        if sync_frame:
+            setattr(fut, "__pw_frame__", sync_frame)
+        else:
+            setattr(
+                fut,
+                "__pw_stack__",
+                getattr(current_task, "__pw_stack__", None)
+                or capture_frames(sys._getframe()),
+            )
         target_closed_future = self.request._target_closed_future()
         await asyncio.wait(
             [fut, target_closed_future],
@@ -787,6 +802,7 @@ class WebSocketRouteHandler:
     ):
         self._base_url = base_url
         self.url = url
+        self._url_matcher = url_matcher(base_url, url, True)
         self.handler = handler
 
     @staticmethod
@@ -813,7 +829,7 @@ class WebSocketRouteHandler:
         return patterns
 
     def matches(self, ws_url: str) -> bool:
-        return url_matches(self._base_url, ws_url, self.url, True)
+        return url_matches(self._base_url, ws_url, self._url_matcher, True)
 
     async def handle(self, websocket_route: "WebSocketRoute") -> None:
         coro_or_future = self.handler(websocket_route)
@@ -837,15 +853,16 @@ class Response(ChannelOwner):
         self._request._timing["connectEnd"] = timing["connectEnd"]
         self._request._timing["requestStart"] = timing["requestStart"]
         self._request._timing["responseStart"] = timing["responseStart"]
-        self._provisional_headers = RawHeaders(
-            cast(HeadersArray, self._initializer["headers"])
-        )
         self._raw_headers_future: Optional[asyncio.Future[RawHeaders]] = None
         self._finished_future: asyncio.Future[bool] = asyncio.Future()
 
     def __repr__(self) -> str:
         return f"<Response url={self.url!r} request={self.request}>"
 
+    @functools.cached_property
+    def _provisional_headers(self) -> "RawHeaders":
+        return RawHeaders(cast(HeadersArray, self._initializer["headers"]))
+
     @property
     def url(self) -> str:
         return self._initializer["url"]
@@ -1035,11 +1052,20 @@ class WebSocket(ChannelOwner):
 
 
 class RawHeaders:
+    __slots__ = ("_headers_array", "_headers_map_cache")
+
     def __init__(self, headers: HeadersArray) -> None:
         self._headers_array = headers
-        self._headers_map: Dict[str, Dict[str, bool]] = defaultdict(dict)
-        for header in headers:
-            self._headers_map[header["name"].lower()][header["value"]] = True
+        # Most headers are never read, the lookup map is built on first use.
+        self._headers_map_cache: Optional[Dict[str, Dict[str, bool]]] = None
+
+    @property
+    def _headers_map(self) -> Dict[str, Dict[str, bool]]:
+        if self._headers_map_cache is None:
+            self._headers_map_cache = defaultdict(dict)
+            for header in self._headers_array:
+                self._headers_map_cache[header["name"].lower()][header["value"]] = True
+        return self._headers_map_cache
 
     @staticmethod
     def _from_headers_dict_lossy(headers: Dict[str, str]) -> "RawHeaders":
@@ -52,7 +52,11 @@ from playwright_firefox._impl._connection import (
 from playwright_firefox._impl._console_message import ConsoleMessage
 from playwright_firefox._impl._download import Download
 from playwright_firefox._impl._element_handle import ElementHandle
-from playwright_firefox._impl._errors import Error, TargetClosedError, is_target_closed_error
+from playwright_firefox._impl._errors import (
+    Error,
+    TargetClosedError,
+    is_target_closed_error,
+)
 from playwright_firefox._impl._event_context_manager import EventContextManagerImpl
 from playwright_firefox._impl._file_chooser import FileChooser
 from playwright_firefox._impl._frame import Frame
@@ -70,6 +74,7 @@ from playwright_firefox._impl._helper import (
     RouteFromHarNotFoundPolicy,
     RouteHandler,
     RouteHandlerCallback,
+    RouteIndex,
     TimeoutSettings,
     URLMatch,
     URLMatchRequest,
@@ -98,6 +103,10 @@ from playwright_firefox._impl._network import (
     WebSocketRouteHandler,
     serialize_headers,
 )
+from playwright_firefox._impl._response_cache import (
+    ResponseCache,
+    shared_response_cache,
+)
 from playwright_firefox._impl._video import Video
 from playwright_firefox._impl._waiter import Waiter
 
@@ -172,6 +181,7 @@ class Page(ChannelOwner):
         self._workers: List["Worker"] = []
         self._bindings: Dict[str, Any] = {}
         self._routes: List[RouteHandler] = []
+        self._route_index = RouteIndex()
         self._web_socket_routes: List[WebSocketRouteHandler] = []
         self._owned_context: Optional["BrowserContext"] = None
         self._timeout_settings: TimeoutSettings = TimeoutSettings(
@@ -284,7 +294,7 @@ class Page(ChannelOwner):
 
     async def _on_route(self, route: Route) -> None:
         route._context = self.context
-        route_handlers = self._routes.copy()
+        route_handlers = self._route_index.candidates(self._routes, route.request.url)
         for route_handler in route_handlers:
             # If the page was closed we stall all requests right away.
             if self._close_was_called or self.context._closing_or_closed:
@@ -295,6 +305,7 @@ class Page(ChannelOwner):
                 continue
             if route_handler.will_expire:
                 self._routes.remove(route_handler)
+                self._route_index.invalidate()
             try:
                 handled = await route_handler.handle(route)
             finally:
@@ -687,6 +698,7 @@ class Page(ChannelOwner):
                 times,
             ),
         )
+        self._route_index.invalidate()
         await self._update_interception_patterns()
 
     async def unroute(
@@ -708,6 +720,7 @@ class Page(ChannelOwner):
         behavior: Literal["default", "ignoreErrors", "wait"] = None,
     ) -> None:
         self._routes = remaining
+        self._route_index.invalidate()
         if behavior is not None and behavior != "default":
             await asyncio.gather(
                 *map(
@@ -764,6 +777,19 @@ class Page(ChannelOwner):
         self._har_routers.append(router)
         await router.add_page_route(self)
 
+    async def route_cache(
+        self,
+        url: Union[Pattern[str], str] = None,
+        store: ResponseCache = None,
+    ) -> None:
+        cache = store or shared_response_cache()
+        # Async routes await the returned task, the sync API doesn't await the
+        # result of route handlers so it can't be a bare coroutine.
+        await self.route(
+            url=url or "**/*",
+            handler=lambda route, _: asyncio.create_task(cache._handle(route)),
+        )
+
     async def _update_interception_patterns(self) -> None:
         patterns = RouteHandler.prepare_interception_patterns(self._routes)
         await self._channel.send(
@@ -12,11 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Dict
+from typing import Any, Callable, Dict
 
 from playwright_firefox._impl._browser_type import BrowserType
 from playwright_firefox._impl._connection import ChannelOwner, from_channel
+from playwright_firefox._impl._errors import Error
 from playwright_firefox._impl._fetch import APIRequest
+from playwright_firefox._impl._local_utils import DeviceDescriptors
+from playwright_firefox._impl._metrics import ProtocolMetrics
 from playwright_firefox._impl._selectors import Selectors
 
 
@@ -42,7 +45,10 @@ class Playwright(ChannelOwner):
 
         self.selectors = Selectors(self._loop, self._dispatcher_fiber)
 
-        self.devices = self._connection.local_utils.devices
+        # Each instance gets its own table, parsed descriptors are shared.
+        self.devices = DeviceDescriptors(
+            self._connection.local_utils._device_descriptors
+        )
 
     def __getitem__(self, value: str) -> "BrowserType":
         if value == "chromium":
@@ -56,5 +62,30 @@ class Playwright(ChannelOwner):
     def _set_selectors(self, selectors: Selectors) -> None:
         self.selectors = selectors
 
+    def metrics(self) -> Dict:
+        return self._protocol_metrics().snapshot()
+
+    def add_metrics_listener(self, callback: Callable[[Dict], Any]) -> None:
+        self._protocol_metrics().add_listener(callback)
+
+    def remove_metrics_listener(self, callback: Callable[[Dict], Any]) -> None:
+        self._protocol_metrics().remove_listener(callback)
+
+    def greenlet_profile(self) -> Dict:
+        profiler = self._connection._greenlet_profiler
+        if not profiler:
+            raise Error(
+                "Greenlet profiling is disabled, set PLAYWRIGHT_GREENLET_PROFILE=1 to enable it"
+            )
+        return profiler.snapshot()
+
+    def _protocol_metrics(self) -> ProtocolMetrics:
+        metrics = self._connection._metrics
+        if not metrics:
+            raise Error(
+                "Protocol metrics are disabled, set PLAYWRIGHT_PROTOCOL_METRICS=1 to enable them"
+            )
+        return metrics
+
     async def stop(self) -> None:
         pass
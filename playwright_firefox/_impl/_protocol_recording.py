@@ -0,0 +1,234 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import gzip
+import json
+import os
+import time
+from typing import IO, Dict, List, Optional, Tuple, Union
+
+from playwright_firefox._impl._errors import Error
+from playwright_firefox._impl._helper import ParsedMessagePayload
+from playwright_firefox._impl._json_codec import JsonCodec
+from playwright_firefox._impl._transport import PipeTransport, Transport
+
+# A recording holds one protocol message per line:
+#   ["s", <ms since start>, <message sent to the driver>]
+#   ["r", <ms since start>, <message received from the driver>]
+# Recordings whose path ends with ".gz" are gzip compressed.
+_SEND = "s"
+_RECEIVE = "r"
+
+
+def _open_recording(path: str, mode: str) -> IO[bytes]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode)  # type: ignore
+    return open(path, mode)
+
+
+def create_driver_transport(
+    loop: asyncio.AbstractEventLoop, json_codec: JsonCodec = None
+) -> Transport:
+    """Creates the transport to the driver, honouring the record/replay variables.
+
+    PLAYWRIGHT_RECORD_PROTOCOL=<path> records the session with a real driver,
+    PLAYWRIGHT_REPLAY_PROTOCOL=<path> answers from a recording without one.
+    """
+    replay_path = os.environ.get("PLAYWRIGHT_REPLAY_PROTOCOL")
+    if replay_path:
+        return ReplayTransport(loop, replay_path, json_codec)
+    record_path = os.environ.get("PLAYWRIGHT_RECORD_PROTOCOL")
+    if record_path:
+        return RecordingTransport(loop, record_path, json_codec)
+    return PipeTransport(loop, json_codec)
+
+
+class RecordingTransport(PipeTransport):
+    """Talks to the driver like PipeTransport and records every message."""
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        path: str,
+        json_codec: JsonCodec = None,
+    ) -> None:
+        super().__init__(loop, json_codec)
+        self._path = path
+        self._recording: Optional[IO[bytes]] = None
+        self._start_time = 0.0
+
+    async def connect(self) -> None:
+        self._recording = _open_recording(self._path, "wb")
+        self._start_time = time.monotonic()
+        await super().connect()
+
+    async def run(self) -> None:
+        try:
+            await super().run()
+        finally:
+            if self._recording:
+                self._recording.close()
+                self._recording = None
+
+    def serialize_message(self, message: Dict) -> bytes:
+        data = super().serialize_message(message)
+        self._record(_SEND, data)
+        return data
+
+    def deserialize_message(
+        self, data: Union[str, bytes, bytearray]
+    ) -> ParsedMessagePayload:
+        if isinstance(data, str):
+            data = data.encode()
+        self._record(_RECEIVE, data)
+        return super().deserialize_message(data)
+
+    def _record(self, direction: str, data: Union[bytes, bytearray]) -> None:
+        if not self._recording:
+            return
+        timestamp = (time.monotonic() - self._start_time) * 1000
+        # The message is already encoded, it is embedded as is.
+        self._recording.write(f'["{direction}",{timestamp:.3f},'.encode())
+        self._recording.write(data)
+        self._recording.write(b"]\n")
+
+
+class _ReplayedMessage:
+    __slots__ = ("timestamp", "sends_before", "data", "id")
+
+    def __init__(
+        self, timestamp: float, sends_before: int, data: bytes, id: Optional[int]
+    ) -> None:
+        self.timestamp = timestamp
+        # Number of client messages that preceded this one in the recording, it
+        # is only delivered once the client has sent as many.
+        self.sends_before = sends_before
+        self.data = data
+        self.id = id
+
+
+class ReplayTransport(Transport):
+    """Answers the client from a recording made with RecordingTransport.
+
+    Client messages are matched against the recorded ones by guid and method in
+    order, recorded responses are delivered with the ids the client actually used.
+    Messages go through the regular codec, so decoding and dispatch cost the same
+    as with a driver. Unless realtime is set, the recording is replayed as fast as
+    the client consumes it.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        path: str,
+        json_codec: JsonCodec = None,
+        realtime: bool = False,
+    ) -> None:
+        super().__init__(loop, json_codec)
+        self._path = path
+        self._realtime = realtime
+        self._stopped = False
+        self._sends: List[Tuple[str, str, Optional[int]]] = []
+        self._received: List[_ReplayedMessage] = []
+        # Recorded request id -> id used by the client during the replay.
+        self._ids: Dict[int, int] = {}
+        self._sent_count = 0
+
+    def request_stop(self) -> None:
+        self._stopped = True
+        self._wakeup.set()
+
+    async def wait_until_stopped(self) -> None:
+        await self._stopped_future
+
+    async def connect(self) -> None:
+        self._stopped_future: asyncio.Future = asyncio.Future()
+        self._wakeup = asyncio.Event()
+        try:
+            self._load()
+        except Exception as exc:
+            self.on_error_future.set_exception(exc)
+            raise exc
+
+    def _load(self) -> None:
+        with _open_recording(self._path, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                direction, timestamp, message = json.loads(line)
+                if direction == _SEND:
+                    self._sends.append(
+                        (message.get("guid", ""), message["method"], message.get("id"))
+                    )
+                else:
+                    self._received.append(
+                        _ReplayedMessage(
+                            timestamp,
+                            len(self._sends),
+                            self._json_codec.encode(message),
+                            message.get("id") if "method" not in message else None,
+                        )
+                    )
+
+    async def run(self) -> None:
+        start_time = time.monotonic()
+        for message in self._received:
+            while not self._stopped and self._sent_count < message.sends_before:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            if self._stopped:
+                break
+            if self._realtime:
+                delay = message.timestamp / 1000 - (time.monotonic() - start_time)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            obj = self.deserialize_message(message.data)
+            if message.id is not None:
+                obj["id"] = self._ids.pop(message.id)
+            self.on_message(obj, len(message.data))
+            await asyncio.sleep(0)
+        # The recording is exhausted, like a driver that stays idle.
+        while not self._stopped:
+            self._wakeup.clear()
+            await self._wakeup.wait()
+        self._stopped_future.set_result(None)
+
+    def send(self, message: Dict) -> int:
+        size = len(self.serialize_message(message))
+        if self._stopped or self.on_error_future.done():
+            return size
+        guid = message.get("guid", "")
+        method = message["method"]
+        if self._sent_count >= len(self._sends):
+            self.on_error_future.set_exception(
+                Error(
+                    f"Replay diverged: {guid}.{method} was sent after the end of the recording"
+                )
+            )
+            return size
+        recorded_guid, recorded_method, recorded_id = self._sends[self._sent_count]
+        if (recorded_guid, recorded_method) != (guid, method):
+            self.on_error_future.set_exception(
+                Error(
+                    f"Replay diverged at message #{self._sent_count}: expected "
+                    f"{recorded_guid}.{recorded_method}, got {guid}.{method}"
+                )
+            )
+            return size
+        if recorded_id is not None:
+            self._ids[recorded_id] = message["id"]
+        self._sent_count += 1
+        self._wakeup.set()
+        return size
@@ -0,0 +1,393 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
+from playwright_firefox._impl._api_structures import Headers
+from playwright_firefox._impl._errors import Error
+
+if TYPE_CHECKING:  # pragma: no cover
+    from playwright_firefox._impl._fetch import APIResponse
+    from playwright_firefox._impl._network import Route
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Statuses that are cacheable by default, RFC 9110 15.1.
+_CACHEABLE_STATUSES = (200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501)
+
+# The body of a fetched response is already decoded and is served to other
+# contexts, which have their own cookies.
+_UNCACHED_HEADERS = (
+    "connection",
+    "content-encoding",
+    "content-length",
+    "keep-alive",
+    "set-cookie",
+    "transfer-encoding",
+)
+
+_VaryKey = Tuple[Tuple[str, Optional[str]], ...]
+
+
+class _CachedResponse:
+    __slots__ = (
+        "vary",
+        "status",
+        "headers",
+        "body",
+        "file",
+        "size",
+        "expires",
+        "etag",
+        "last_modified",
+    )
+
+    def __init__(
+        self,
+        vary: _VaryKey,
+        status: int,
+        headers: Dict[str, str],
+        size: int,
+        expires: float,
+    ) -> None:
+        self.vary = vary
+        self.status = status
+        self.headers = headers
+        # Bodies are kept either in memory or in a file of the on disk store.
+        self.body: Optional[bytes] = None
+        self.file: Optional[str] = None
+        self.size = size
+        self.expires = expires
+        self.etag = headers.get("etag")
+        self.last_modified = headers.get("last-modified")
+
+
+class ResponseCache:
+    """A size bounded LRU of the responses fetched by ``route_cache`` routes.
+
+    One cache can be passed to the routes of several contexts, even from
+    different threads, so that they share the responses. Responses are keyed
+    by method, URL and the request headers named in their Vary header, their
+    freshness follows Cache-Control, Expires and Last-Modified, and stale
+    responses with an ETag or a Last-Modified date are revalidated.
+
+    With ``path``, bodies are stored in files of that directory and read back
+    when they are served, so that only the index stays in memory. Files are
+    named uniquely, several caches and processes can share the directory.
+    ``close()`` removes the files of this cache.
+    """
+
+    def __init__(
+        self, max_bytes: int = DEFAULT_MAX_BYTES, path: Union[str, Path] = None
+    ) -> None:
+        self._max_bytes = max_bytes
+        self._path = str(path) if path is not None else None
+        if self._path:
+            os.makedirs(self._path, exist_ok=True)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], List[_CachedResponse]]" = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._revalidations = 0
+        self._stores = 0
+        self._evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters of the cache, hitRate counts revalidated responses as hits."""
+        with self._lock:
+            served = self._hits + self._revalidations
+            lookups = served + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "revalidations": self._revalidations,
+                "stores": self._stores,
+                "evictions": self._evictions,
+                "entries": sum(len(variants) for variants in self._entries.values()),
+                "bytes": self._bytes,
+                "maxBytes": self._max_bytes,
+                "hitRate": served / lookups if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        """Drops the cached responses and removes their files from disk."""
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            for variants in self._entries.values():
+                for entry in variants:
+                    self._remove_file(entry)
+            self._entries.clear()
+            self._bytes = 0
+
+    async def _handle(self, route: "Route") -> None:
+        request = route.request
+        headers = request.headers
+        request_directives = _cache_control(headers)
+        if (
+            request.method != "GET"
+            or "range" in headers
+            or "no-store" in request_directives
+        ):
+            await route.fallback()
+            return
+
+        entry = self._lookup(request.url, headers)
+        if (
+            entry
+            and entry.expires > time.time()
+            and "no-cache" not in request_directives
+        ):
+            body = await self._body(entry)
+            if body is not None:
+                with self._lock:
+                    self._hits += 1
+                await route.fulfill(
+                    status=entry.status, headers=entry.headers, body=body
+                )
+                return
+
+        fetch_headers: Optional[Dict[str, str]] = None
+        if entry and (entry.etag or entry.last_modified):
+            fetch_headers = dict(headers)
+            if entry.etag:
+                fetch_headers["if-none-match"] = entry.etag
+            if entry.last_modified:
+                fetch_headers["if-modified-since"] = entry.last_modified
+        response = await self._fetch(route, fetch_headers)
+        if response is None:
+            return
+        if entry and response.status == 304:
+            body = await self._body(entry)
+            if body is not None:
+                self._refresh(entry, response.headers)
+                with self._lock:
+                    self._revalidations += 1
+                await route.fulfill(
+                    status=entry.status, headers=entry.headers, body=body
+                )
+                return
+            # The entry was evicted meanwhile, the response has to be fetched again.
+            response = await self._fetch(route, None)
+            if response is None:
+                return
+
+        with self._lock:
+            self._misses += 1
+        await self._store(request.url, headers, response)
+        await route.fulfill(response=response)
+
+    async def _fetch(
+        self, route: "Route", headers: Optional[Dict[str, str]]
+    ) -> Optional["APIResponse"]:
+        try:
+            # Redirects are cached and served as they are, the browser follows them.
+            return await route.fetch(headers=headers, maxRedirects=0)
+        except Error:
+            # Responses that can't be fetched here are left to the other routes
+            # and the browser, which report the failure to the page.
+            await route.fallback()
+            return None
+
+    def _lookup(self, url: str, headers: Headers) -> Optional[_CachedResponse]:
+        with self._lock:
+            variants = self._entries.get(("GET", url))
+            if not variants:
+                return None
+            self._entries.move_to_end(("GET", url))
+            for entry in variants:
+                if all(headers.get(name) == value for name, value in entry.vary):
+                    return entry
+            return None
+
+    async def _body(self, entry: _CachedResponse) -> Optional[bytes]:
+        if entry.file is None:
+            return entry.body
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(None, _read, entry.file)
+        except OSError:
+            return None
+
+    def _refresh(self, entry: _CachedResponse, headers: Headers) -> None:
+        # A 304 carries the headers that the stored response should now have.
+        updated = {**entry.headers, **_stored_headers(headers)}
+        freshness = _freshness(updated)
+        with self._lock:
+            entry.headers = updated
+            entry.expires = time.time() + (freshness or 0)
+
+    async def _store(
+        self, url: str, request_headers: Headers, response: "APIResponse"
+    ) -> None:
+        if response.status not in _CACHEABLE_STATUSES:
+            return
+        headers = response.headers
+        directives = _cache_control(headers)
+        if "no-store" in directives or "private" in directives:
+            return
+        if (
+            "authorization" in request_headers
+            and "public" not in directives
+            and "s-maxage" not in directives
+        ):
+            return
+        vary_names = [
+            name.strip().lower()
+            for name in headers.get("vary", "").split(",")
+            if name.strip()
+        ]
+        if "*" in vary_names:
+            return
+        freshness = _freshness(headers)
+        if freshness is None and not ("etag" in headers or "last-modified" in headers):
+            return
+
+        body = await response.body()
+        if len(body) > self._max_bytes:
+            return
+        entry = _CachedResponse(
+            tuple((name, request_headers.get(name)) for name in vary_names),
+            response.status,
+            _stored_headers(headers),
+            len(body),
+            time.time() + (freshness or 0),
+        )
+        if self._path:
+            entry.file = os.path.join(self._path, f"{uuid.uuid4().hex}.body")
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, _write, entry.file, body)
+        else:
+            entry.body = body
+
+        with self._lock:
+            key = ("GET", url)
+            variants = self._entries.setdefault(key, [])
+            for previous in variants:
+                if previous.vary == entry.vary:
+                    variants.remove(previous)
+                    self._bytes -= previous.size
+                    self._remove_file(previous)
+                    break
+            variants.append(entry)
+            self._entries.move_to_end(key)
+            self._bytes += entry.size
+            self._stores += 1
+            while self._bytes > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                for previous in evicted:
+                    self._bytes -= previous.size
+                    self._remove_file(previous)
+                    self._evictions += 1
+
+    def _remove_file(self, entry: _CachedResponse) -> None:
+        if entry.file is not None:
+            try:
+                os.remove(entry.file)
+            except OSError:
+                pass
+
+
+def _write(file: str, body: bytes) -> None:
+    with open(file, "wb") as f:
+        f.write(body)
+
+
+def _read(file: str) -> bytes:
+    with open(file, "rb") as f:
+        return f.read()
+
+
+def _stored_headers(headers: Headers) -> Dict[str, str]:
+    return {
+        name: value
+        for name, value in headers.items()
+        if name.lower() not in _UNCACHED_HEADERS
+    }
+
+
+def _cache_control(headers: Headers) -> Dict[str, Optional[str]]:
+    directives: Dict[str, Optional[str]] = {}
+    for directive in headers.get("cache-control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') if value else None
+    return directives
+
+
+def _freshness(headers: Headers) -> Optional[float]:
+    """Seconds a response stays fresh in a shared cache, None if it can't be
+    cached without being revalidated."""
+    directives = _cache_control(headers)
+    if "no-cache" in directives:
+        return None
+    age = _seconds(headers.get("age")) or 0
+    for directive in ("s-maxage", "max-age"):
+        if directive in directives:
+            max_age = _seconds(directives[directive])
+            if max_age is not None:
+                return max(max_age - age, 0)
+    date = _http_date(headers.get("date"))
+    expires = headers.get("expires")
+    if expires is not None:
+        expires_at = _http_date(expires)
+        if expires_at is None:
+            return 0
+        return max(expires_at - (date or time.time()) - age, 0)
+    last_modified = _http_date(headers.get("last-modified"))
+    if last_modified is not None:
+        # The heuristic freshness of RFC 9111 4.2.2.
+        return max(((date or time.time()) - last_modified) / 10 - age, 0)
+    return None
+
+
+def _seconds(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+_shared_cache: Optional[ResponseCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def shared_response_cache() -> ResponseCache:
+    """The cache of the ``route_cache`` routes that were not given a store."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache()
+        return _shared_cache
@@ -0,0 +1,46 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+from playwright_firefox._impl._connection import Connection
+from playwright_firefox._impl._errors import Error
+
+# Seconds a shared driver stays up once its last session has ended.
+DEFAULT_IDLE_TIMEOUT = 30.0
+
+
+def shared_driver_idle_timeout() -> float:
+    """The idle timeout of shared drivers, from PLAYWRIGHT_SHARED_DRIVER_IDLE_TIMEOUT.
+
+    A timeout of 0 stops the driver as soon as its last session ends.
+    """
+    value = os.environ.get("PLAYWRIGHT_SHARED_DRIVER_IDLE_TIMEOUT")
+    if not value:
+        return DEFAULT_IDLE_TIMEOUT
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        raise Error(
+            f"PLAYWRIGHT_SHARED_DRIVER_IDLE_TIMEOUT must be a number of seconds, got {value!r}"
+        )
+
+
+def is_driver_alive(connection: Connection) -> bool:
+    """Whether the driver behind the connection can still serve calls, it is
+    not the case once it has crashed or the connection was stopped."""
+    return (
+        connection._closed_error is None
+        and not connection._transport.on_error_future.done()
+    )
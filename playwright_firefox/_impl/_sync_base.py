@@ -13,9 +13,10 @@
 # limitations under the License.
 
 import asyncio
-import inspect
-import traceback
+import concurrent.futures
+import sys
 from contextlib import AbstractContextManager
+from contextvars import ContextVar
 from types import TracebackType
 from typing import (
     Any,
@@ -23,6 +24,7 @@ from typing import (
     Coroutine,
     Generator,
     Generic,
+    List,
     Optional,
     Type,
     TypeVar,
@@ -32,6 +34,8 @@ from typing import (
 
 import greenlet
 
+from playwright_firefox._impl._connection import capture_frames
+from playwright_firefox._impl._greenlets import is_worker_thread
 from playwright_firefox._impl._helper import Error
 from playwright_firefox._impl._impl_to_api_mapping import ImplToApiMapping, ImplWrapper
 
@@ -41,16 +45,38 @@ mapping = ImplToApiMapping()
 T = TypeVar("T")
 Self = TypeVar("Self", bound="SyncContextManager")
 
+# The batch that the calls of the current thread and greenlet are queued into.
+# Greenlets each have their own context, so a batch doesn't capture the calls
+# other greenlets make on the same object, e.g. from event handlers.
+_current_batch: ContextVar[Optional["SyncBatch"]] = ContextVar(
+    "_current_batch", default=None
+)
+
 
 class EventInfo(Generic[T]):
-    def __init__(self, sync_base: "SyncBase", future: "asyncio.Future[T]") -> None:
+    def __init__(
+        self,
+        sync_base: "SyncBase",
+        future_factory: Callable[[], "asyncio.Future[T]"],
+    ) -> None:
         self._sync_base = sync_base
-        self._future = future
+        self._in_worker_thread = is_worker_thread(sync_base._dispatcher_fiber)
+        if self._in_worker_thread:
+            self._future = sync_base._call_in_loop_thread(future_factory)
+            return
+        self._future = future_factory()
         g_self = greenlet.getcurrent()
         self._future.add_done_callback(lambda _: g_self.switch())
 
     @property
     def value(self) -> T:
+        if self._in_worker_thread:
+            return cast(
+                T,
+                mapping.from_maybe_impl(
+                    self._sync_base._sync_from_worker_thread(self._result())
+                ),
+            )
         while not self._future.done():
             self._sync_base._dispatcher_fiber.switch()
         asyncio._set_running_loop(self._sync_base._loop)
@@ -59,16 +85,26 @@ class EventInfo(Generic[T]):
             raise exception
         return cast(T, mapping.from_maybe_impl(self._future.result()))
 
+    async def _result(self) -> T:
+        return await self._future
+
     def _cancel(self) -> None:
-        self._future.cancel()
+        if self._in_worker_thread:
+            self._sync_base._loop.call_soon_threadsafe(self._future.cancel)
+        else:
+            self._future.cancel()
 
     def is_done(self) -> bool:
         return self._future.done()
 
 
 class EventContextManager(Generic[T], AbstractContextManager):
-    def __init__(self, sync_base: "SyncBase", future: "asyncio.Future[T]") -> None:
-        self._event = EventInfo[T](sync_base, future)
+    def __init__(
+        self,
+        sync_base: "SyncBase",
+        future_factory: Callable[[], "asyncio.Future[T]"],
+    ) -> None:
+        self._event = EventInfo[T](sync_base, future_factory)
 
     def __enter__(self) -> EventInfo[T]:
         return self._event
@@ -85,9 +121,97 @@ class EventContextManager(Generic[T], AbstractContextManager):
             self._event.value
 
 
+class BatchResult(Generic[T]):
+    def __init__(self, task: "asyncio.Task[T]") -> None:
+        self._task = task
+
+    @property
+    def value(self) -> T:
+        if not self._task.done():
+            raise Error("Batch results are only available after the batch has run")
+        if self._task.cancelled():
+            raise Error("The batch was cancelled")
+        exception = self._task.exception()
+        if exception:
+            raise exception
+        return cast(T, mapping.from_maybe_impl(self._task.result()))
+
+
+class SyncBatch(AbstractContextManager):
+    def __init__(self, sync_base: "SyncBase") -> None:
+        self._sync_base = sync_base
+        self._tasks: List[asyncio.Task] = []
+
+    def __enter__(self) -> "SyncBatch":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        tasks = self._tasks
+        self._tasks = []
+        if exc_val:
+            for task in tasks:
+                task.cancel()
+            return
+        if tasks:
+            # All queued calls start in the same loop iteration, so their requests
+            # go out together and only one round-trip is waited for.
+            self._sync_base._sync(asyncio.wait(tasks))
+
+    def _queue(self, coro: Coroutine[Any, Any, Any]) -> BatchResult:
+        sync_base = self._sync_base
+        if is_worker_thread(sync_base._dispatcher_fiber):
+            task = sync_base._call_in_loop_thread(
+                lambda: sync_base._loop.create_task(coro)
+            )
+        else:
+            task = sync_base._loop.create_task(coro)
+        # The call runs after the caller moved on, keep a snapshot of its stack.
+        # Frames of this module are left out so that the generated API method
+        # is reported as the API name, not the batch.
+        frames = [
+            entry
+            for entry in capture_frames(sys._getframe(1))
+            if entry[0].f_code.co_filename != __file__
+        ]
+        setattr(task, "__pw_stack__", frames)
+        self._tasks.append(task)
+        return BatchResult(task)
+
+    def __getattr__(self, name: str) -> Callable[..., BatchResult]:
+        method = getattr(self._sync_base, name)
+        if any(
+            name in cls.__dict__.get("_post_processed_methods", ())
+            for cls in type(self._sync_base).__mro__
+        ):
+            raise Error(f"{name}() cannot be batched")
+
+        def queue(*args: Any, **kwargs: Any) -> BatchResult:
+            queued = len(self._tasks)
+            token = _current_batch.set(self)
+            try:
+                result = method(*args, **kwargs)
+            finally:
+                _current_batch.reset(token)
+            if not isinstance(result, BatchResult):
+                for task in self._tasks[queued:]:
+                    task.cancel()
+                del self._tasks[queued:]
+                raise Error(f"{name}() cannot be batched")
+            return result
+
+        return queue
+
+
 class SyncBase(ImplWrapper):
+    __slots__ = ("_loop", "_dispatcher_fiber")
+
     def __init__(self, impl_obj: Any) -> None:
-        super().__init__(impl_obj)
+        self._impl_obj = impl_obj
         self._loop: asyncio.AbstractEventLoop = impl_obj._loop
         self._dispatcher_fiber = impl_obj._dispatcher_fiber
 
@@ -102,11 +226,17 @@ class SyncBase(ImplWrapper):
         if self._loop.is_closed():
             coro.close()
             raise Error("Event loop is closed! Is Playwright already stopped?")
+        batch = _current_batch.get()
+        if batch and batch._sync_base is self:
+            return batch._queue(cast(Coroutine[Any, Any, Any], coro))
+        if is_worker_thread(self._dispatcher_fiber):
+            return self._sync_from_worker_thread(coro)
 
         g_self = greenlet.getcurrent()
         task: asyncio.tasks.Task[Any] = self._loop.create_task(coro)
-        setattr(task, "__pw_stack__", inspect.stack(0))
-        setattr(task, "__pw_stack_trace__", traceback.extract_stack(limit=10))
+        # This greenlet stays blocked below until the task is done, so its frames
+        # can be walked lazily if the call site or an error stack is needed.
+        setattr(task, "__pw_frame__", sys._getframe())
 
         task.add_done_callback(lambda _: g_self.switch())
         while not task.done():
@@ -114,6 +244,46 @@ class SyncBase(ImplWrapper):
         asyncio._set_running_loop(self._loop)
         return task.result()
 
+    def _sync_from_worker_thread(
+        self,
+        coro: Union[Coroutine[Any, Any, Any], Generator[Any, Any, Any]],
+    ) -> Any:
+        __tracebackhide__ = True
+        # The loop runs in the dispatcher thread, the call is started there and
+        # this thread blocks until it is done.
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        frame = sys._getframe()
+
+        def start() -> None:
+            task = self._loop.create_task(coro)
+            # This thread stays blocked on the future, its frames can be walked
+            # lazily like those of a blocked greenlet.
+            setattr(task, "__pw_frame__", frame)
+            task.add_done_callback(lambda _: _copy_task_outcome(task, future))
+
+        self._loop.call_soon_threadsafe(start)
+        return future.result()
+
+    def _call_in_loop_thread(self, fn: Callable[[], T]) -> T:
+        async def call() -> T:
+            return fn()
+
+        return self._sync_from_worker_thread(call())
+
+    def batch(self) -> SyncBatch:
+        """Queues the calls made through the returned batch and runs them together
+        when the ``with`` block exits. Each call returns a result whose ``value``
+        is available after the block.
+
+        ```py
+        with page.batch() as batch:
+            title = batch.title()
+            heading = batch.text_content("h1")
+        print(title.value, heading.value)
+        ```
+        """
+        return SyncBatch(self)
+
     def _wrap_handler(
         self, handler: Union[Callable[..., Any], Any]
     ) -> Callable[..., None]:
@@ -121,22 +291,41 @@ class SyncBase(ImplWrapper):
             return mapping.wrap_handler(handler)
         return handler
 
+    def _call_in_dispatcher(self, fn: Callable[[], T]) -> T:
+        if is_worker_thread(self._dispatcher_fiber):
+            return self._call_in_loop_thread(fn)
+        return fn()
+
     def on(self, event: Any, f: Any) -> None:
         """Registers the function ``f`` to the event name ``event``."""
-        self._impl_obj.on(event, self._wrap_handler(f))
+        handler = self._wrap_handler(f)
+        self._call_in_dispatcher(lambda: self._impl_obj.on(event, handler))
 
     def once(self, event: Any, f: Any) -> None:
         """The same as ``self.on``, except that the listener is automatically
         removed after being called.
         """
-        self._impl_obj.once(event, self._wrap_handler(f))
+        handler = self._wrap_handler(f)
+        self._call_in_dispatcher(lambda: self._impl_obj.once(event, handler))
 
     def remove_listener(self, event: Any, f: Any) -> None:
         """Removes the function ``f`` from ``event``."""
-        self._impl_obj.remove_listener(event, self._wrap_handler(f))
+        handler = self._wrap_handler(f)
+        self._call_in_dispatcher(lambda: self._impl_obj.remove_listener(event, handler))
+
+
+def _copy_task_outcome(task: asyncio.Task, future: concurrent.futures.Future) -> None:
+    if task.cancelled():
+        future.cancel()
+    elif task.exception():
+        future.set_exception(cast(BaseException, task.exception()))
+    else:
+        future.set_result(task.result())
 
 
 class SyncContextManager(SyncBase):
+    __slots__ = ()
+
     def __enter__(self: Self) -> Self:
         return self
 
@@ -19,10 +19,11 @@ import os
 import subprocess
 import sys
 from abc import ABC, abstractmethod
-from typing import Callable, Dict, Optional, Union
+from typing import Callable, Dict, List, Optional, Union
 
 from playwright_firefox._impl._driver import compute_driver_executable, get_driver_env
 from playwright_firefox._impl._helper import ParsedMessagePayload
+from playwright_firefox._impl._json_codec import JsonCodec, get_json_codec
 
 
 # Sourced from: https://github.com/pytest-dev/pytest/blob/da01ee0a4bb0af780167ecd228ab3ad249511302/src/_pytest/faulthandler.py#L69-L77
@@ -45,10 +46,62 @@ def _get_stderr_fileno() -> Optional[int]:
         return sys.__stderr__.fileno()
 
 
+READ_CHUNK_SIZE = 32768
+# Callers awaiting Transport.drain() are paused while more than this many bytes
+# are waiting to be written to the driver.
+WRITE_HIGH_WATER_MARK = 1024 * 1024
+
+
+class FrameReader:
+    """Reads length-prefixed driver frames from a stream.
+
+    Each frame is copied into a buffer allocated once for its full size, so large
+    messages are assembled in linear time instead of being concatenated chunk by
+    chunk.
+    """
+
+    def __init__(
+        self, stream: asyncio.StreamReader, chunk_size: int = READ_CHUNK_SIZE
+    ) -> None:
+        self._stream = stream
+        self._chunk_size = chunk_size
+
+    async def read_frame(self) -> Union[bytes, bytearray]:
+        header = await self._stream.readexactly(4)
+        length = int.from_bytes(header, byteorder="little", signed=False)
+        if length <= self._chunk_size:
+            return await self._stream.readexactly(length)
+        frame = bytearray(length)
+        view = memoryview(frame)
+        offset = 0
+        while offset < length:
+            # read() hands back whatever is already buffered instead of waiting for
+            # a full chunk, the data is copied straight into the frame buffer.
+            data = await self._stream.read(min(length - offset, self._chunk_size))
+            if not data:
+                raise asyncio.IncompleteReadError(bytes(view[:offset]), length)
+            end = offset + len(data)
+            view[offset:end] = data
+            offset = end
+        view.release()
+        return frame
+
+
 class Transport(ABC):
-    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, json_codec: JsonCodec = None
+    ) -> None:
         self._loop = loop
-        self.on_message: Callable[[ParsedMessagePayload], None] = lambda _: None
+        self._json_codec = json_codec or get_json_codec()
+        self._debug_protocol = "DEBUGP" in os.environ
+        # Called with every message from the driver and the size of its frame in
+        # bytes, 0 when the message was not encoded by this transport.
+        self.on_message: Callable[[ParsedMessagePayload, int], None] = (
+            lambda message, size: None
+        )
+        # Called after each write with the number of coalesced messages and the
+        # number of bytes still buffered towards the driver.
+        self.on_flush: Callable[[int, int], None] = lambda messages, buffered: None
         self.on_error_future: asyncio.Future = loop.create_future()
 
     @abstractmethod
@@ -71,30 +124,42 @@ class Transport(ABC):
         pass
 
     @abstractmethod
-    def send(self, message: Dict) -> None:
+    def send(self, message: Dict) -> int:
+        """Returns the size of the encoded message in bytes, 0 if it is not encoded."""
+
+    async def drain(self) -> None:
         pass
 
     def serialize_message(self, message: Dict) -> bytes:
-        msg = json.dumps(message)
-        if "DEBUGP" in os.environ:  # pragma: no cover
+        msg = self._json_codec.encode(message)
+        if self._debug_protocol:  # pragma: no cover
             print("\x1b[32mSEND>\x1b[0m", json.dumps(message, indent=2))
-        return msg.encode()
+        return msg
 
-    def deserialize_message(self, data: Union[str, bytes]) -> ParsedMessagePayload:
-        obj = json.loads(data)
+    def deserialize_message(
+        self, data: Union[str, bytes, bytearray]
+    ) -> ParsedMessagePayload:
+        obj = self._json_codec.decode(data)
 
-        if "DEBUGP" in os.environ:  # pragma: no cover
+        if self._debug_protocol:  # pragma: no cover
             print("\x1b[33mRECV>\x1b[0m", json.dumps(obj, indent=2))
         return obj
 
 
 class PipeTransport(Transport):
-    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
-        super().__init__(loop)
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, json_codec: JsonCodec = None
+    ) -> None:
+        super().__init__(loop, json_codec)
         self._stopped = False
+        self._pending_writes: List[bytes] = []
+        self._pending_messages = 0
+        self._pending_bytes = 0
+        self._flush_scheduled = False
 
     def request_stop(self) -> None:
         assert self._output
+        self._flush()
         self._stopped = True
         self._output.close()
 
@@ -133,46 +198,77 @@ class PipeTransport(Transport):
             raise exc
 
         self._output = self._proc.stdin
+        assert self._output
+        self._output.transport.set_write_buffer_limits(high=WRITE_HIGH_WATER_MARK)
 
     async def run(self) -> None:
         assert self._proc.stdout
         assert self._proc.stdin
+        reader = FrameReader(self._proc.stdout)
         while not self._stopped:
             try:
-                buffer = await self._proc.stdout.readexactly(4)
+                frame = await reader.read_frame()
                 if self._stopped:
                     break
-                length = int.from_bytes(buffer, byteorder="little", signed=False)
-                buffer = bytes(0)
-                while length:
-                    to_read = min(length, 32768)
-                    data = await self._proc.stdout.readexactly(to_read)
-                    if self._stopped:
-                        break
-                    length -= to_read
-                    if len(buffer):
-                        buffer = buffer + data
-                    else:
-                        buffer = data
-                if self._stopped:
-                    break
-
-                obj = self.deserialize_message(buffer)
-                self.on_message(obj)
+                obj = self.deserialize_message(frame)
+                self.on_message(obj, len(frame))
             except asyncio.IncompleteReadError:
-                if not self._stopped:
+                if not self._stopped and not self.on_error_future.done():
                     self.on_error_future.set_exception(
                         Exception("Connection closed while reading from the driver")
                     )
                 break
+            # Let the callers waiting on this message resume before the next one is
+            # dispatched, so that they can subscribe to the events that follow it.
             await asyncio.sleep(0)
 
         await self._proc.communicate()
         self._stopped_future.set_result(None)
 
-    def send(self, message: Dict) -> None:
+    def send(self, message: Dict) -> int:
         assert self._output
         data = self.serialize_message(message)
-        self._output.write(
-            len(data).to_bytes(4, byteorder="little", signed=False) + data
-        )
+        frame = len(data).to_bytes(4, byteorder="little", signed=False)
+        if not self._flush_scheduled:
+            # The first message of a loop iteration is written right away, the
+            # ones sent after it in the same iteration are coalesced into a
+            # single write.
+            self._flush_scheduled = True
+            self._loop.call_soon(self._flush)
+            self._write(frame + data, 1)
+            return len(data)
+        self._pending_writes.append(frame)
+        self._pending_writes.append(data)
+        self._pending_messages += 1
+        self._pending_bytes += len(data) + 4
+        return len(data)
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        if not self._pending_writes:
+            return
+        messages = self._pending_messages
+        data = b"".join(self._pending_writes)
+        self._pending_writes.clear()
+        self._pending_messages = 0
+        self._pending_bytes = 0
+        self._write(data, messages)
+
+    def _write(self, data: bytes, messages: int) -> None:
+        assert self._output
+        self._output.write(data)
+        self.on_flush(messages, self._output.transport.get_write_buffer_size())
+
+    async def drain(self) -> None:
+        assert self._output
+        buffered = self._pending_bytes + self._output.transport.get_write_buffer_size()
+        if buffered <= WRITE_HIGH_WATER_MARK:
+            return
+        self._flush()
+        try:
+            await self._output.drain()
+        except ConnectionError as exc:
+            if not self.on_error_future.done():
+                error = Exception("Connection closed while writing to the driver")
+                error.__cause__ = exc
+                self.on_error_future.set_exception(error)
@@ -13,11 +13,28 @@
 # limitations under the License.
 
 import asyncio
-from typing import Any
+import weakref
+from typing import Any, Dict, List, Optional, Union, cast
 
 from playwright_firefox._impl._connection import Connection
+from playwright_firefox._impl._json_codec import get_json_codec
+from playwright_firefox._impl._local_utils import DeviceDescriptors
 from playwright_firefox._impl._object_factory import create_remote_object
-from playwright_firefox._impl._transport import PipeTransport
+from playwright_firefox._impl._playwright import Playwright
+from playwright_firefox._impl._protocol_recording import create_driver_transport
+from playwright_firefox._impl._shared_driver import (
+    is_driver_alive,
+    shared_driver_idle_timeout,
+)
+from playwright_firefox.async_api._generated import APIRequest as AsyncAPIRequest
+from playwright_firefox.async_api._generated import (
+    APIRequestContext as AsyncAPIRequestContext,
+)
+from playwright_firefox.async_api._generated import Browser as AsyncBrowser
+from playwright_firefox.async_api._generated import (
+    BrowserContext as AsyncBrowserContext,
+)
+from playwright_firefox.async_api._generated import BrowserType as AsyncBrowserType
 from playwright_firefox.async_api._generated import Playwright as AsyncPlaywright
 
 
@@ -25,13 +42,14 @@ class PlaywrightContextManager:
     def __init__(self) -> None:
         self._connection: Connection
         self._exit_was_called = False
+        self._json_codec = get_json_codec()
 
     async def __aenter__(self) -> AsyncPlaywright:
         loop = asyncio.get_running_loop()
         self._connection = Connection(
             None,
             create_remote_object,
-            PipeTransport(loop),
+            create_driver_transport(loop, self._json_codec),
             loop,
         )
         loop.create_task(self._connection.run())
@@ -55,3 +73,205 @@ class PlaywrightContextManager:
             return
         self._exit_was_called = True
         await self._connection.stop_async()
+
+
+# What a shared session started, it is closed or disposed with the session.
+_SessionResource = Union[AsyncBrowser, AsyncBrowserContext, AsyncAPIRequestContext]
+
+
+class SharedDriver:
+    """Keeps one driver warm for the shared sessions running on an event loop.
+
+    The objects of a connection are bound to its loop, so each loop gets its
+    own driver. It is started by the first session and reused by the following
+    ones, stopped once no session has used it for the idle timeout, and
+    replaced by a new one if it crashed.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._lock = asyncio.Lock()
+        self._manager: Optional[PlaywrightContextManager] = None
+        self._playwright: Optional[AsyncPlaywright] = None
+        self._sessions = 0
+        self._idle_handle: Optional[asyncio.TimerHandle] = None
+        self._idle_task: Optional[asyncio.Task] = None
+
+    async def acquire(self) -> Playwright:
+        async with self._lock:
+            if self._idle_handle:
+                self._idle_handle.cancel()
+                self._idle_handle = None
+            if self._idle_task:
+                # It waits for the lock we hold, so it has not stopped anything.
+                self._idle_task.cancel()
+                await asyncio.wait([self._idle_task])
+                self._idle_task = None
+            if self._manager and not is_driver_alive(self._manager._connection):
+                await self._stop_driver()
+            if not self._playwright:
+                manager = PlaywrightContextManager()
+                self._playwright = await manager.__aenter__()
+                self._manager = manager
+            self._sessions += 1
+            return self._playwright._impl_obj
+
+    async def release(self, launched: List[_SessionResource]) -> None:
+        try:
+            # The driver outlives the session, what it launched must not.
+            for resource in launched:
+                if isinstance(resource, AsyncAPIRequestContext):
+                    await resource.dispose()
+                else:
+                    await resource.close()
+        finally:
+            async with self._lock:
+                self._sessions -= 1
+                if self._sessions or not self._manager:
+                    return
+                timeout = shared_driver_idle_timeout()
+                if not timeout:
+                    await self._stop_driver()
+                    return
+                self._idle_handle = self._loop.call_later(timeout, self._on_idle)
+
+    def _on_idle(self) -> None:
+        self._idle_handle = None
+        self._idle_task = self._loop.create_task(self._stop_if_idle())
+
+    async def _stop_if_idle(self) -> None:
+        async with self._lock:
+            self._idle_task = None
+            if not self._sessions and self._manager:
+                await self._stop_driver()
+
+    async def _stop_driver(self) -> None:
+        manager = cast(PlaywrightContextManager, self._manager)
+        self._manager = None
+        self._playwright = None
+        await manager.__aexit__()
+
+
+_shared_drivers: (
+    "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, SharedDriver]"
+) = weakref.WeakKeyDictionary()
+
+
+class _SessionBrowserType(AsyncBrowserType):
+    """A browser type of a shared session, which records the browsers and
+    persistent contexts it starts so that they are closed with the session."""
+
+    def __init__(self, impl_obj: Any, session: "SharedPlaywrightContextManager"):
+        super().__init__(impl_obj)
+        self._session = session
+
+    async def launch(self, *args: Any, **kwargs: Any) -> AsyncBrowser:
+        browser = await super().launch(*args, **kwargs)
+        self._session._launched.append(browser)
+        return browser
+
+    async def launch_persistent_context(
+        self, *args: Any, **kwargs: Any
+    ) -> AsyncBrowserContext:
+        context = await super().launch_persistent_context(*args, **kwargs)
+        self._session._launched.append(context)
+        return context
+
+    async def connect_over_cdp(self, *args: Any, **kwargs: Any) -> AsyncBrowser:
+        browser = await super().connect_over_cdp(*args, **kwargs)
+        self._session._launched.append(browser)
+        return browser
+
+    async def connect(self, *args: Any, **kwargs: Any) -> AsyncBrowser:
+        browser = await super().connect(*args, **kwargs)
+        self._session._launched.append(browser)
+        return browser
+
+
+class _SessionAPIRequest(AsyncAPIRequest):
+    """The request of a shared session, which records the request contexts it
+    creates so that they are disposed with the session."""
+
+    def __init__(self, impl_obj: Any, session: "SharedPlaywrightContextManager"):
+        super().__init__(impl_obj)
+        self._session = session
+
+    async def new_context(self, *args: Any, **kwargs: Any) -> AsyncAPIRequestContext:
+        context = await super().new_context(*args, **kwargs)
+        self._session._launched.append(context)
+        return context
+
+
+class _SessionPlaywright(AsyncPlaywright):
+    def __init__(
+        self, impl_obj: Playwright, session: "SharedPlaywrightContextManager"
+    ) -> None:
+        super().__init__(impl_obj)
+        self._browser_types: Dict[str, AsyncBrowserType] = {
+            name: _SessionBrowserType(getattr(impl_obj, name), session)
+            for name in ["chromium", "firefox", "webkit"]
+        }
+        self._request = _SessionAPIRequest(impl_obj.request, session)
+        # Sessions share the driver's Playwright, but not its device table.
+        self._devices = DeviceDescriptors(
+            impl_obj._connection.local_utils._device_descriptors
+        )
+
+    @property
+    def devices(self) -> Dict:
+        return self._devices
+
+    @property
+    def request(self) -> AsyncAPIRequest:
+        return self._request
+
+    @property
+    def chromium(self) -> AsyncBrowserType:
+        return self._browser_types["chromium"]
+
+    @property
+    def firefox(self) -> AsyncBrowserType:
+        return self._browser_types["firefox"]
+
+    @property
+    def webkit(self) -> AsyncBrowserType:
+        return self._browser_types["webkit"]
+
+    def __getitem__(self, value: str) -> AsyncBrowserType:
+        if value not in self._browser_types:
+            return super().__getitem__(value)
+        return self._browser_types[value]
+
+
+class SharedPlaywrightContextManager:
+    def __init__(self) -> None:
+        self._playwright: Optional[AsyncPlaywright] = None
+        self._driver: Optional[SharedDriver] = None
+        self._launched: List[_SessionResource] = []
+
+    async def __aenter__(self) -> AsyncPlaywright:
+        loop = asyncio.get_running_loop()
+        driver = _shared_drivers.get(loop)
+        if not driver:
+            driver = _shared_drivers[loop] = SharedDriver(loop)
+        # Each session gets its own Playwright object, so that stopping it only
+        # ends the session, and its own browser types, so that the browsers it
+        # launched are closed with it.
+        playwright = _SessionPlaywright(await driver.acquire(), self)
+        playwright.stop = self.__aexit__  # type: ignore
+        self._playwright = playwright
+        self._driver = driver
+        return playwright
+
+    async def start(self) -> AsyncPlaywright:
+        return await self.__aenter__()
+
+    async def __aexit__(self, *args: Any) -> None:
+        if not self._driver:
+            return
+        driver = self._driver
+        self._driver = None
+        self._playwright = None
+        launched = self._launched
+        self._launched = []
+        await driver.release(launched)
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+# Annotations are only evaluated on demand, this halves the import time.
+from __future__ import annotations
 
 import datetime
 import pathlib
@@ -43,7 +45,9 @@ from playwright_firefox._impl._api_structures import (
 from playwright_firefox._impl._assertions import (
     APIResponseAssertions as APIResponseAssertionsImpl,
 )
-from playwright_firefox._impl._assertions import LocatorAssertions as LocatorAssertionsImpl
+from playwright_firefox._impl._assertions import (
+    LocatorAssertions as LocatorAssertionsImpl,
+)
 from playwright_firefox._impl._assertions import PageAssertions as PageAssertionsImpl
 from playwright_firefox._impl._async_base import (
     AsyncBase,
@@ -52,11 +56,15 @@ from playwright_firefox._impl._async_base import (
     mapping,
 )
 from playwright_firefox._impl._browser import Browser as BrowserImpl
-from playwright_firefox._impl._browser_context import BrowserContext as BrowserContextImpl
+from playwright_firefox._impl._browser_context import (
+    BrowserContext as BrowserContextImpl,
+)
 from playwright_firefox._impl._browser_type import BrowserType as BrowserTypeImpl
 from playwright_firefox._impl._cdp_session import CDPSession as CDPSessionImpl
 from playwright_firefox._impl._clock import Clock as ClockImpl
-from playwright_firefox._impl._console_message import ConsoleMessage as ConsoleMessageImpl
+from playwright_firefox._impl._console_message import (
+    ConsoleMessage as ConsoleMessageImpl,
+)
 from playwright_firefox._impl._dialog import Dialog as DialogImpl
 from playwright_firefox._impl._download import Download as DownloadImpl
 from playwright_firefox._impl._element_handle import ElementHandle as ElementHandleImpl
@@ -80,6 +88,7 @@ from playwright_firefox._impl._network import WebSocketRoute as WebSocketRouteIm
 from playwright_firefox._impl._page import Page as PageImpl
 from playwright_firefox._impl._page import Worker as WorkerImpl
 from playwright_firefox._impl._playwright import Playwright as PlaywrightImpl
+from playwright_firefox._impl._response_cache import ResponseCache
 from playwright_firefox._impl._selectors import Selectors as SelectorsImpl
 from playwright_firefox._impl._tracing import Tracing as TracingImpl
 from playwright_firefox._impl._video import Video as VideoImpl
@@ -87,6 +96,7 @@ from playwright_firefox._impl._web_error import WebError as WebErrorImpl
 
 
 class Request(AsyncBase):
+    __slots__ = ()
 
     @property
     def url(self) -> str:
@@ -388,6 +398,7 @@ mapping.register(RequestImpl, Request)
 
 
 class Response(AsyncBase):
+    __slots__ = ()
 
     @property
     def url(self) -> str:
@@ -625,6 +636,7 @@ mapping.register(ResponseImpl, Response)
 
 
 class Route(AsyncBase):
+    __slots__ = ()
 
     @property
     def request(self) -> "Request":
@@ -959,6 +971,7 @@ mapping.register(RouteImpl, Route)
 
 
 class WebSocket(AsyncBase):
+    __slots__ = ()
 
     @typing.overload
     def on(
@@ -1152,6 +1165,7 @@ mapping.register(WebSocketImpl, WebSocket)
 
 
 class WebSocketRoute(AsyncBase):
+    __slots__ = ()
 
     @property
     def url(self) -> str:
@@ -1279,6 +1293,7 @@ mapping.register(WebSocketRouteImpl, WebSocketRoute)
 
 
 class Keyboard(AsyncBase):
+    __slots__ = ()
 
     async def down(self, key: str) -> None:
         """Keyboard.down
@@ -1443,6 +1458,7 @@ mapping.register(KeyboardImpl, Keyboard)
 
 
 class Mouse(AsyncBase):
+    __slots__ = ()
 
     async def move(
         self, x: float, y: float, *, steps: typing.Optional[int] = None
@@ -1595,6 +1611,7 @@ mapping.register(MouseImpl, Mouse)
 
 
 class Touchscreen(AsyncBase):
+    __slots__ = ()
 
     async def tap(self, x: float, y: float) -> None:
         """Touchscreen.tap
@@ -1618,6 +1635,7 @@ mapping.register(TouchscreenImpl, Touchscreen)
 
 
 class JSHandle(AsyncBase):
+    __slots__ = ()
 
     async def evaluate(
         self, expression: str, arg: typing.Optional[typing.Any] = None
@@ -1774,6 +1792,7 @@ mapping.register(JSHandleImpl, JSHandle)
 
 
 class ElementHandle(JSHandle):
+    __slots__ = ()
 
     def as_element(self) -> typing.Optional["ElementHandle"]:
         """ElementHandle.as_element
@@ -3091,6 +3110,7 @@ mapping.register(ElementHandleImpl, ElementHandle)
 
 
 class Accessibility(AsyncBase):
+    __slots__ = ()
 
     async def snapshot(
         self,
@@ -3157,6 +3177,7 @@ mapping.register(AccessibilityImpl, Accessibility)
 
 
 class FileChooser(AsyncBase):
+    __slots__ = ()
 
     @property
     def page(self) -> "Page":
@@ -3234,6 +3255,7 @@ mapping.register(FileChooserImpl, FileChooser)
 
 
 class Frame(AsyncBase):
+    __slots__ = ()
 
     @property
     def page(self) -> "Page":
@@ -5990,6 +6012,7 @@ mapping.register(FrameImpl, Frame)
 
 
 class FrameLocator(AsyncBase):
+    __slots__ = ()
 
     @property
     def first(self) -> "FrameLocator":
@@ -6599,6 +6622,7 @@ mapping.register(FrameLocatorImpl, FrameLocator)
 
 
 class Worker(AsyncBase):
+    __slots__ = ()
 
     def on(
         self,
@@ -6700,6 +6724,7 @@ mapping.register(WorkerImpl, Worker)
 
 
 class Selectors(AsyncBase):
+    __slots__ = ()
 
     async def register(
         self,
@@ -6798,6 +6823,7 @@ mapping.register(SelectorsImpl, Selectors)
 
 
 class Clock(AsyncBase):
+    __slots__ = ()
 
     async def install(
         self,
@@ -6973,6 +6999,7 @@ mapping.register(ClockImpl, Clock)
 
 
 class ConsoleMessage(AsyncBase):
+    __slots__ = ()
 
     @property
     def type(
@@ -7056,6 +7083,7 @@ mapping.register(ConsoleMessageImpl, ConsoleMessage)
 
 
 class Dialog(AsyncBase):
+    __slots__ = ()
 
     @property
     def type(self) -> str:
@@ -7133,6 +7161,7 @@ mapping.register(DialogImpl, Dialog)
 
 
 class Download(AsyncBase):
+    __slots__ = ()
 
     @property
     def page(self) -> "Page":
@@ -7243,6 +7272,7 @@ mapping.register(DownloadImpl, Download)
 
 
 class Video(AsyncBase):
+    __slots__ = ()
 
     async def path(self) -> pathlib.Path:
         """Video.path
@@ -9659,6 +9689,15 @@ class Page(AsyncContextManager):
             )
         )
 
+    async def route_cache(
+        self,
+        *,
+        url: typing.Optional[typing.Union[typing.Pattern[str], str]] = None,
+        store: typing.Optional[ResponseCache] = None,
+    ) -> None:
+
+        return await self._impl_obj.route_cache(url=url, store=store)
+
     async def screenshot(
         self,
         *,
@@ -12259,6 +12298,7 @@ mapping.register(PageImpl, Page)
 
 
 class WebError(AsyncBase):
+    __slots__ = ()
 
     @property
     def page(self) -> typing.Optional["Page"]:
@@ -13394,6 +13434,15 @@ class BrowserContext(AsyncContextManager):
             )
         )
 
+    async def route_cache(
+        self,
+        *,
+        url: typing.Optional[typing.Union[typing.Pattern[str], str]] = None,
+        store: typing.Optional[ResponseCache] = None,
+    ) -> None:
+
+        return await self._impl_obj.route_cache(url=url, store=store)
+
     def expect_event(
         self,
         event: str,
@@ -13606,6 +13655,7 @@ mapping.register(BrowserContextImpl, BrowserContext)
 
 
 class CDPSession(AsyncBase):
+    __slots__ = ()
 
     async def send(
         self, method: str, params: typing.Optional[typing.Dict] = None
@@ -14934,7 +14984,7 @@ class Playwright(AsyncBase):
         -------
         Dict
         """
-        return mapping.from_maybe_impl(self._impl_obj.devices)
+        return self._impl_obj.devices
 
     @property
     def selectors(self) -> "Selectors":
@@ -15001,6 +15051,32 @@ class Playwright(AsyncBase):
 
         return mapping.from_impl(self._impl_obj.__getitem__(value=value))
 
+    def metrics(self) -> typing.Dict:
+
+        return mapping.from_maybe_impl(self._impl_obj.metrics())
+
+    def add_metrics_listener(
+        self, callback: typing.Callable[[typing.Dict], typing.Any]
+    ) -> None:
+
+        return mapping.from_maybe_impl(
+            self._impl_obj.add_metrics_listener(callback=self._wrap_handler(callback))
+        )
+
+    def remove_metrics_listener(
+        self, callback: typing.Callable[[typing.Dict], typing.Any]
+    ) -> None:
+
+        return mapping.from_maybe_impl(
+            self._impl_obj.remove_metrics_listener(
+                callback=self._wrap_handler(callback)
+            )
+        )
+
+    def greenlet_profile(self) -> typing.Dict:
+
+        return mapping.from_maybe_impl(self._impl_obj.greenlet_profile())
+
     async def stop(self) -> None:
         """Playwright.stop
 
@@ -15029,6 +15105,7 @@ mapping.register(PlaywrightImpl, Playwright)
 
 
 class Tracing(AsyncBase):
+    __slots__ = ()
 
     async def start(
         self,
@@ -15207,6 +15284,7 @@ mapping.register(TracingImpl, Tracing)
 
 
 class Locator(AsyncBase):
+    __slots__ = ()
 
     @property
     def page(self) -> "Page":
@@ -17923,6 +18001,7 @@ mapping.register(LocatorImpl, Locator)
 
 
 class APIResponse(AsyncBase):
+    __slots__ = ()
 
     @property
     def ok(self) -> bool:
@@ -18048,6 +18127,7 @@ mapping.register(APIResponseImpl, APIResponse)
 
 
 class APIRequestContext(AsyncBase):
+    __slots__ = ()
 
     async def dispose(self, *, reason: typing.Optional[str] = None) -> None:
         """APIRequestContext.dispose
@@ -18726,6 +18806,7 @@ mapping.register(APIRequestContextImpl, APIRequestContext)
 
 
 class APIRequest(AsyncBase):
+    __slots__ = ()
 
     async def new_context(
         self,
@@ -18825,6 +18906,7 @@ mapping.register(APIRequestImpl, APIRequest)
 
 
 class PageAssertions(AsyncBase):
+    __slots__ = ()
 
     async def to_have_title(
         self,
@@ -18959,6 +19041,7 @@ mapping.register(PageAssertionsImpl, PageAssertions)
 
 
 class LocatorAssertions(AsyncBase):
+    __slots__ = ()
 
     async def to_contain_text(
         self,
@@ -20822,6 +20905,7 @@ mapping.register(LocatorAssertionsImpl, LocatorAssertions)
 
 
 class APIResponseAssertions(AsyncBase):
+    __slots__ = ()
 
     async def to_be_ok(self) -> None:
         """APIResponseAssertions.to_be_ok
@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from playwright_firefox import async_api, sync_api
 
 
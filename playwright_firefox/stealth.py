@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+from __future__ import annotations
+
 import inspect
 import json
 import random
@@ -241,7 +243,9 @@ class Stealth:
             chromium_mode = browser_type.name == "chromium"
             for name, hooked_method in inspect.getmembers(browser_type, predicate=inspect.ismethod):
                 # todo: ctx.browser.launch_persistent_context
-                if hooked_method.__annotations__.get("return") == browser_class_name:
+                # Annotations of the generated API are not evaluated, e.g. '"Browser"'.
+                return_annotation = str(hooked_method.__annotations__.get("return"))
+                if return_annotation.strip("\"'") == browser_class_name:
                     hooked_method = self._generate_hooked_method_that_returns_browser(hooked_method, chromium_mode)
                     setattr(browser_type, name, hooked_method)
 
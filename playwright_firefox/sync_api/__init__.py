@@ -18,76 +18,213 @@ Firefox and WebKit with a single API. Playwright is built to enable cross-browse
 web automation that is ever-green, capable, reliable and fast.
 """
 
-from typing import Any, Optional, Union, overload
+from __future__ import annotations
 
-import playwright_firefox._impl._api_structures
-import playwright_firefox._impl._errors
-import playwright_firefox.sync_api._generated
-from playwright_firefox._impl._assertions import (
-    APIResponseAssertions as APIResponseAssertionsImpl,
-)
-from playwright_firefox._impl._assertions import LocatorAssertions as LocatorAssertionsImpl
-from playwright_firefox._impl._assertions import PageAssertions as PageAssertionsImpl
-from playwright_firefox.sync_api._context_manager import PlaywrightContextManager
-from playwright_firefox.sync_api._generated import (
-    Accessibility,
-    APIRequest,
-    APIRequestContext,
-    APIResponse,
-    APIResponseAssertions,
-    Browser,
-    BrowserContext,
-    BrowserType,
-    CDPSession,
-    ConsoleMessage,
-    Dialog,
-    Download,
-    ElementHandle,
-    FileChooser,
-    Frame,
-    FrameLocator,
-    JSHandle,
-    Keyboard,
-    Locator,
-    LocatorAssertions,
-    Mouse,
-    Page,
-    PageAssertions,
-    Playwright,
-    Request,
-    Response,
-    Route,
-    Selectors,
-    Touchscreen,
-    Video,
-    WebError,
-    WebSocket,
-    WebSocketRoute,
-    Worker,
+import importlib
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Union,
+    overload,
 )
 
-ChromiumBrowserContext = BrowserContext
+if TYPE_CHECKING:
+    from playwright_firefox._impl._api_structures import (
+        Cookie,
+        FilePayload,
+        FloatRect,
+        Geolocation,
+        HttpCredentials,
+        PdfMargins,
+        Position,
+        ProxySettings,
+        ResourceTiming,
+        SourceLocation,
+        StorageState,
+        StorageStateCookie,
+        ViewportSize,
+    )
+    from playwright_firefox._impl._errors import Error, TimeoutError
+    from playwright_firefox._impl._response_cache import ResponseCache
+    from playwright_firefox.sync_api._context_manager import (
+        PlaywrightContextManager,
+        SharedPlaywrightContextManager,
+    )
+    from playwright_firefox.sync_api._generated import (
+        Accessibility,
+        APIRequest,
+        APIRequestContext,
+        APIResponse,
+        APIResponseAssertions,
+        Browser,
+        BrowserContext,
+        BrowserType,
+        CDPSession,
+        ConsoleMessage,
+        Dialog,
+        Download,
+        ElementHandle,
+        FileChooser,
+        Frame,
+        FrameLocator,
+        JSHandle,
+        Keyboard,
+        Locator,
+        LocatorAssertions,
+        Mouse,
+        Page,
+        PageAssertions,
+        Playwright,
+        Request,
+        Response,
+        Route,
+        Selectors,
+        Touchscreen,
+        Video,
+        WebError,
+        WebSocket,
+        WebSocketRoute,
+        Worker,
+    )
+
+    ChromiumBrowserContext = BrowserContext
+
+_GENERATED = "playwright_firefox.sync_api._generated"
+_API_STRUCTURES = "playwright_firefox._impl._api_structures"
+_ERRORS = "playwright_firefox._impl._errors"
+
+# Public names are imported on first access (PEP 562), importing this package
+# doesn't load the generated API and the implementation until they are used.
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    **dict.fromkeys(
+        (
+            "Accessibility",
+            "APIRequest",
+            "APIRequestContext",
+            "APIResponse",
+            "APIResponseAssertions",
+            "Browser",
+            "BrowserContext",
+            "BrowserType",
+            "CDPSession",
+            "ConsoleMessage",
+            "Dialog",
+            "Download",
+            "ElementHandle",
+            "FileChooser",
+            "Frame",
+            "FrameLocator",
+            "JSHandle",
+            "Keyboard",
+            "Locator",
+            "LocatorAssertions",
+            "Mouse",
+            "Page",
+            "PageAssertions",
+            "Playwright",
+            "Request",
+            "Response",
+            "Route",
+            "Selectors",
+            "Touchscreen",
+            "Video",
+            "WebError",
+            "WebSocket",
+            "WebSocketRoute",
+            "Worker",
+        ),
+        _GENERATED,
+    ),
+    **dict.fromkeys(
+        (
+            "Cookie",
+            "FilePayload",
+            "FloatRect",
+            "Geolocation",
+            "HttpCredentials",
+            "PdfMargins",
+            "Position",
+            "ProxySettings",
+            "ResourceTiming",
+            "SourceLocation",
+            "StorageState",
+            "StorageStateCookie",
+            "ViewportSize",
+        ),
+        _API_STRUCTURES,
+    ),
+    "Error": _ERRORS,
+    "TimeoutError": _ERRORS,
+    "ResponseCache": "playwright_firefox._impl._response_cache",
+    "PlaywrightContextManager": "playwright_firefox.sync_api._context_manager",
+}
+_ALIASES = {"ChromiumBrowserContext": "BrowserContext"}
+
+
+def __getattr__(name: str) -> Any:
+    attribute = _ALIASES.get(name, name)
+    if attribute not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_LAZY_ATTRIBUTES[attribute])
+    value = getattr(module, attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | set(_ALIASES))
+
 
-Cookie = playwright_firefox._impl._api_structures.Cookie
-FilePayload = playwright_firefox._impl._api_structures.FilePayload
-FloatRect = playwright_firefox._impl._api_structures.FloatRect
-Geolocation = playwright_firefox._impl._api_structures.Geolocation
-HttpCredentials = playwright_firefox._impl._api_structures.HttpCredentials
-PdfMargins = playwright_firefox._impl._api_structures.PdfMargins
-Position = playwright_firefox._impl._api_structures.Position
-ProxySettings = playwright_firefox._impl._api_structures.ProxySettings
-ResourceTiming = playwright_firefox._impl._api_structures.ResourceTiming
-SourceLocation = playwright_firefox._impl._api_structures.SourceLocation
-StorageState = playwright_firefox._impl._api_structures.StorageState
-StorageStateCookie = playwright_firefox._impl._api_structures.StorageStateCookie
-ViewportSize = playwright_firefox._impl._api_structures.ViewportSize
+@overload
+def sync_playwright(
+    thread_safe: bool = False, shared: Literal[False] = False
+) -> PlaywrightContextManager: ...
 
-Error = playwright_firefox._impl._errors.Error
-TimeoutError = playwright_firefox._impl._errors.TimeoutError
 
+@overload
+def sync_playwright(
+    thread_safe: bool, shared: Literal[True]
+) -> SharedPlaywrightContextManager: ...
 
-def sync_playwright() -> PlaywrightContextManager:
-    return PlaywrightContextManager()
+
+@overload
+def sync_playwright(
+    thread_safe: bool = False, *, shared: Literal[True]
+) -> SharedPlaywrightContextManager: ...
+
+
+@overload
+def sync_playwright(
+    thread_safe: bool = False, shared: bool = False
+) -> Union[PlaywrightContextManager, SharedPlaywrightContextManager]: ...
+
+
+def sync_playwright(
+    thread_safe: bool = False, shared: bool = False
+) -> Union[PlaywrightContextManager, SharedPlaywrightContextManager]:
+    """With ``thread_safe=True``, the event loop runs in a dedicated thread and
+    the returned objects can be used from any thread, e.g. to share one browser
+    across a thread pool. Event handlers run in the dispatcher thread.
+
+    With ``shared=True``, the sessions of the process share one driver that is
+    kept warm between them, which saves its start up for short sessions. They
+    run in thread safe mode. The driver is stopped after being idle for
+    PLAYWRIGHT_SHARED_DRIVER_IDLE_TIMEOUT seconds (30 by default) and restarted
+    if it crashed. The browsers and persistent contexts that a session launched
+    or connected to are closed when it ends.
+    """
+    from playwright_firefox.sync_api._context_manager import (
+        PlaywrightContextManager,
+        SharedPlaywrightContextManager,
+    )
+
+    if shared:
+        return SharedPlaywrightContextManager()
+    return PlaywrightContextManager(thread_safe)
 
 
 class Expect:
@@ -127,6 +264,24 @@ class Expect:
     def __call__(
         self, actual: Union[Page, Locator, APIResponse], message: Optional[str] = None
     ) -> Union[PageAssertions, LocatorAssertions, APIResponseAssertions]:
+        from playwright_firefox._impl._assertions import (
+            APIResponseAssertions as APIResponseAssertionsImpl,
+        )
+        from playwright_firefox._impl._assertions import (
+            LocatorAssertions as LocatorAssertionsImpl,
+        )
+        from playwright_firefox._impl._assertions import (
+            PageAssertions as PageAssertionsImpl,
+        )
+        from playwright_firefox.sync_api._generated import (
+            APIResponse,
+            APIResponseAssertions,
+            Locator,
+            LocatorAssertions,
+            Page,
+            PageAssertions,
+        )
+
         if isinstance(actual, Page):
             return PageAssertions(
                 PageAssertionsImpl(actual._impl_obj, self._timeout, message=message)
@@ -183,6 +338,7 @@ __all__ = [
     "Request",
     "ResourceTiming",
     "Response",
+    "ResponseCache",
     "Route",
     "Selectors",
     "SourceLocation",
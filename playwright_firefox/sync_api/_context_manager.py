@@ -13,16 +13,32 @@
 # limitations under the License.
 
 import asyncio
-from typing import TYPE_CHECKING, Any, Optional, cast
+import atexit
+import concurrent.futures
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union, cast
 
 from greenlet import greenlet
 
 from playwright_firefox._impl._connection import ChannelOwner, Connection
 from playwright_firefox._impl._errors import Error
-from playwright_firefox._impl._greenlets import MainGreenlet
+from playwright_firefox._impl._greenlets import MainGreenlet, create_greenlet_profiler
+from playwright_firefox._impl._json_codec import get_json_codec
+from playwright_firefox._impl._local_utils import DeviceDescriptors
 from playwright_firefox._impl._object_factory import create_remote_object
 from playwright_firefox._impl._playwright import Playwright
-from playwright_firefox._impl._transport import PipeTransport
+from playwright_firefox._impl._protocol_recording import create_driver_transport
+from playwright_firefox._impl._shared_driver import (
+    is_driver_alive,
+    shared_driver_idle_timeout,
+)
+from playwright_firefox.sync_api._generated import APIRequest as SyncAPIRequest
+from playwright_firefox.sync_api._generated import (
+    APIRequestContext as SyncAPIRequestContext,
+)
+from playwright_firefox.sync_api._generated import Browser as SyncBrowser
+from playwright_firefox.sync_api._generated import BrowserContext as SyncBrowserContext
+from playwright_firefox.sync_api._generated import BrowserType as SyncBrowserType
 from playwright_firefox.sync_api._generated import Playwright as SyncPlaywright
 
 if TYPE_CHECKING:
@@ -30,14 +46,19 @@ if TYPE_CHECKING:
 
 
 class PlaywrightContextManager:
-    def __init__(self) -> None:
+    def __init__(self, thread_safe: bool = False) -> None:
         self._playwright: SyncPlaywright
         self._loop: asyncio.AbstractEventLoop
         self._own_loop = False
         self._watcher: Optional[AbstractChildWatcher] = None
         self._exit_was_called = False
+        self._json_codec = get_json_codec()
+        self._thread_safe = thread_safe
+        self._dispatcher_thread: Optional[threading.Thread] = None
 
     def __enter__(self) -> SyncPlaywright:
+        if self._thread_safe:
+            return self._start_dispatcher_thread()
         try:
             self._loop = asyncio.get_running_loop()
         except RuntimeError:
@@ -60,10 +81,11 @@ Please use the Async API instead."""
         self._connection = Connection(
             dispatcher_fiber,
             create_remote_object,
-            PipeTransport(self._loop),
+            create_driver_transport(self._loop, self._json_codec),
             self._loop,
         )
 
+        self._install_greenlet_profiler()
         g_self = greenlet.getcurrent()
 
         def callback_wrapper(channel_owner: ChannelOwner) -> None:
@@ -80,19 +102,295 @@ Please use the Async API instead."""
         playwright.stop = self.__exit__  # type: ignore
         return playwright
 
+    def _start_dispatcher_thread(self) -> SyncPlaywright:
+        # The loop and the dispatcher fiber live in a thread of their own. Calls
+        # from any other thread are handed over to it and waited for, see
+        # SyncBase._sync_from_worker_thread.
+        self._loop = asyncio.new_event_loop()
+        self._own_loop = True
+        started: concurrent.futures.Future = concurrent.futures.Future()
+
+        def thread_main() -> None:
+            asyncio.set_event_loop(self._loop)
+
+            def greenlet_main() -> None:
+                self._loop.run_until_complete(self._connection.run_as_sync())
+
+            dispatcher_fiber = MainGreenlet(greenlet_main)
+            dispatcher_fiber.thread_id = threading.get_ident()
+            self._connection = Connection(
+                dispatcher_fiber,
+                create_remote_object,
+                create_driver_transport(self._loop, self._json_codec),
+                self._loop,
+            )
+
+            def callback_wrapper(channel_owner: ChannelOwner) -> None:
+                playwright_impl = cast(Playwright, channel_owner)
+                started.set_result(SyncPlaywright(playwright_impl))
+
+            self._connection.call_on_object_with_known_name(
+                "Playwright", callback_wrapper
+            )
+            self._install_greenlet_profiler()
+            try:
+                dispatcher_fiber.switch()
+                self._loop.run_until_complete(
+                    self._connection._transport.wait_until_stopped()
+                )
+                self._connection.cleanup()
+            except BaseException as exc:
+                if not started.done():
+                    started.set_exception(exc)
+                    return
+                raise
+            finally:
+                self._uninstall_greenlet_profiler()
+                self._close_loop()
+
+        self._dispatcher_thread = threading.Thread(
+            target=thread_main, name="playwright-dispatcher", daemon=True
+        )
+        self._dispatcher_thread.start()
+        playwright = started.result()
+        self._playwright = playwright
+        playwright.stop = self.__exit__  # type: ignore
+        return playwright
+
     def start(self) -> SyncPlaywright:
         return self.__enter__()
 
     def __exit__(self, *args: Any) -> None:
         if self._exit_was_called:
             return
+        if self._dispatcher_thread is threading.current_thread():
+            raise Error("Playwright cannot be stopped from its own event handlers")
         self._exit_was_called = True
+        if self._dispatcher_thread:
+            try:
+                self._loop.call_soon_threadsafe(
+                    self._connection._transport.request_stop
+                )
+            except RuntimeError:
+                # The loop is already closed, the driver exited on its own.
+                pass
+            self._dispatcher_thread.join()
+            return
         self._connection.stop_sync()
+        self._uninstall_greenlet_profiler()
         if self._watcher:
             self._watcher.close()
         if self._own_loop:
-            tasks = asyncio.all_tasks(self._loop)
-            for t in [t for t in tasks if not (t.done() or t.cancelled())]:
-                t.cancel()
-            self._loop.run_until_complete(self._loop.shutdown_asyncgens())
-            self._loop.close()
+            self._close_loop()
+
+    def _install_greenlet_profiler(self) -> None:
+        profiler = create_greenlet_profiler()
+        if profiler:
+            profiler.install()
+            self._connection._greenlet_profiler = profiler
+
+    def _uninstall_greenlet_profiler(self) -> None:
+        if self._connection._greenlet_profiler:
+            self._connection._greenlet_profiler.uninstall()
+
+    def _close_loop(self) -> None:
+        tasks = asyncio.all_tasks(self._loop)
+        for t in [t for t in tasks if not (t.done() or t.cancelled())]:
+            t.cancel()
+        self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+        self._loop.close()
+
+
+# What a shared session started, it is closed or disposed with the session.
+_SessionResource = Union[SyncBrowser, SyncBrowserContext, SyncAPIRequestContext]
+
+
+class SharedDriver:
+    """Keeps one driver warm for the shared sessions of the process.
+
+    The driver is started by the first session, with its loop in a dispatcher
+    thread like in thread safe mode, and reused by the following ones. It is
+    stopped once no session has used it for the idle timeout, and replaced by
+    a new one if it crashed.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._manager: Optional[PlaywrightContextManager] = None
+        self._playwright: Optional[SyncPlaywright] = None
+        self._sessions = 0
+        self._idle_timer: Optional[threading.Timer] = None
+        self._exit_handler_registered = False
+
+    def acquire(self) -> Playwright:
+        with self._lock:
+            if self._idle_timer:
+                self._idle_timer.cancel()
+                self._idle_timer = None
+            if self._manager and not is_driver_alive(self._manager._connection):
+                self._stop_driver()
+            if not self._playwright:
+                manager = PlaywrightContextManager(thread_safe=True)
+                self._playwright = manager.__enter__()
+                self._manager = manager
+                if not self._exit_handler_registered:
+                    atexit.register(self.shutdown)
+                    self._exit_handler_registered = True
+            self._sessions += 1
+            return self._playwright._impl_obj
+
+    def release(self, launched: List[_SessionResource]) -> None:
+        try:
+            # The driver outlives the session, what it launched must not.
+            for resource in launched:
+                if isinstance(resource, SyncAPIRequestContext):
+                    resource.dispose()
+                else:
+                    resource.close()
+        finally:
+            with self._lock:
+                self._sessions -= 1
+                if self._sessions or not self._manager:
+                    return
+                timeout = shared_driver_idle_timeout()
+                if not timeout:
+                    self._stop_driver()
+                    return
+                self._idle_timer = threading.Timer(timeout, self._stop_if_idle)
+                self._idle_timer.daemon = True
+                self._idle_timer.start()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._idle_timer:
+                self._idle_timer.cancel()
+                self._idle_timer = None
+            if self._manager:
+                self._stop_driver()
+
+    def _stop_if_idle(self) -> None:
+        with self._lock:
+            self._idle_timer = None
+            if not self._sessions and self._manager:
+                self._stop_driver()
+
+    def _stop_driver(self) -> None:
+        manager = cast(PlaywrightContextManager, self._manager)
+        self._manager = None
+        self._playwright = None
+        manager.__exit__()
+
+
+shared_driver = SharedDriver()
+
+
+class _SessionBrowserType(SyncBrowserType):
+    """A browser type of a shared session, which records the browsers and
+    persistent contexts it starts so that they are closed with the session."""
+
+    def __init__(self, impl_obj: Any, session: "SharedPlaywrightContextManager"):
+        super().__init__(impl_obj)
+        self._session = session
+
+    def launch(self, *args: Any, **kwargs: Any) -> SyncBrowser:
+        browser = super().launch(*args, **kwargs)
+        self._session._launched.append(browser)
+        return browser
+
+    def launch_persistent_context(
+        self, *args: Any, **kwargs: Any
+    ) -> SyncBrowserContext:
+        context = super().launch_persistent_context(*args, **kwargs)
+        self._session._launched.append(context)
+        return context
+
+    def connect_over_cdp(self, *args: Any, **kwargs: Any) -> SyncBrowser:
+        browser = super().connect_over_cdp(*args, **kwargs)
+        self._session._launched.append(browser)
+        return browser
+
+    def connect(self, *args: Any, **kwargs: Any) -> SyncBrowser:
+        browser = super().connect(*args, **kwargs)
+        self._session._launched.append(browser)
+        return browser
+
+
+class _SessionAPIRequest(SyncAPIRequest):
+    """The request of a shared session, which records the request contexts it
+    creates so that they are disposed with the session."""
+
+    def __init__(self, impl_obj: Any, session: "SharedPlaywrightContextManager"):
+        super().__init__(impl_obj)
+        self._session = session
+
+    def new_context(self, *args: Any, **kwargs: Any) -> SyncAPIRequestContext:
+        context = super().new_context(*args, **kwargs)
+        self._session._launched.append(context)
+        return context
+
+
+class _SessionPlaywright(SyncPlaywright):
+    def __init__(
+        self, impl_obj: Playwright, session: "SharedPlaywrightContextManager"
+    ) -> None:
+        super().__init__(impl_obj)
+        self._browser_types: Dict[str, SyncBrowserType] = {
+            name: _SessionBrowserType(getattr(impl_obj, name), session)
+            for name in ["chromium", "firefox", "webkit"]
+        }
+        self._request = _SessionAPIRequest(impl_obj.request, session)
+        # Sessions share the driver's Playwright, but not its device table.
+        self._devices = DeviceDescriptors(
+            impl_obj._connection.local_utils._device_descriptors
+        )
+
+    @property
+    def devices(self) -> Dict:
+        return self._devices
+
+    @property
+    def request(self) -> SyncAPIRequest:
+        return self._request
+
+    @property
+    def chromium(self) -> SyncBrowserType:
+        return self._browser_types["chromium"]
+
+    @property
+    def firefox(self) -> SyncBrowserType:
+        return self._browser_types["firefox"]
+
+    @property
+    def webkit(self) -> SyncBrowserType:
+        return self._browser_types["webkit"]
+
+    def __getitem__(self, value: str) -> SyncBrowserType:
+        if value not in self._browser_types:
+            return super().__getitem__(value)
+        return self._browser_types[value]
+
+
+class SharedPlaywrightContextManager:
+    def __init__(self) -> None:
+        self._playwright: Optional[SyncPlaywright] = None
+        self._launched: List[_SessionResource] = []
+
+    def __enter__(self) -> SyncPlaywright:
+        # Each session gets its own Playwright object, so that stopping it only
+        # ends the session, and its own browser types, so that the browsers it
+        # launched are closed with it.
+        playwright = _SessionPlaywright(shared_driver.acquire(), self)
+        playwright.stop = self.__exit__  # type: ignore
+        self._playwright = playwright
+        return playwright
+
+    def start(self) -> SyncPlaywright:
+        return self.__enter__()
+
+    def __exit__(self, *args: Any) -> None:
+        if not self._playwright:
+            return
+        self._playwright = None
+        launched = self._launched
+        self._launched = []
+        shared_driver.release(launched)
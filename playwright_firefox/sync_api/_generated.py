@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+# Annotations are only evaluated on demand, this halves the import time.
+from __future__ import annotations
 
 import datetime
 import pathlib
@@ -43,14 +45,20 @@ from playwright_firefox._impl._api_structures import (
 from playwright_firefox._impl._assertions import (
     APIResponseAssertions as APIResponseAssertionsImpl,
 )
-from playwright_firefox._impl._assertions import LocatorAssertions as LocatorAssertionsImpl
+from playwright_firefox._impl._assertions import (
+    LocatorAssertions as LocatorAssertionsImpl,
+)
 from playwright_firefox._impl._assertions import PageAssertions as PageAssertionsImpl
 from playwright_firefox._impl._browser import Browser as BrowserImpl
-from playwright_firefox._impl._browser_context import BrowserContext as BrowserContextImpl
+from playwright_firefox._impl._browser_context import (
+    BrowserContext as BrowserContextImpl,
+)
 from playwright_firefox._impl._browser_type import BrowserType as BrowserTypeImpl
 from playwright_firefox._impl._cdp_session import CDPSession as CDPSessionImpl
 from playwright_firefox._impl._clock import Clock as ClockImpl
-from playwright_firefox._impl._console_message import ConsoleMessage as ConsoleMessageImpl
+from playwright_firefox._impl._console_message import (
+    ConsoleMessage as ConsoleMessageImpl,
+)
 from playwright_firefox._impl._dialog import Dialog as DialogImpl
 from playwright_firefox._impl._download import Download as DownloadImpl
 from playwright_firefox._impl._element_handle import ElementHandle as ElementHandleImpl
@@ -74,6 +82,7 @@ from playwright_firefox._impl._network import WebSocketRoute as WebSocketRouteIm
 from playwright_firefox._impl._page import Page as PageImpl
 from playwright_firefox._impl._page import Worker as WorkerImpl
 from playwright_firefox._impl._playwright import Playwright as PlaywrightImpl
+from playwright_firefox._impl._response_cache import ResponseCache
 from playwright_firefox._impl._selectors import Selectors as SelectorsImpl
 from playwright_firefox._impl._sync_base import (
     EventContextManager,
@@ -87,6 +96,7 @@ from playwright_firefox._impl._web_error import WebError as WebErrorImpl
 
 
 class Request(SyncBase):
+    __slots__ = ()
 
     @property
     def url(self) -> str:
@@ -390,6 +400,7 @@ mapping.register(RequestImpl, Request)
 
 
 class Response(SyncBase):
+    __slots__ = ()
 
     @property
     def url(self) -> str:
@@ -631,6 +642,7 @@ mapping.register(ResponseImpl, Response)
 
 
 class Route(SyncBase):
+    __slots__ = ()
 
     @property
     def request(self) -> "Request":
@@ -975,6 +987,7 @@ mapping.register(RouteImpl, Route)
 
 
 class WebSocket(SyncBase):
+    __slots__ = ()
 
     @typing.overload
     def on(
@@ -1086,7 +1099,7 @@ class WebSocket(SyncBase):
         """
         return EventContextManager(
             self,
-            self._impl_obj.expect_event(
+            lambda: self._impl_obj.expect_event(
                 event=event, predicate=self._wrap_handler(predicate), timeout=timeout
             ).future,
         )
@@ -1148,6 +1161,7 @@ mapping.register(WebSocketImpl, WebSocket)
 
 
 class WebSocketRoute(SyncBase):
+    __slots__ = ()
 
     @property
     def url(self) -> str:
@@ -1275,6 +1289,7 @@ mapping.register(WebSocketRouteImpl, WebSocketRoute)
 
 
 class Keyboard(SyncBase):
+    __slots__ = ()
 
     def down(self, key: str) -> None:
         """Keyboard.down
@@ -1443,6 +1458,7 @@ mapping.register(KeyboardImpl, Keyboard)
 
 
 class Mouse(SyncBase):
+    __slots__ = ()
 
     def move(self, x: float, y: float, *, steps: typing.Optional[int] = None) -> None:
         """Mouse.move
@@ -1597,6 +1613,7 @@ mapping.register(MouseImpl, Mouse)
 
 
 class Touchscreen(SyncBase):
+    __slots__ = ()
 
     def tap(self, x: float, y: float) -> None:
         """Touchscreen.tap
@@ -1620,6 +1637,9 @@ mapping.register(TouchscreenImpl, Touchscreen)
 
 
 class JSHandle(SyncBase):
+    __slots__ = ()
+
+    _post_processed_methods = frozenset(["get_properties"])
 
     def evaluate(
         self, expression: str, arg: typing.Optional[typing.Any] = None
@@ -1778,6 +1798,9 @@ mapping.register(JSHandleImpl, JSHandle)
 
 
 class ElementHandle(JSHandle):
+    __slots__ = ()
+
+    _post_processed_methods = frozenset(["query_selector_all"])
 
     def as_element(self) -> typing.Optional["ElementHandle"]:
         """ElementHandle.as_element
@@ -3135,6 +3158,7 @@ mapping.register(ElementHandleImpl, ElementHandle)
 
 
 class Accessibility(SyncBase):
+    __slots__ = ()
 
     def snapshot(
         self,
@@ -3203,6 +3227,7 @@ mapping.register(AccessibilityImpl, Accessibility)
 
 
 class FileChooser(SyncBase):
+    __slots__ = ()
 
     @property
     def page(self) -> "Page":
@@ -3284,6 +3309,9 @@ mapping.register(FileChooserImpl, FileChooser)
 
 
 class Frame(SyncBase):
+    __slots__ = ()
+
+    _post_processed_methods = frozenset(["query_selector_all"])
 
     @property
     def page(self) -> "Page":
@@ -3471,7 +3499,7 @@ class Frame(SyncBase):
         """
         return EventContextManager(
             self,
-            self._impl_obj.expect_navigation(
+            lambda: self._impl_obj.expect_navigation(
                 url=self._wrap_handler(url), waitUntil=wait_until, timeout=timeout
             ).future,
         )
@@ -6098,6 +6126,7 @@ mapping.register(FrameImpl, Frame)
 
 
 class FrameLocator(SyncBase):
+    __slots__ = ()
 
     @property
     def first(self) -> "FrameLocator":
@@ -6707,6 +6736,7 @@ mapping.register(FrameLocatorImpl, FrameLocator)
 
 
 class Worker(SyncBase):
+    __slots__ = ()
 
     def on(
         self, event: Literal["close"], f: typing.Callable[["Worker"], "None"]
@@ -6806,6 +6836,7 @@ mapping.register(WorkerImpl, Worker)
 
 
 class Selectors(SyncBase):
+    __slots__ = ()
 
     def register(
         self,
@@ -6902,6 +6933,7 @@ mapping.register(SelectorsImpl, Selectors)
 
 
 class Clock(SyncBase):
+    __slots__ = ()
 
     def install(
         self,
@@ -7081,6 +7113,7 @@ mapping.register(ClockImpl, Clock)
 
 
 class ConsoleMessage(SyncBase):
+    __slots__ = ()
 
     @property
     def type(
@@ -7164,6 +7197,7 @@ mapping.register(ConsoleMessageImpl, ConsoleMessage)
 
 
 class Dialog(SyncBase):
+    __slots__ = ()
 
     @property
     def type(self) -> str:
@@ -7241,6 +7275,7 @@ mapping.register(DialogImpl, Dialog)
 
 
 class Download(SyncBase):
+    __slots__ = ()
 
     @property
     def page(self) -> "Page":
@@ -7351,6 +7386,7 @@ mapping.register(DownloadImpl, Download)
 
 
 class Video(SyncBase):
+    __slots__ = ()
 
     def path(self) -> pathlib.Path:
         """Video.path
@@ -7393,6 +7429,8 @@ mapping.register(VideoImpl, Video)
 
 class Page(SyncContextManager):
 
+    _post_processed_methods = frozenset(["query_selector_all"])
+
     @typing.overload
     def on(self, event: Literal["close"], f: typing.Callable[["Page"], "None"]) -> None:
         """
@@ -9704,6 +9742,15 @@ class Page(SyncContextManager):
             )
         )
 
+    def route_cache(
+        self,
+        *,
+        url: typing.Optional[typing.Union[typing.Pattern[str], str]] = None,
+        store: typing.Optional[ResponseCache] = None,
+    ) -> None:
+
+        return self._sync(self._impl_obj.route_cache(url=url, store=store))
+
     def screenshot(
         self,
         *,
@@ -11752,7 +11799,7 @@ class Page(SyncContextManager):
         """
         return EventContextManager(
             self,
-            self._impl_obj.expect_event(
+            lambda: self._impl_obj.expect_event(
                 event=event, predicate=self._wrap_handler(predicate), timeout=timeout
             ).future,
         )
@@ -11783,7 +11830,7 @@ class Page(SyncContextManager):
         """
         return EventContextManager(
             self,
-            self._impl_obj.expect_console_message(
+            lambda: self._impl_obj.expect_console_message(
                 predicate=self._wrap_handler(predicate), timeout=timeout
             ).future,
         )
@@ -11814,7 +11861,7 @@ class Page(SyncContextManager):
         """
         return EventContextManager(
             self,
-            self._impl_obj.expect_download(
+            lambda: self._impl_obj.expect_download(
                 predicate=self._wrap_handler(predicate), timeout=timeout
             ).future,
         )
@@ -11845,7 +11892,7 @@ class Page(SyncContextManager):
         """
         return EventContextManager(
             self,
-            self._impl_obj.expect_file_chooser(
+            lambda: self._impl_obj.expect_file_chooser(
                 predicate=self._wrap_handler(predicate), timeout=timeout
             ).future,
         )
@@ -11909,7 +11956,7 @@ class Page(SyncContextManager):
         """
         return EventContextManager(
             self,
-            self._impl_obj.expect_navigation(
+            lambda: self._impl_obj.expect_navigation(
                 url=self._wrap_handler(url), waitUntil=wait_until, timeout=timeout
             ).future,
         )
@@ -11940,7 +11987,7 @@ class Page(SyncContextManager):
         """
         return EventContextManager(
             self,
-            self._impl_obj.expect_popup(
+            lambda: self._impl_obj.expect_popup(
                 predicate=self._wrap_handler(predicate), timeout=timeout
             ).future,
         )
@@ -11987,7 +12034,7 @@ class Page(SyncContextManager):
         """
         return EventContextManager(
             self,
-            self._impl_obj.expect_request(
+            lambda: self._impl_obj.expect_request(
                 urlOrPredicate=self._wrap_handler(url_or_predicate), timeout=timeout
             ).future,
         )
@@ -12018,7 +12065,7 @@ class Page(SyncContextManager):
         """
         return EventContextManager(
             self,
-            self._impl_obj.expect_request_finished(
+            lambda: self._impl_obj.expect_request_finished(
                 predicate=self._wrap_handler(predicate), timeout=timeout
             ).future,
         )
@@ -12067,7 +12114,7 @@ class Page(SyncContextManager):
         """
         return EventContextManager(
             self,
-            self._impl_obj.expect_response(
+            lambda: self._impl_obj.expect_response(
                 urlOrPredicate=self._wrap_handler(url_or_predicate), timeout=timeout
             ).future,
         )
@@ -12098,7 +12145,7 @@ class Page(SyncContextManager):
         """
         return EventContextManager(
             self,
-            self._impl_obj.expect_websocket(
+            lambda: self._impl_obj.expect_websocket(
                 predicate=self._wrap_handler(predicate), timeout=timeout
             ).future,
         )
@@ -12129,7 +12176,7 @@ class Page(SyncContextManager):
         """
         return EventContextManager(
             self,
-            self._impl_obj.expect_worker(
+            lambda: self._impl_obj.expect_worker(
                 predicate=self._wrap_handler(predicate), timeout=timeout
             ).future,
         )
@@ -12347,6 +12394,7 @@ mapping.register(PageImpl, Page)
 
 
 class WebError(SyncBase):
+    __slots__ = ()
 
     @property
     def page(self) -> typing.Optional["Page"]:
@@ -13425,6 +13473,15 @@ class BrowserContext(SyncContextManager):
             )
         )
 
+    def route_cache(
+        self,
+        *,
+        url: typing.Optional[typing.Union[typing.Pattern[str], str]] = None,
+        store: typing.Optional[ResponseCache] = None,
+    ) -> None:
+
+        return self._sync(self._impl_obj.route_cache(url=url, store=store))
+
     def expect_event(
         self,
         event: str,
@@ -13461,7 +13518,7 @@ class BrowserContext(SyncContextManager):
         """
         return EventContextManager(
             self,
-            self._impl_obj.expect_event(
+            lambda: self._impl_obj.expect_event(
                 event=event, predicate=self._wrap_handler(predicate), timeout=timeout
             ).future,
         )
@@ -13578,7 +13635,7 @@ class BrowserContext(SyncContextManager):
         """
         return EventContextManager(
             self,
-            self._impl_obj.expect_console_message(
+            lambda: self._impl_obj.expect_console_message(
                 predicate=self._wrap_handler(predicate), timeout=timeout
             ).future,
         )
@@ -13609,7 +13666,7 @@ class BrowserContext(SyncContextManager):
         """
         return EventContextManager(
             self,
-            self._impl_obj.expect_page(
+            lambda: self._impl_obj.expect_page(
                 predicate=self._wrap_handler(predicate), timeout=timeout
             ).future,
         )
@@ -13639,6 +13696,7 @@ mapping.register(BrowserContextImpl, BrowserContext)
 
 
 class CDPSession(SyncBase):
+    __slots__ = ()
 
     def send(
         self, method: str, params: typing.Optional[typing.Dict] = None
@@ -14989,7 +15047,7 @@ class Playwright(SyncBase):
         -------
         Dict
         """
-        return mapping.from_maybe_impl(self._impl_obj.devices)
+        return self._impl_obj.devices
 
     @property
     def selectors(self) -> "Selectors":
@@ -15056,6 +15114,32 @@ class Playwright(SyncBase):
 
         return mapping.from_impl(self._impl_obj.__getitem__(value=value))
 
+    def metrics(self) -> typing.Dict:
+
+        return mapping.from_maybe_impl(self._impl_obj.metrics())
+
+    def add_metrics_listener(
+        self, callback: typing.Callable[[typing.Dict], typing.Any]
+    ) -> None:
+
+        return mapping.from_maybe_impl(
+            self._impl_obj.add_metrics_listener(callback=self._wrap_handler(callback))
+        )
+
+    def remove_metrics_listener(
+        self, callback: typing.Callable[[typing.Dict], typing.Any]
+    ) -> None:
+
+        return mapping.from_maybe_impl(
+            self._impl_obj.remove_metrics_listener(
+                callback=self._wrap_handler(callback)
+            )
+        )
+
+    def greenlet_profile(self) -> typing.Dict:
+
+        return mapping.from_maybe_impl(self._impl_obj.greenlet_profile())
+
     def stop(self) -> None:
         """Playwright.stop
 
@@ -15084,6 +15168,7 @@ mapping.register(PlaywrightImpl, Playwright)
 
 
 class Tracing(SyncBase):
+    __slots__ = ()
 
     def start(
         self,
@@ -15264,6 +15349,9 @@ mapping.register(TracingImpl, Tracing)
 
 
 class Locator(SyncBase):
+    __slots__ = ()
+
+    _post_processed_methods = frozenset(["element_handles", "all"])
 
     @property
     def page(self) -> "Page":
@@ -18037,6 +18125,7 @@ mapping.register(LocatorImpl, Locator)
 
 
 class APIResponse(SyncBase):
+    __slots__ = ()
 
     @property
     def ok(self) -> bool:
@@ -18162,6 +18251,7 @@ mapping.register(APIResponseImpl, APIResponse)
 
 
 class APIRequestContext(SyncBase):
+    __slots__ = ()
 
     def dispose(self, *, reason: typing.Optional[str] = None) -> None:
         """APIRequestContext.dispose
@@ -18860,6 +18950,7 @@ mapping.register(APIRequestContextImpl, APIRequestContext)
 
 
 class APIRequest(SyncBase):
+    __slots__ = ()
 
     def new_context(
         self,
@@ -18961,6 +19052,7 @@ mapping.register(APIRequestImpl, APIRequest)
 
 
 class PageAssertions(SyncBase):
+    __slots__ = ()
 
     def to_have_title(
         self,
@@ -19103,6 +19195,7 @@ mapping.register(PageAssertionsImpl, PageAssertions)
 
 
 class LocatorAssertions(SyncBase):
+    __slots__ = ()
 
     def to_contain_text(
         self,
@@ -21022,6 +21115,7 @@ mapping.register(LocatorAssertionsImpl, LocatorAssertions)
 
 
 class APIResponseAssertions(SyncBase):
+    __slots__ = ()
 
     def to_be_ok(self) -> None:
         """APIResponseAssertions.to_be_ok
@@ -0,0 +1,77 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Measures the import time of the generated API modules and the memory held by
+# each API wrapper object, for both flavours.
+# Usage: python scripts/benchmark_api_objects.py
+
+import re
+import subprocess
+import sys
+import tracemalloc
+from typing import Any, List
+
+OBJECTS = 10000
+IMPORTS = 5
+
+
+class FakeImpl:
+    _loop = None
+    _dispatcher_fiber = None
+
+
+def _import_time_ms(module: str) -> float:
+    timings: List[float] = []
+    for _ in range(IMPORTS):
+        output = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stderr
+        # Self time of the module itself, in microseconds.
+        match = re.search(rf"(\d+) \|\s+\d+ \|\s+{re.escape(module)}$", output, re.M)
+        assert match, output
+        timings.append(int(match.group(1)) / 1000)
+    return min(timings)
+
+
+def _bytes_per_object(api_class: Any) -> float:
+    impls = [FakeImpl() for _ in range(OBJECTS)]
+    tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot()
+    wrappers = [api_class(impl) for impl in impls]
+    used = sum(
+        stat.size_diff
+        for stat in tracemalloc.take_snapshot().compare_to(snapshot, "filename")
+    )
+    tracemalloc.stop()
+    assert len(wrappers) == OBJECTS
+    return used / OBJECTS
+
+
+def main() -> None:
+    from playwright_firefox.async_api import _generated as async_generated
+    from playwright_firefox.sync_api import _generated as sync_generated
+
+    for name, generated in (("sync", sync_generated), ("async", async_generated)):
+        module = generated.__name__
+        print(f"{name:<6} import {_import_time_ms(module):6.1f} ms (self)")
+        for class_name in ("Request", "Response", "Locator", "Page"):
+            size = _bytes_per_object(getattr(generated, class_name))
+            print(f"{name:<6} {class_name:<10} {size:6.0f} bytes/object")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Measures the per-call overhead of capturing the API call site, without a driver.
+# Usage: python scripts/benchmark_call_site.py
+
+import asyncio
+import inspect
+import time
+import traceback
+from typing import Any, Callable
+
+from null_transport import NullTransport
+
+from playwright_firefox._impl._connection import Connection, RootChannelOwner
+from playwright_firefox._impl._object_factory import create_remote_object
+
+CALLS = 20000
+USER_STACK_DEPTH = 15
+
+
+def _legacy_capture() -> None:
+    # What every call paid before call sites were captured lazily.
+    inspect.stack(0)
+    traceback.extract_stack(limit=10)
+
+
+def _with_user_stack(depth: int, fn: Callable[[], Any]) -> Any:
+    if depth:
+        return _with_user_stack(depth - 1, fn)
+    return fn()
+
+
+async def _measure(fn: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    for i in range(CALLS):
+        _with_user_stack(USER_STACK_DEPTH, fn)
+        if i % 100 == 0:
+            # Let the loop run the callbacks of the completed calls.
+            await asyncio.sleep(0)
+    return (time.perf_counter() - start) / CALLS * 1e6
+
+
+async def main() -> None:
+    loop = asyncio.get_running_loop()
+    connection = Connection(None, create_remote_object, NullTransport(loop), loop)
+    root = RootChannelOwner(connection)
+
+    def api_call() -> None:
+        connection.wrap_api_call_sync(
+            lambda: connection._send_message_to_server(root, "noop", {}, True)
+        )
+        for callback in connection._callbacks.values():
+            callback.future.set_result(None)
+        connection._callbacks.clear()
+
+    print(f"legacy stack capture only {await _measure(_legacy_capture):8.1f} us/call")
+    connection._lazy_call_sites = False
+    print(f"api call, eager           {await _measure(api_call):8.1f} us/call")
+    connection._lazy_call_sites = True
+    print(f"api call, lazy            {await _measure(api_call):8.1f} us/call")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Measures the client-side cost of the device descriptors on connection setup,
+# as paid by every BrowserType.connect, and of a playwright.devices lookup.
+# Usage: python scripts/benchmark_device_descriptors.py
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, List
+
+from null_transport import NullTransport
+
+# Imported to register the API classes with the mapping.
+import playwright_firefox.sync_api  # noqa: F401
+from playwright_firefox._impl._connection import Connection, RootChannelOwner
+from playwright_firefox._impl._local_utils import (
+    DeviceDescriptors,
+    parse_device_descriptor,
+)
+from playwright_firefox._impl._object_factory import create_remote_object
+from playwright_firefox._impl._sync_base import mapping
+
+ROUNDS = 2000
+# About as many descriptors as the driver sends.
+DEVICES = 140
+
+
+def _descriptors() -> List[Dict]:
+    return [
+        {
+            "name": f"Device {i}",
+            "descriptor": {
+                "userAgent": f"Mozilla/5.0 (Device {i}) Gecko/20100101 Firefox/135.0",
+                "viewport": {"width": 360 + i, "height": 640 + i},
+                "deviceScaleFactor": 2,
+                "isMobile": True,
+                "hasTouch": True,
+                "defaultBrowserType": "firefox",
+            },
+        }
+        for i in range(DEVICES)
+    ]
+
+
+def _legacy_devices(initializer: Dict) -> Dict:
+    # How LocalUtils built the devices before they were parsed lazily.
+    return {
+        device["name"]: parse_device_descriptor(device["descriptor"])
+        for device in initializer["deviceDescriptors"]
+    }
+
+
+def _measure(name: str, fn: Callable[[], Any]) -> None:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn()
+    print(f"{name:<28} {(time.perf_counter() - start) / ROUNDS * 1e6:10.1f} us")
+
+
+async def main() -> None:
+    loop = asyncio.get_running_loop()
+    connection = Connection(None, create_remote_object, NullTransport(loop), loop)
+    root = RootChannelOwner(connection)
+    initializer = {"deviceDescriptors": _descriptors()}
+    guids = iter(range(2 * ROUNDS))
+
+    def connect() -> Any:
+        return create_remote_object(
+            root, "LocalUtils", f"localUtils@{next(guids)}", initializer
+        )
+
+    _measure(
+        "connect, legacy",
+        lambda: setattr(connect(), "devices", _legacy_devices(initializer)),
+    )
+    _measure("connect, lazy", connect)
+
+    legacy = _legacy_devices(initializer)
+    lazy = DeviceDescriptors(initializer["deviceDescriptors"])
+    # The API layer used to convert the devices on every access to
+    # playwright.devices, DeviceDescriptors is returned as is.
+    _measure(
+        "devices lookup, legacy",
+        lambda: mapping.from_maybe_impl(legacy)["Device 42"],
+    )
+    _measure("devices lookup, lazy", lambda: lazy["Device 42"])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
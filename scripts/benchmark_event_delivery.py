@@ -0,0 +1,128 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Measures how many protocol events per second reach user handlers registered
+# through the sync and async APIs, without a driver.
+# Usage: python scripts/benchmark_event_delivery.py
+
+import asyncio
+import inspect
+import time
+from typing import Any, Callable, Dict, cast
+
+from greenlet import greenlet
+from null_transport import NullTransport
+
+# Imported to register the API classes with the mappings.
+import playwright_firefox.async_api  # noqa: F401
+import playwright_firefox.sync_api  # noqa: F401
+from playwright_firefox._impl._async_base import mapping as async_mapping
+from playwright_firefox._impl._connection import (
+    ChannelOwner,
+    Connection,
+    RootChannelOwner,
+)
+from playwright_firefox._impl._helper import ParsedMessagePayload
+from playwright_firefox._impl._impl_to_api_mapping import ImplToApiMapping
+from playwright_firefox._impl._object_factory import create_remote_object
+from playwright_firefox._impl._sync_base import mapping as sync_mapping
+
+EVENTS = 50000
+
+
+class EventSource(ChannelOwner):
+    def __init__(
+        self, parent: ChannelOwner, type: str, guid: str, initializer: Dict
+    ) -> None:
+        super().__init__(parent, type, guid, initializer)
+        self._channel.on(
+            "request", lambda params: self.emit("request", params["request"]._object)
+        )
+
+
+def _legacy_wrap_handler(
+    mapping: ImplToApiMapping, handler: Callable[..., Any]
+) -> Callable[..., Any]:
+    # How handlers were wrapped before their arity was cached.
+    def wrapper_func(*args: Any) -> Any:
+        arg_count = len(inspect.signature(handler).parameters)
+        return handler(
+            *list(map(lambda a: mapping.from_maybe_impl(a), args))[:arg_count]
+        )
+
+    return wrapper_func
+
+
+def _run(
+    connection: Connection,
+    source: EventSource,
+    wrap: Callable[[Callable[..., Any]], Callable[..., Any]],
+) -> float:
+    received = []
+    source.on("request", wrap(lambda request: received.append(request.url)))
+    message: Dict = {
+        "guid": source._guid,
+        "method": "request",
+        "params": {"request": {"guid": "request@1"}},
+    }
+    start = time.perf_counter()
+    for _ in range(EVENTS):
+        connection.dispatch(
+            cast(ParsedMessagePayload, dict(message, params=dict(message["params"])))
+        )
+    elapsed = time.perf_counter() - start
+    source.remove_all_listeners("request")
+    assert len(received) == EVENTS
+    return EVENTS / elapsed
+
+
+def _setup(loop: asyncio.AbstractEventLoop, is_sync: bool) -> Any:
+    connection = Connection(None, create_remote_object, NullTransport(loop), loop)
+    connection._is_sync = is_sync
+    root = RootChannelOwner(connection)
+    create_remote_object(
+        root,
+        "Request",
+        "request@1",
+        {
+            "url": "https://example.com/",
+            "resourceType": "document",
+            "method": "GET",
+            "headers": [],
+            "isNavigationRequest": True,
+        },
+    )
+    return connection, EventSource(root, "EventSource", "source@1", {})
+
+
+def _report(
+    name: str, connection: Connection, source: EventSource, mapping: ImplToApiMapping
+) -> None:
+    legacy = _run(connection, source, lambda h: _legacy_wrap_handler(mapping, h))
+    current = _run(connection, source, mapping.wrap_handler)
+    print(f"{name:<6} legacy {legacy:10.0f} events/s  cached {current:10.0f} events/s")
+
+
+async def main() -> None:
+    loop = asyncio.get_running_loop()
+    connection, source = _setup(loop, is_sync=False)
+    _report("async", connection, source, async_mapping)
+
+    connection, source = _setup(loop, is_sync=True)
+    # Sync listeners run in their own greenlets, like in the dispatcher fiber.
+    greenlet(lambda: _report("sync", connection, source, sync_mapping)).switch()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Measures loading a large HAR into the in process HAR backend and looking
+# requests up in it, without a driver. With the driver backend, each lookup
+# also costs a headers and a harLookup round trip.
+# Usage: python scripts/benchmark_har_replay.py
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+import zipfile
+from typing import Dict, List, Optional, cast
+
+from playwright_firefox._impl._api_structures import HeadersArray
+from playwright_firefox._impl._har_backend import HarBackend
+from playwright_firefox._impl._network import Request
+
+ENTRIES = 20000
+LOOKUPS = 20000
+BODY = "x" * 2048
+
+
+class FakeRequest:
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.method = "GET"
+        self.post_data_buffer: Optional[bytes] = None
+
+    def is_navigation_request(self) -> bool:
+        return False
+
+    async def headers_array(self) -> HeadersArray:
+        return []
+
+
+def _entry(i: int, attached: bool) -> Dict:
+    content: Dict = {"mimeType": "text/plain", "size": len(BODY)}
+    if attached:
+        content["_file"] = f"{i}.txt"
+    else:
+        content["text"] = BODY
+    return {
+        "request": {
+            "method": "GET",
+            "url": f"https://example.com/resource/{i}",
+            "headers": [{"name": "accept", "value": "*/*"}],
+        },
+        "response": {
+            "status": 200,
+            "headers": [{"name": "content-type", "value": "text/plain"}],
+            "content": content,
+        },
+    }
+
+
+def _write_hars(directory: str) -> List[str]:
+    har_path = os.path.join(directory, "embedded.har")
+    with open(har_path, "w") as f:
+        json.dump({"log": {"entries": [_entry(i, False) for i in range(ENTRIES)]}}, f)
+    zip_path = os.path.join(directory, "attached.zip")
+    with zipfile.ZipFile(zip_path, "w") as z:
+        har = {"log": {"entries": [_entry(i, True) for i in range(ENTRIES)]}}
+        z.writestr("har.har", json.dumps(har))
+        for i in range(ENTRIES):
+            z.writestr(f"{i}.txt", BODY)
+    return [har_path, zip_path]
+
+
+async def _measure(path: str) -> None:
+    start = time.perf_counter()
+    backend = await HarBackend.open(path)
+    load_ms = (time.perf_counter() - start) * 1000
+    requests = [
+        FakeRequest(f"https://example.com/resource/{i * 7 % ENTRIES}")
+        for i in range(LOOKUPS)
+    ]
+    start = time.perf_counter()
+    for request in requests:
+        result = await backend.lookup(cast(Request, request))
+        assert result["action"] == "fulfill"
+    lookup_us = (time.perf_counter() - start) / LOOKUPS * 1e6
+    backend.dispose()
+    print(
+        f"{os.path.basename(path):<14} load {load_ms:8.1f} ms"
+        f"  lookup {lookup_us:6.1f} us"
+    )
+
+
+async def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        for path in _write_hars(directory):
+            await _measure(path)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Measures how fast requests are streamed to a .ndjson HAR, and the memory
+# held while doing so, without a driver. Recording into a .har keeps all the
+# entries in the driver until the context closes instead.
+# Usage: python scripts/benchmark_har_stream.py
+
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, cast
+
+from playwright_firefox._impl._api_structures import HeadersArray
+from playwright_firefox._impl._har_backend import HarBackend
+from playwright_firefox._impl._har_stream import HarStreamRecorder, har_stream_segments
+from playwright_firefox._impl._network import Request
+
+REQUESTS = 20000
+BODY = b"x" * 2048
+
+
+class FakeResponse:
+    def __init__(self) -> None:
+        self.status = 200
+        self.status_text = "OK"
+
+    async def headers_array(self) -> HeadersArray:
+        return [{"name": "content-type", "value": "text/plain"}]
+
+    async def body(self) -> bytes:
+        return BODY
+
+
+class FakeRequest:
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.method = "GET"
+        self.post_data_buffer = None
+        self.timing: Dict[str, float] = {
+            "startTime": time.time() * 1000,
+            "requestStart": 1,
+            "responseStart": 2,
+            "responseEnd": 3,
+        }
+        self._response = FakeResponse()
+
+    async def response(self) -> FakeResponse:
+        return self._response
+
+    async def headers_array(self) -> HeadersArray:
+        return [{"name": "accept", "value": "*/*"}]
+
+    def is_navigation_request(self) -> bool:
+        return False
+
+
+async def main() -> None:
+    os.environ.setdefault("PLAYWRIGHT_HAR_ROTATE_BYTES", str(16 * 1024 * 1024))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "session.ndjson")
+        tracemalloc.start()
+        start = time.perf_counter()
+        recorder = HarStreamRecorder(path, "embed")
+        for i in range(REQUESTS):
+            request = FakeRequest(f"https://example.com/resource/{i}")
+            recorder.on_request_finished(cast(Request, request))
+            if i % 100 == 99:
+                await asyncio.sleep(0)
+        await recorder.close()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        segments = list(har_stream_segments(path))
+        size = sum(os.path.getsize(segment) for segment in segments)
+        print(
+            f"record   {REQUESTS / elapsed:10.0f} entries/s"
+            f"  peak {peak / 1024 / 1024:6.1f} MiB"
+            f"  {len(segments)} segments, {size / 1024 / 1024:.1f} MiB on disk"
+        )
+
+        start = time.perf_counter()
+        backend = await HarBackend.open(path)
+        print(f"read back {(time.perf_counter() - start) * 1000:9.1f} ms")
+        backend.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Measures the cold import time of the public modules with -X importtime, each
+# import runs in a fresh interpreter. Pass --first-use to also import the
+# classes a typical script touches.
+# Usage: python scripts/benchmark_import_time.py [--first-use]
+
+import subprocess
+import sys
+from typing import List
+
+ROUNDS = 10
+
+MODULES = {
+    "playwright_firefox.sync_api": "Page, sync_playwright",
+    "playwright_firefox.async_api": "Page, async_playwright",
+    "playwright_firefox.stealth": "Stealth",
+}
+
+
+def _import_time_ms(statement: str) -> float:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        stderr=subprocess.PIPE,
+        check=True,
+        text=True,
+    )
+    # Lines look like "import time: <self us> | <cumulative us> | <module>", with
+    # nested imports indented, top level entries add up to the total.
+    total = 0
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and not fields[2].startswith("  "):
+            cumulative = fields[1].strip()
+            if cumulative.isdigit():
+                total += int(cumulative)
+    return total / 1000
+
+
+def _best_of(statement: str) -> float:
+    timings: List[float] = []
+    for _ in range(ROUNDS):
+        timings.append(_import_time_ms(statement))
+    return min(timings)
+
+
+def main() -> None:
+    first_use = "--first-use" in sys.argv[1:]
+    # Modules imported by the interpreter itself are not part of the cost.
+    baseline = _best_of("pass")
+    for module, names in MODULES.items():
+        statement = f"import {module}"
+        if first_use:
+            statement = f"from {module} import {names}"
+        print(f"{module:<30} {_best_of(statement) - baseline:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
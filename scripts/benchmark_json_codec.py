@@ -0,0 +1,146 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Compares the protocol JSON codecs on a mix of driver messages.
+# Usage: python scripts/benchmark_json_codec.py [messages.ndjson]
+#
+# The optional file holds one protocol message per line, e.g. captured with
+# DEBUGP or a recording transport. Without it a built-in mix modelled on a
+# crawling session is used.
+
+import base64
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+from playwright_firefox._impl._json_codec import JSON_CODECS, JsonCodec
+
+ROUNDS = 20
+
+
+def _headers(count: int) -> List[Dict[str, str]]:
+    return [{"name": f"x-header-{i}", "value": "v" * 40} for i in range(count)]
+
+
+def _builtin_message_mix() -> List[Dict[str, Any]]:
+    messages: List[Dict[str, Any]] = []
+    for i in range(200):
+        messages.append(
+            {
+                "id": i,
+                "guid": "frame@1",
+                "method": "evaluateExpression",
+                "params": {
+                    "expression": "() => document.title",
+                    "isFunction": True,
+                    "arg": {"value": {"v": "undefined"}, "handles": []},
+                },
+                "metadata": {"wallTime": 1700000000000, "apiName": "Page.evaluate"},
+            }
+        )
+        messages.append({"id": i, "result": {"value": {"s": "Example Domain"}}})
+        messages.append(
+            {
+                "guid": "page@1",
+                "method": "console",
+                "params": {
+                    "type": "log",
+                    "text": "message " * 10,
+                    "args": [{"guid": f"handle@{i}"}],
+                    "location": {"url": "https://example.com/app.js", "lineNumber": 1},
+                },
+            }
+        )
+    for i in range(50):
+        messages.append(
+            {
+                "guid": "browser-context@1",
+                "method": "request",
+                "params": {
+                    "request": {"guid": f"request@{i}"},
+                    "page": {"guid": "page@1"},
+                },
+            }
+        )
+        messages.append(
+            {
+                "guid": "request@1",
+                "method": "__create__",
+                "params": {
+                    "type": "Response",
+                    "guid": f"response@{i}",
+                    "initializer": {
+                        "url": f"https://example.com/static/{i}.js",
+                        "status": 200,
+                        "statusText": "OK",
+                        "headers": _headers(20),
+                        "timing": {
+                            "startTime": 1700000000000.5,
+                            "domainLookupStart": -1,
+                        },
+                    },
+                },
+            }
+        )
+    screenshot = base64.b64encode(os.urandom(3 * 1024 * 1024)).decode()
+    messages.append({"id": 1000, "result": {"binary": screenshot}})
+    return messages
+
+
+def _load_messages(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _measure(codec: JsonCodec, messages: List[Dict[str, Any]]) -> Dict[str, float]:
+    encoded = [codec.encode(message) for message in messages]
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for message in messages:
+            codec.encode(message)
+    encode_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for data in encoded:
+            codec.decode(data)
+    decode_time = time.perf_counter() - start
+    return {"encode": encode_time, "decode": decode_time}
+
+
+def main() -> None:
+    messages = (
+        _load_messages(sys.argv[1]) if len(sys.argv) > 1 else _builtin_message_mix()
+    )
+    total_bytes = sum(len(json.dumps(message)) for message in messages)
+    print(
+        f"{len(messages)} messages, {total_bytes / 1024 / 1024:.1f} MB, {ROUNDS} rounds"
+    )
+    for name, codec_class in JSON_CODECS.items():
+        try:
+            codec = codec_class()
+        except ImportError:
+            print(f"{name:<8} not installed")
+            continue
+        result = _measure(codec, messages)
+        count = len(messages) * ROUNDS
+        print(
+            f"{name:<8} encode {result['encode']:7.3f}s ({count / result['encode']:10.0f} msg/s)"
+            f"  decode {result['decode']:7.3f}s ({count / result['decode']:10.0f} msg/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
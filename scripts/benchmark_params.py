@@ -0,0 +1,142 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Measures the conversion of protocol params: large evaluate arguments on the
+# way out and HAR lookup results on the way in.
+# Usage: python scripts/benchmark_params.py
+
+import asyncio
+import base64
+import collections.abc
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping
+
+from null_transport import NullTransport
+
+from playwright_firefox._impl._connection import (
+    Channel,
+    Connection,
+    RootChannelOwner,
+    _augment_params,
+)
+from playwright_firefox._impl._js_handle import serialize_argument
+from playwright_firefox._impl._object_factory import create_remote_object
+
+ROUNDS = 200
+
+
+# The conversions as they were before the params were handled in one pass.
+def _legacy_filter_none(d: Mapping) -> Dict:
+    result = {}
+    for k, v in d.items():
+        if v is None:
+            continue
+        result[k] = _legacy_filter_none(v) if isinstance(v, dict) else v
+    return result
+
+
+def _legacy_replace_channels_with_guids(payload: Any) -> Any:
+    if payload is None:
+        return payload
+    if isinstance(payload, Path):
+        return str(payload)
+    if isinstance(payload, collections.abc.Sequence) and not isinstance(payload, str):
+        return list(map(_legacy_replace_channels_with_guids, payload))
+    if isinstance(payload, Channel):
+        return dict(guid=payload._guid)
+    if isinstance(payload, dict):
+        result = {}
+        for key, value in payload.items():
+            result[key] = _legacy_replace_channels_with_guids(value)
+        return result
+    return payload
+
+
+def _legacy_replace_guids_with_channels(objects: Dict, payload: Any) -> Any:
+    if payload is None:
+        return payload
+    if isinstance(payload, list):
+        return [_legacy_replace_guids_with_channels(objects, v) for v in payload]
+    if isinstance(payload, dict):
+        if payload.get("guid") in objects:
+            return objects[payload["guid"]]._channel
+        result = {}
+        for key, value in payload.items():
+            result[key] = _legacy_replace_guids_with_channels(objects, value)
+        return result
+    return payload
+
+
+def _evaluate_params() -> Dict:
+    rows = [
+        {"id": i, "name": f"row {i}", "tags": ["a", "b", "c"], "score": i / 3}
+        for i in range(2000)
+    ]
+    return {
+        "expression": "rows => rows.length",
+        "isFunction": True,
+        "arg": serialize_argument(rows),
+        "timeout": None,
+    }
+
+
+def _har_lookup_result() -> Dict:
+    return {
+        "action": "fulfill",
+        "status": 200,
+        "headers": [{"name": f"x-header-{i}", "value": "v" * 40} for i in range(50)],
+        "body": base64.b64encode(os.urandom(512 * 1024)).decode(),
+    }
+
+
+def _measure(name: str, fn: Callable[[], Any]) -> None:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn()
+    print(f"{name:<28} {(time.perf_counter() - start) / ROUNDS * 1e6:10.1f} us")
+
+
+async def main() -> None:
+    loop = asyncio.get_running_loop()
+    connection = Connection(None, create_remote_object, NullTransport(loop), loop)
+    RootChannelOwner(connection)
+    evaluate_params = _evaluate_params()
+    har_result = _har_lookup_result()
+
+    _measure(
+        "evaluate params, legacy",
+        lambda: _legacy_replace_channels_with_guids(
+            _legacy_filter_none(dict(evaluate_params))
+        ),
+    )
+    _measure(
+        "evaluate params, fused",
+        lambda: connection._params_to_wire(
+            _augment_params(dict(evaluate_params), None)
+        ),
+    )
+    _measure(
+        "har lookup result, legacy",
+        lambda: _legacy_replace_guids_with_channels(connection._objects, har_result),
+    )
+    _measure(
+        "har lookup result",
+        lambda: connection._replace_guids_with_channels(har_result),
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Measures the client-side cost of a scripted session by replaying a recording
+# of it, no browser is needed for the replay.
+# Usage:
+#   python scripts/benchmark_replay.py record session.ndjson.gz  (needs Firefox)
+#   python scripts/benchmark_replay.py replay session.ndjson.gz
+
+import asyncio
+import os
+import sys
+import time
+from typing import Callable
+
+from playwright_firefox.async_api import async_playwright
+from playwright_firefox.sync_api import sync_playwright
+
+ITERATIONS = 200
+ROUNDS = 5
+
+CONTENT = "<ul>" + "".join(f"<li class='item'>{i}</li>" for i in range(50)) + "</ul>"
+
+
+async def async_scenario() -> None:
+    async with async_playwright() as p:
+        browser = await p.firefox.launch()
+        page = await browser.new_page()
+        await page.set_content(CONTENT)
+        for i in range(ITERATIONS):
+            await page.evaluate("i => i * 2", i)
+            await page.locator(".item").nth(i % 50).text_content()
+        await page.evaluate("() => document.querySelectorAll('li').length")
+        await browser.close()
+
+
+def sync_scenario() -> None:
+    with sync_playwright() as p:
+        browser = p.firefox.launch()
+        page = browser.new_page()
+        page.set_content(CONTENT)
+        for i in range(ITERATIONS):
+            page.evaluate("i => i * 2", i)
+            page.locator(".item").nth(i % 50).text_content()
+        page.evaluate("() => document.querySelectorAll('li').length")
+        browser.close()
+
+
+def _measure(name: str, scenario: Callable[[], None]) -> None:
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        scenario()
+        timings.append(time.perf_counter() - start)
+    print(f"{name:<6} best {min(timings) * 1000:8.1f} ms  of {ROUNDS} rounds")
+
+
+def main() -> None:
+    if len(sys.argv) != 3 or sys.argv[1] not in ("record", "replay"):
+        print("usage: benchmark_replay.py record|replay <recording>")
+        sys.exit(1)
+    mode, path = sys.argv[1:]
+    if mode == "record":
+        os.environ["PLAYWRIGHT_RECORD_PROTOCOL"] = path
+        asyncio.run(async_scenario())
+        print(f"recorded {path}")
+        return
+    os.environ["PLAYWRIGHT_REPLAY_PROTOCOL"] = path
+    _measure("async", lambda: asyncio.run(async_scenario()))
+    _measure("sync", sync_scenario)
+
+
+if __name__ == "__main__":
+    main()
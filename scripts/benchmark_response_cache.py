@@ -0,0 +1,93 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Measures the requests served by a route_cache store, in memory and on disk,
+# for a crawl that fetches the same static assets from many pages, without a
+# driver. Every miss costs a fetch round trip, which is not included here.
+# Usage: python scripts/benchmark_response_cache.py
+
+import asyncio
+import random
+import tempfile
+import time
+from typing import Dict, Optional, cast
+
+from playwright_firefox._impl._network import Route
+from playwright_firefox._impl._response_cache import ResponseCache
+
+ASSETS = 2000
+REQUESTS = 50000
+BODY = b"x" * 32 * 1024
+
+
+class FakeRequest:
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.method = "GET"
+        self.headers: Dict[str, str] = {"accept": "*/*"}
+
+
+class FakeResponse:
+    def __init__(self) -> None:
+        self.status = 200
+        self.headers = {"cache-control": "max-age=3600", "content-type": "text/css"}
+
+    async def body(self) -> bytes:
+        return BODY
+
+
+class FakeRoute:
+    def __init__(self, url: str) -> None:
+        self.request = FakeRequest(url)
+
+    async def fetch(self, headers: Optional[Dict[str, str]] = None) -> FakeResponse:
+        return FakeResponse()
+
+    async def fulfill(self, **kwargs: object) -> None:
+        pass
+
+    async def fallback(self) -> None:
+        pass
+
+
+async def _measure(name: str, cache: ResponseCache) -> None:
+    # A few assets are requested by every page, most of them rarely.
+    urls = [
+        f"https://cdn.example.com/{int(random.paretovariate(1)) % ASSETS}.css"
+        for _ in range(REQUESTS)
+    ]
+    start = time.perf_counter()
+    for url in urls:
+        await cache._handle(cast(Route, FakeRoute(url)))
+    elapsed = time.perf_counter() - start
+    stats = cache.stats()
+    print(
+        f"{name:<8} {REQUESTS / elapsed:10.0f} requests/s"
+        f"  hit rate {stats['hitRate']:.1%}"
+        f"  {stats['evictions']} evictions"
+    )
+
+
+async def main() -> None:
+    random.seed(0)
+    await _measure("memory", ResponseCache(max_bytes=16 * 1024 * 1024))
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ResponseCache(max_bytes=16 * 1024 * 1024, path=directory)
+        await _measure("disk", cache)
+        cache.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
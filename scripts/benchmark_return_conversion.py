@@ -0,0 +1,50 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Measures the conversion of large evaluate results to the API, compared to
+# the plain return emitted for results that cannot hold impl objects.
+# Usage: python scripts/benchmark_return_conversion.py
+
+import time
+from typing import Any, Callable
+
+# Imported to register the API classes with the mapping.
+import playwright_firefox.sync_api  # noqa: F401
+from playwright_firefox._impl._sync_base import mapping
+
+ROUNDS = 200
+
+
+def _evaluate_result() -> Any:
+    return [
+        {"id": i, "name": f"row {i}", "tags": ["a", "b", "c"], "score": i / 3}
+        for i in range(2000)
+    ]
+
+
+def _measure(name: str, fn: Callable[[], Any]) -> None:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn()
+    print(f"{name:<20} {(time.perf_counter() - start) / ROUNDS * 1e6:10.1f} us")
+
+
+def main() -> None:
+    result = _evaluate_result()
+    _measure("from_maybe_impl", lambda: mapping.from_maybe_impl(result))
+    _measure("plain return", lambda: result)
+
+
+if __name__ == "__main__":
+    main()
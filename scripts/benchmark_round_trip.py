@@ -0,0 +1,75 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Measures protocol round-trips per second against a transport that answers
+# every request immediately, i.e. the client-side cost of a request.
+# Usage: python scripts/benchmark_round_trip.py
+
+import asyncio
+import time
+from typing import Any
+
+from null_transport import EchoTransport
+
+from playwright_firefox._impl._connection import (
+    Channel,
+    Connection,
+    RootChannelOwner,
+    _augment_params,
+)
+from playwright_firefox._impl._object_factory import create_remote_object
+
+ROUND_TRIPS = 20000
+
+
+async def _legacy_send(channel: Channel, method: str) -> Any:
+    # How Channel._inner_send waited for the reply before the single-future path.
+    connection = channel._connection
+
+    async def inner() -> Any:
+        callback = connection._send_message_to_server(
+            channel._object, method, _augment_params(None, None)
+        )
+        done, _ = await asyncio.wait(
+            {connection._transport.on_error_future, callback.future},
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        if not callback.future.done():
+            callback.future.cancel()
+        return next(iter(done)).result()
+
+    return await connection.wrap_api_call(inner)
+
+
+async def _measure(name: str, channel: Channel, legacy: bool) -> None:
+    start = time.perf_counter()
+    for _ in range(ROUND_TRIPS):
+        if legacy:
+            await _legacy_send(channel, "noop")
+        else:
+            await channel.send("noop", None)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<14} {ROUND_TRIPS / elapsed:10.0f} round-trips/s")
+
+
+async def main() -> None:
+    loop = asyncio.get_running_loop()
+    connection = Connection(None, create_remote_object, EchoTransport(loop), loop)
+    channel = RootChannelOwner(connection)._channel
+    await _measure("asyncio.wait", channel, legacy=True)
+    await _measure("single future", channel, legacy=False)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
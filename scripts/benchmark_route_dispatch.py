@@ -0,0 +1,105 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Measures how long it takes to find the route handler of a request with 10,
+# 100 and 1000 per domain mock and block rules, as done by Page._on_route and
+# BrowserContext._on_route.
+# Usage: python scripts/benchmark_route_dispatch.py
+
+import re
+import time
+from typing import Callable, List, Optional
+
+from playwright_firefox._impl._helper import RouteHandler, RouteIndex
+
+REQUESTS = 2000
+BASE_URL = "https://app.example.com/"
+
+
+def _handlers(count: int) -> List[RouteHandler]:
+    handlers = []
+    for i in range(count - 2):
+        if i % 2:
+            url = f"https://api{i}.example.com/v1/**"
+        else:
+            url = f"https://tracker{i}.example.net/**"
+        handlers.append(RouteHandler(BASE_URL, url, lambda route: None, False))
+    # A few rules that can match any URL.
+    handlers.append(RouteHandler(BASE_URL, "**/*.png", lambda route: None, False))
+    handlers.append(
+        RouteHandler(BASE_URL, re.compile(r"/ads/"), lambda route: None, False)
+    )
+    return handlers
+
+
+def _urls(count: int) -> List[str]:
+    urls = []
+    for i in range(REQUESTS):
+        domain = i % count
+        if i % 3 == 0:
+            urls.append(f"https://api{domain}.example.com/v1/users/{i}")
+        elif i % 3 == 1:
+            urls.append(f"https://tracker{domain}.example.net/collect?i={i}")
+        else:
+            urls.append(f"https://app.example.com/static/{i}.js")
+    return urls
+
+
+def _legacy_dispatch(handlers: List[RouteHandler], url: str) -> Optional[RouteHandler]:
+    # How the handlers were searched before they were indexed.
+    for handler in handlers.copy():
+        if handler.matches(url):
+            return handler
+    return None
+
+
+def _indexed_dispatch(index: RouteIndex) -> Callable[..., Optional[RouteHandler]]:
+    def dispatch(handlers: List[RouteHandler], url: str) -> Optional[RouteHandler]:
+        for handler in index.candidates(handlers, url):
+            if handler.matches(url):
+                return handler
+        return None
+
+    return dispatch
+
+
+def _measure(
+    dispatch: Callable[[List[RouteHandler], str], Optional[RouteHandler]],
+    handlers: List[RouteHandler],
+    urls: List[str],
+) -> float:
+    start = time.perf_counter()
+    for url in urls:
+        dispatch(handlers, url)
+    return REQUESTS / (time.perf_counter() - start)
+
+
+def main() -> None:
+    for count in (10, 100, 1000):
+        handlers = _handlers(count)
+        urls = _urls(count)
+        index = RouteIndex()
+        assert [_legacy_dispatch(handlers, url) for url in urls] == [
+            _indexed_dispatch(index)(handlers, url) for url in urls
+        ]
+        legacy = _measure(_legacy_dispatch, handlers, urls)
+        indexed = _measure(_indexed_dispatch(index), handlers, urls)
+        print(
+            f"{count:>5} handlers  legacy {legacy:10.0f} requests/s"
+            f"  indexed {indexed:10.0f} requests/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Compares the per-call cost of the sync and async APIs on a local page.
+# Usage: python scripts/benchmark_sync_overhead.py
+
+import asyncio
+import time
+
+from playwright_firefox.async_api import async_playwright
+from playwright_firefox.sync_api import sync_playwright
+
+CALLS = 2000
+CONTENT = "<ul>" + "".join(f"<li>item {i}</li>" for i in range(100)) + "</ul>"
+
+
+async def measure_async() -> float:
+    async with async_playwright() as p:
+        browser = await p.firefox.launch()
+        page = await browser.new_page()
+        await page.set_content(CONTENT)
+        locator = page.locator("li").nth(42)
+        await locator.text_content()
+        start = time.perf_counter()
+        for _ in range(CALLS):
+            await locator.text_content()
+        elapsed = time.perf_counter() - start
+        await browser.close()
+    return elapsed / CALLS * 1e6
+
+
+def measure_sync() -> float:
+    with sync_playwright() as p:
+        browser = p.firefox.launch()
+        page = browser.new_page()
+        page.set_content(CONTENT)
+        locator = page.locator("li").nth(42)
+        locator.text_content()
+        start = time.perf_counter()
+        for _ in range(CALLS):
+            locator.text_content()
+        elapsed = time.perf_counter() - start
+        browser.close()
+    return elapsed / CALLS * 1e6
+
+
+def main() -> None:
+    async_us = asyncio.run(measure_async())
+    sync_us = measure_sync()
+    print(f"async {async_us:8.1f} us/call")
+    print(f"sync  {sync_us:8.1f} us/call ({sync_us - async_us:+.1f} us)")
+
+
+if __name__ == "__main__":
+    main()
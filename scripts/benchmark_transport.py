@@ -0,0 +1,101 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Measures how fast driver frames are read off the pipe, without a driver.
+# Usage: python scripts/benchmark_transport.py
+
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Union
+
+from playwright_firefox._impl._transport import FrameReader
+
+# The OS pipe hands data over in chunks of this size.
+PIPE_CHUNK_SIZE = 65536
+
+FRAME_SIZES = [
+    ("1 KB", 1024, 2000),
+    ("1 MB", 1024 * 1024, 50),
+    ("50 MB", 50 * 1024 * 1024, 1),
+]
+
+
+def _encode_frame(size: int) -> bytes:
+    return size.to_bytes(4, byteorder="little", signed=False) + b"x" * size
+
+
+async def _legacy_read_frame(stream: asyncio.StreamReader) -> bytes:
+    # The reader PipeTransport.run used before FrameReader.
+    buffer = await stream.readexactly(4)
+    length = int.from_bytes(buffer, byteorder="little", signed=False)
+    buffer = bytes(0)
+    while length:
+        to_read = min(length, 32768)
+        data = await stream.readexactly(to_read)
+        length -= to_read
+        if len(buffer):
+            buffer = buffer + data
+        else:
+            buffer = data
+    return buffer
+
+
+async def _frame_reader_read_frame(
+    stream: asyncio.StreamReader,
+) -> Union[bytes, bytearray]:
+    return await FrameReader(stream).read_frame()
+
+
+async def _feed(stream: asyncio.StreamReader, payload: bytes) -> None:
+    view = memoryview(payload)
+    for start in range(0, len(payload), PIPE_CHUNK_SIZE):
+        end = start + PIPE_CHUNK_SIZE
+        stream.feed_data(view[start:end])
+        # Let the reader consume what has arrived, as a real pipe would.
+        await asyncio.sleep(0)
+    stream.feed_eof()
+
+
+async def _measure(
+    read_frame: Callable[[asyncio.StreamReader], Awaitable[object]],
+    size: int,
+    count: int,
+) -> float:
+    stream = asyncio.StreamReader(limit=32768)
+    payload = _encode_frame(size) * count
+    feeder = asyncio.create_task(_feed(stream, payload))
+    start = time.perf_counter()
+    for _ in range(count):
+        await read_frame(stream)
+    elapsed = time.perf_counter() - start
+    await feeder
+    return elapsed
+
+
+async def main() -> None:
+    readers: List = [
+        ("legacy", _legacy_read_frame),
+        ("FrameReader", _frame_reader_read_frame),
+    ]
+    for label, size, count in FRAME_SIZES:
+        for name, read_frame in readers:
+            elapsed = await _measure(read_frame, size, count)
+            throughput = size * count / elapsed / (1024 * 1024)
+            print(
+                f"{label:>6} x {count:<5} {name:<12} {elapsed:8.3f}s {throughput:10.1f} MB/s"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
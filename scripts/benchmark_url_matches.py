@@ -0,0 +1,147 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Measures how many request URLs per second are matched against a set of 50
+# route globs, as done for every intercepted request.
+# Usage: python scripts/benchmark_url_matches.py
+
+import re
+import time
+from typing import Callable, List, Optional
+
+from playwright_firefox._impl._helper import (
+    RouteHandler,
+    URLMatch,
+    resolve_glob_to_regex_pattern,
+    url_matches,
+)
+
+ROUNDS = 20
+BASE_URL = "https://app.example.com/"
+
+GLOBS = [
+    "**/*.{png,jpg,jpeg,gif,webp,svg,ico}",
+    "**/*.{woff,woff2,ttf,otf}",
+    "**/*.css",
+    "**/*.js",
+    "**/*.map",
+    "**/analytics/**",
+    "**/collect?*",
+    "**/gtag/js*",
+    "**/pixel.gif*",
+    "https://fonts.googleapis.com/**",
+    "https://fonts.gstatic.com/**",
+    "https://cdn.example.com/**",
+    "https://*.doubleclick.net/**",
+    "https://www.google-analytics.com/**",
+    "https://sentry.io/api/*/envelope/**",
+    "https://api.example.com/v1/users",
+    "https://api.example.com/v1/users/*",
+    "https://api.example.com/v1/users/*/settings",
+    "https://api.example.com/v1/orders?*",
+    "https://api.example.com/v1/orders/*",
+    "https://api.example.com/v1/orders/*/items",
+    "https://api.example.com/v1/products**",
+    "https://api.example.com/v1/search?q=*",
+    "https://api.example.com/v2/**",
+    "https://auth.example.com/oauth/token",
+    "https://auth.example.com/.well-known/**",
+    "/api/session",
+    "/api/feature-flags",
+    "/api/notifications?*",
+    "/api/graphql",
+    "/static/**",
+    "/assets/**/*.json",
+    "/healthz",
+    "/favicon.ico",
+    "**/manifest.json",
+    "**/service-worker.js",
+    "**/locales/*/*.json",
+    "**/*.mp4",
+    "**/*.webm",
+    "**/ws/**",
+    "**/upload/**",
+    "**/download/*",
+    "**/reports/*.pdf",
+    "**/exports/*.csv",
+    "**/images/{avatars,banners}/**",
+    "**/embed/**",
+    "**/iframe.html*",
+    "**/__webpack_hmr",
+    "**/sockjs-node/**",
+    "**/*",
+]
+
+URLS = [
+    "https://app.example.com/",
+    "https://app.example.com/static/js/main.3f2a9c.js",
+    "https://app.example.com/static/css/main.8d1e0b.css",
+    "https://app.example.com/api/session",
+    "https://app.example.com/api/notifications?since=1700000000",
+    "https://api.example.com/v1/users/42/settings",
+    "https://api.example.com/v1/orders/1234/items",
+    "https://api.example.com/v1/search?q=shoes",
+    "https://fonts.gstatic.com/s/roboto/v30/KFOmCnqEu92Fr1Mu4mxK.woff2",
+    "https://www.google-analytics.com/g/collect?v=2&tid=G-XXXX",
+    "https://cdn.example.com/images/avatars/42.webp",
+    "https://app.example.com/locales/en/common.json",
+]
+
+
+def _legacy_url_matches(
+    base_url: Optional[str], url_string: str, match: Optional[URLMatch]
+) -> bool:
+    # How url_matches handled globs before they were cached.
+    if not match:
+        return True
+    if isinstance(match, str):
+        match = re.compile(resolve_glob_to_regex_pattern(base_url, match))
+    if isinstance(match, re.Pattern):
+        return bool(match.search(url_string))
+    return match(url_string)
+
+
+def _matcher(
+    url_matches: Callable[[Optional[str], str, Optional[URLMatch]], bool], glob: str
+) -> Callable[[str], bool]:
+    return lambda url: url_matches(BASE_URL, url, glob)
+
+
+def _measure(name: str, matches: List[Callable[[str], bool]]) -> None:
+    start = time.perf_counter()
+    count = 0
+    for _ in range(ROUNDS):
+        for url in URLS:
+            for match in matches:
+                match(url)
+                count += 1
+    elapsed = time.perf_counter() - start
+    print(f"{name:<20} {count / elapsed:12.0f} matches/s")
+
+
+def main() -> None:
+    _measure(
+        "legacy",
+        [_matcher(_legacy_url_matches, glob) for glob in GLOBS],
+    )
+    _measure("cached", [_matcher(url_matches, glob) for glob in GLOBS])
+    handlers = [
+        RouteHandler(BASE_URL, glob, lambda route: None, is_sync=False)
+        for glob in GLOBS
+    ]
+    _measure("route handlers", [handler.matches for handler in handlers])
+
+
+if __name__ == "__main__":
+    main()
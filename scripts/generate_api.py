@@ -12,10 +12,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+import pathlib
 import re
 import sys
 from types import FunctionType
-from typing import Any, Dict, List, Match, Optional, Union, cast, get_args, get_origin
+from typing import (
+    Any,
+    Dict,
+    List,
+    Literal,
+    Match,
+    Optional,
+    Union,
+    cast,
+    get_args,
+    get_origin,
+)
 from typing import get_type_hints as typing_get_type_hints
 
 from playwright_firefox._impl._accessibility import Accessibility
@@ -181,7 +194,58 @@ def short_name(t: Any) -> str:
     return match.group(1)
 
 
-def return_value(value: Any) -> List[str]:
+# Methods returning values deserialized from the page, they never hold handles.
+serialized_value_methods = [
+    "evaluate",
+    "evaluate_all",
+    "eval_on_selector",
+    "eval_on_selector_all",
+    "json_value",
+]
+
+# Values that only hand out copies of their entries, like DeviceDescriptors.
+self_copying_values = ["devices"]
+
+plain_types = [
+    str,
+    int,
+    float,
+    bool,
+    bytes,
+    type(None),
+    pathlib.Path,
+    datetime.datetime,
+]
+
+# Containers that are immutable. Lists and dicts, including the TypedDicts of
+# _api_structures, are still copied by from_maybe_impl, the impl objects can
+# return their own state, e.g. Page.viewport_size or Request.timing.
+plain_containers = [
+    Union,
+    tuple,
+]
+
+
+def is_plain_type(value: Any) -> bool:
+    # Whether values of this type can be returned as is: they never contain
+    # impl objects and can't be mutated.
+    if value in plain_types:
+        return True
+    origin = get_origin(value)
+    if origin is Literal:
+        return True
+    if origin in plain_containers and get_args(value):
+        return all(arg is Ellipsis or is_plain_type(arg) for arg in get_args(value))
+    return False
+
+
+def return_value(value: Any, name: Optional[str] = None) -> List[str]:
+    if (
+        name in serialized_value_methods
+        or name in self_copying_values
+        or is_plain_type(value)
+    ):
+        return ["", ""]
     value_str = str(value)
     if "playwright" not in value_str:
         return ["mapping.from_maybe_impl(", ")"]
@@ -201,6 +265,17 @@ def return_value(value: Any) -> List[str]:
     return ["mapping.from_impl(", ")"]
 
 
+# Long-lived objects that are patched in place, e.g. by playwright_firefox.stealth,
+# keep their __dict__. Other wrappers only hold the slots of their base class.
+classes_with_dict = ["Playwright", "BrowserType", "Browser", "BrowserContext", "Page"]
+
+
+def slots(class_name: str) -> str:
+    if class_name in classes_with_dict:
+        return ""
+    return "    __slots__ = ()\n"
+
+
 header = """
 # Copyright (c) Microsoft Corporation.
 #
@@ -216,6 +291,8 @@ header = """
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+# Annotations are only evaluated on demand, this halves the import time.
+from __future__ import annotations
 
 import typing
 import pathlib
@@ -248,6 +325,7 @@ from playwright_firefox._impl._video import Video as VideoImpl
 from playwright_firefox._impl._tracing import Tracing as TracingImpl
 from playwright_firefox._impl._locator import Locator as LocatorImpl, FrameLocator as FrameLocatorImpl
 from playwright_firefox._impl._errors import Error
+from playwright_firefox._impl._response_cache import ResponseCache
 from playwright_firefox._impl._fetch import APIRequest as APIRequestImpl, APIResponse as APIResponseImpl, APIRequestContext as APIRequestContextImpl
 from playwright_firefox._impl._assertions import PageAssertions as PageAssertionsImpl, LocatorAssertions as LocatorAssertionsImpl, APIResponseAssertions as APIResponseAssertionsImpl
 """
@@ -30,6 +30,7 @@ from generate_api import (
     return_value,
     short_name,
     signature,
+    slots,
 )
 
 documentation_provider = DocumentationProvider(True)
@@ -46,14 +47,14 @@ def generate(t: Any) -> None:
     else:
         base_sync_class = base_class
     print(f"class {class_name}({base_sync_class}):")
-    print("")
+    print(slots(class_name))
     documentation_provider.print_events(class_name)
     for [name, type] in get_type_hints(t, api_globals).items():
         print("")
         print("    @property")
         print(f"    def {name}(self) -> {process_type(type)}:")
         documentation_provider.print_entry(class_name, name, {"return": type}, True)
-        [prefix, suffix] = return_value(type)
+        [prefix, suffix] = return_value(type, name)
         prefix = "        return " + prefix + f"self._impl_obj.{name}"
         print(f"{prefix}{suffix}")
     for [name, value] in t.__dict__.items():
@@ -70,7 +71,7 @@ def generate(t: Any) -> None:
                 class_name, name, get_type_hints(value, api_globals), True
             )
             [prefix, suffix] = return_value(
-                get_type_hints(value, api_globals)["return"]
+                get_type_hints(value, api_globals)["return"], name
             )
             prefix = "        return " + prefix + f"self._impl_obj.{name}"
             print(f"{prefix}{arguments(value, len(prefix))}{suffix}")
@@ -111,7 +112,7 @@ def generate(t: Any) -> None:
                 )
             else:
                 [prefix, suffix] = return_value(
-                    get_type_hints(value, api_globals)["return"]
+                    get_type_hints(value, api_globals)["return"], name
                 )
                 if is_async:
                     prefix += "await "
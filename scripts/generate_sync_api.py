@@ -17,7 +17,7 @@ import inspect
 import re
 import sys
 from types import FunctionType
-from typing import Any
+from typing import Any, List
 
 from documentation_provider import DocumentationProvider
 from generate_api import (
@@ -31,10 +31,28 @@ from generate_api import (
     return_value,
     short_name,
     signature,
+    slots,
 )
 
 documentation_provider = DocumentationProvider(False)
 
+# Converters that the result of a call goes through once it is done. Calls that
+# are queued in a batch return a BatchResult which can't be converted this way.
+post_processing_converters = ["mapping.from_impl_list(", "mapping.from_impl_dict("]
+
+
+def post_processed_methods(t: Any) -> List[str]:
+    return [
+        name
+        for [name, value] in t.__dict__.items()
+        if isinstance(value, FunctionType)
+        and not name.startswith("_")
+        and "expect_" not in name
+        and inspect.iscoroutinefunction(value)
+        and return_value(get_type_hints(value, api_globals)["return"], name)[0]
+        in post_processing_converters
+    ]
+
 
 def generate(t: Any) -> None:
     print("")
@@ -47,14 +65,18 @@ def generate(t: Any) -> None:
     else:
         base_sync_class = base_class
     print(f"class {class_name}({base_sync_class}):")
-    print("")
+    print(slots(class_name))
+    methods = post_processed_methods(t)
+    if methods:
+        print(f"    _post_processed_methods = frozenset({methods!r})")
+        print("")
     documentation_provider.print_events(class_name)
     for [name, type] in get_type_hints(t, api_globals).items():
         print("")
         print("    @property")
         print(f"    def {name}(self) -> {process_type(type)}:")
         documentation_provider.print_entry(class_name, name, {"return": type}, True)
-        [prefix, suffix] = return_value(type)
+        [prefix, suffix] = return_value(type, name)
         prefix = "        return " + prefix + f"self._impl_obj.{name}"
         print(f"{prefix}{suffix}")
     for [name, value] in t.__dict__.items():
@@ -71,7 +93,7 @@ def generate(t: Any) -> None:
                 class_name, name, get_type_hints(value, api_globals), True
             )
             [prefix, suffix] = return_value(
-                get_type_hints(value, api_globals)["return"]
+                get_type_hints(value, api_globals)["return"], name
             )
             prefix = "        return " + prefix + f"self._impl_obj.{name}"
             print(f"{prefix}{arguments(value, len(prefix))}{suffix}")
@@ -103,11 +125,11 @@ def generate(t: Any) -> None:
                 print("        __tracebackhide__ = True")
             if "expect_" in name:
                 print(
-                    f"        return EventContextManager(self, self._impl_obj.{name}({arguments(value, 12)}).future)"
+                    f"        return EventContextManager(self, lambda: self._impl_obj.{name}({arguments(value, 12)}).future)"
                 )
             else:
                 [prefix, suffix] = return_value(
-                    get_type_hints(value, api_globals)["return"]
+                    get_type_hints(value, api_globals)["return"], name
                 )
                 if is_async:
                     prefix += f"self._sync(self._impl_obj.{name}("
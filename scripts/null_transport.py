@@ -0,0 +1,48 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Transports for the benchmarks that run a Connection without a driver.
+
+from typing import Dict, cast
+
+from playwright_firefox._impl._helper import ParsedMessagePayload
+from playwright_firefox._impl._transport import Transport
+
+
+class NullTransport(Transport):
+    """Drops every message sent to the driver."""
+
+    def request_stop(self) -> None:
+        pass
+
+    async def wait_until_stopped(self) -> None:
+        pass
+
+    async def connect(self) -> None:
+        pass
+
+    async def run(self) -> None:
+        pass
+
+    def send(self, message: Dict) -> int:
+        return 0
+
+
+class EchoTransport(NullTransport):
+    """Answers every message with the same result, on the next loop iteration."""
+
+    def send(self, message: Dict) -> int:
+        reply = cast(ParsedMessagePayload, {"id": message["id"], "result": {"v": 1}})
+        self._loop.call_soon(self.on_message, reply, 0)
+        return 0
@@ -18,7 +18,8 @@ from typing import Dict
 
 import pytest
 
-from playwright_firefox.async_api import Page, async_playwright
+from playwright_firefox.async_api import Error, Page, async_playwright
+from playwright_firefox.async_api._context_manager import SharedDriver
 from tests.server import Server
 from tests.utils import TARGET_CLOSED_ERROR_MESSAGE
 
@@ -59,6 +60,71 @@ async def test_async_playwright_stop_multiple_times() -> None:
     await playwright.stop()
 
 
+async def test_shared_async_playwright_should_reuse_the_driver(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("PLAYWRIGHT_SHARED_DRIVER_IDLE_TIMEOUT", "0")
+    async with async_playwright(shared=True) as first:
+        async with async_playwright(shared=True) as second:
+            assert first is not second
+            assert first._impl_obj is second._impl_obj
+        third = await async_playwright(shared=True).start()
+        assert third._impl_obj is first._impl_obj
+        await third.stop()
+        await third.stop()
+
+
+async def test_shared_async_playwright_should_close_the_browsers_of_a_session(
+    monkeypatch: pytest.MonkeyPatch, browser_name: str, launch_arguments: Dict
+) -> None:
+    monkeypatch.setenv("PLAYWRIGHT_SHARED_DRIVER_IDLE_TIMEOUT", "0")
+    async with async_playwright(shared=True) as keeper:
+        kept = await keeper[browser_name].launch(**launch_arguments)
+        for _ in range(2):
+            async with async_playwright(shared=True) as playwright:
+                browser = await playwright[browser_name].launch(**launch_arguments)
+            assert not browser.is_connected()
+        # Only the browsers of the session that ended are closed.
+        assert kept.is_connected()
+    assert not kept.is_connected()
+
+
+async def test_shared_async_playwright_should_dispose_the_request_contexts_of_a_session(
+    monkeypatch: pytest.MonkeyPatch, server: Server
+) -> None:
+    monkeypatch.setenv("PLAYWRIGHT_SHARED_DRIVER_IDLE_TIMEOUT", "0")
+    async with async_playwright(shared=True) as keeper:
+        kept = await keeper.request.new_context()
+        async with async_playwright(shared=True) as playwright:
+            request = await playwright.request.new_context()
+            assert (await request.get(server.EMPTY_PAGE)).ok
+        with pytest.raises(Error):
+            await request.get(server.EMPTY_PAGE)
+        assert (await kept.get(server.EMPTY_PAGE)).ok
+
+
+async def test_shared_driver_should_not_stop_when_reused_after_the_idle_timeout(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("PLAYWRIGHT_SHARED_DRIVER_IDLE_TIMEOUT", "30")
+    driver = SharedDriver(asyncio.get_running_loop())
+    playwright = await driver.acquire()
+    await driver.release([])
+    assert driver._idle_handle
+    # The idle timeout fires, its task is still waiting to run.
+    driver._idle_handle.cancel()
+    driver._on_idle()
+    idle_task = driver._idle_task
+    assert idle_task
+    assert await driver.acquire() is playwright
+    assert idle_task.cancelled()
+    assert driver._idle_task is None
+
+    monkeypatch.setenv("PLAYWRIGHT_SHARED_DRIVER_IDLE_TIMEOUT", "0")
+    await driver.release([])
+    assert driver._manager is None
+
+
 async def test_cancel_pending_protocol_call_on_playwright_stop(server: Server) -> None:
     server.set_route("/hang", lambda _: None)
     playwright = await async_playwright().start()
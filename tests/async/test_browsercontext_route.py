@@ -14,7 +14,7 @@
 
 import asyncio
 import re
-from typing import Awaitable, Callable, List
+from typing import Awaitable, Callable, List, Optional
 
 import pytest
 
@@ -24,6 +24,7 @@ from playwright_firefox.async_api import (
     Error,
     Page,
     Request,
+    ResponseCache,
     Route,
     expect,
 )
@@ -514,3 +515,117 @@ async def test_should_fall_back_async(
 
     await page.goto(server.EMPTY_PAGE)
     assert intercepted == [3, 2, 1]
+
+
+async def test_route_cache_should_share_responses_between_contexts(
+    browser: Browser, server: Server
+) -> None:
+    requests = 0
+
+    def _handle_request(request: TestServerRequest) -> None:
+        nonlocal requests
+        requests += 1
+        request.setHeader("cache-control", "max-age=60")
+        request.setHeader("content-type", "text/html")
+        request.write(b"<div>cached</div>")
+        request.finish()
+
+    server.set_route("/cached.html", _handle_request)
+    store = ResponseCache()
+    for _ in range(2):
+        context = await browser.new_context()
+        await context.route_cache(store=store)
+        page = await context.new_page()
+        await page.goto(server.PREFIX + "/cached.html")
+        await expect(page.locator("div")).to_have_text("cached")
+        await context.close()
+    assert requests == 1
+    stats = store.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hitRate"] == 0.5
+
+
+async def test_route_cache_should_revalidate_stale_responses(
+    browser: Browser, server: Server
+) -> None:
+    validators: List[Optional[str]] = []
+
+    def _handle_request(request: TestServerRequest) -> None:
+        validator = request.getHeader("if-none-match")
+        validators.append(validator)
+        request.setHeader("cache-control", "no-cache")
+        request.setHeader("etag", '"v1"')
+        if validator == '"v1"':
+            request.setResponseCode(304)
+            request.finish()
+            return
+        request.setHeader("content-type", "text/html")
+        request.write(b"<div>revalidated</div>")
+        request.finish()
+
+    server.set_route("/revalidated.html", _handle_request)
+    store = ResponseCache()
+    for _ in range(2):
+        context = await browser.new_context()
+        await context.route_cache(store=store)
+        page = await context.new_page()
+        await page.goto(server.PREFIX + "/revalidated.html")
+        await expect(page.locator("div")).to_have_text("revalidated")
+        await context.close()
+    assert validators == [None, '"v1"']
+    stats = store.stats()
+    assert stats["revalidations"] == 1
+    assert stats["misses"] == 1
+
+
+async def test_route_cache_should_cache_redirects_as_they_are(
+    browser: Browser, server: Server
+) -> None:
+    requests: List[str] = []
+
+    def _handle_redirect(request: TestServerRequest) -> None:
+        requests.append("redirect")
+        request.setResponseCode(301)
+        request.setHeader("cache-control", "max-age=60")
+        request.setHeader("location", "/redirected.html")
+        request.finish()
+
+    def _handle_request(request: TestServerRequest) -> None:
+        requests.append("redirected")
+        request.setHeader("cache-control", "max-age=60")
+        request.setHeader("content-type", "text/html")
+        request.write(b"<div>redirected</div>")
+        request.finish()
+
+    server.set_route("/redirect.html", _handle_redirect)
+    server.set_route("/redirected.html", _handle_request)
+    store = ResponseCache()
+    for _ in range(2):
+        context = await browser.new_context()
+        await context.route_cache(store=store)
+        page = await context.new_page()
+        response = await page.goto(server.PREFIX + "/redirect.html")
+        assert must(response).url == server.PREFIX + "/redirected.html"
+        await expect(page.locator("div")).to_have_text("redirected")
+        await context.close()
+    assert requests == ["redirect", "redirected"]
+    assert store.stats()["entries"] == 2
+    assert store.stats()["hits"] == 2
+
+
+async def test_route_cache_should_fall_back_when_the_fetch_fails(
+    context: BrowserContext, server: Server
+) -> None:
+    await context.route(
+        "**/unreachable.html",
+        lambda route: route.fulfill(
+            content_type="text/html", body="<div>fallback</div>"
+        ),
+    )
+    store = ResponseCache()
+    await context.route_cache(store=store)
+    page = await context.new_page()
+    await page.goto("http://unreachable.invalid/unreachable.html")
+    await expect(page.locator("div")).to_have_text("fallback")
+    assert store.stats()["entries"] == 0
@@ -0,0 +1,87 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import inspect
+import sys
+from typing import Any, Dict
+
+import pytest
+
+from playwright_firefox._impl._connection import CallSite
+from playwright_firefox._impl._errors import Error
+from tests.utils import FakeTransport, create_test_connection
+
+_ERROR = {"error": {"error": {"message": "boom", "name": "Error", "stack": ""}}}
+
+
+@pytest.fixture(params=[False, True], ids=["eager", "lazy"])
+def lazy_call_sites(request: pytest.FixtureRequest, monkeypatch: Any) -> bool:
+    if request.param:
+        monkeypatch.setenv("PLAYWRIGHT_LAZY_CALL_SITES", "1")
+    else:
+        monkeypatch.delenv("PLAYWRIGHT_LAZY_CALL_SITES", raising=False)
+    return request.param
+
+
+def _reply(transport: FakeTransport, reply: Dict) -> None:
+    # Answers the first message once the caller awaits it.
+    asyncio.get_running_loop().call_soon(
+        lambda: transport.receive({"id": transport.sent[0]["id"], **reply})
+    )
+
+
+async def test_should_send_the_api_name_and_location(lazy_call_sites: bool) -> None:
+    connection, transport, root = create_test_connection(asyncio.get_running_loop())
+    assert connection._lazy_call_sites == lazy_call_sites
+
+    _reply(transport, {"result": {}})
+    assert await root._channel.send("noop", None) is None
+    line = inspect.currentframe().f_lineno - 1  # type: ignore
+    metadata: Dict = transport.sent[0]["metadata"]
+    assert metadata["apiName"] == "Channel.send"
+    assert metadata["internal"] is False
+    assert metadata["location"] == {"file": __file__, "line": line, "column": 0}
+
+
+async def test_should_mark_internal_calls(lazy_call_sites: bool) -> None:
+    connection, transport, root = create_test_connection(asyncio.get_running_loop())
+
+    _reply(transport, {"result": {}})
+    await root._channel.send("noop", None, is_internal=True)
+    metadata: Dict = transport.sent[0]["metadata"]
+    assert metadata["apiName"] == ""
+    assert metadata["internal"] is True
+
+
+async def test_should_prefix_errors_with_the_api_name(lazy_call_sites: bool) -> None:
+    connection, transport, root = create_test_connection(asyncio.get_running_loop())
+
+    _reply(transport, _ERROR)
+    with pytest.raises(Error, match="^Channel.send: boom$"):
+        await root._channel.send("noop", None)
+
+
+def test_should_resolve_the_whole_stack_after_a_truncated_parse() -> None:
+    call_site = CallSite(sys._getframe(), None, False, None)
+    truncated = call_site.parse(max_frames=1)
+    assert len(truncated["frames"]) == 1
+    assert truncated["frames"][0]["function"] == (
+        "test_should_resolve_the_whole_stack_after_a_truncated_parse"
+    )
+    assert call_site.parse(max_frames=1) is truncated
+
+    parsed = call_site.parse()
+    assert len(parsed["frames"]) > 1
+    assert parsed["frames"][0] == truncated["frames"][0]
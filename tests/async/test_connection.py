@@ -0,0 +1,173 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import copy
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from playwright_firefox._impl._connection import ChannelOwner
+from tests.utils import create_test_connection
+
+
+async def test_should_reject_pending_calls_on_transport_error() -> None:
+    connection, transport, root = create_test_connection(asyncio.get_running_loop())
+    calls = [
+        asyncio.create_task(root._channel.send("first", None)),
+        asyncio.create_task(root._channel.send("second", None)),
+    ]
+    await asyncio.sleep(0)
+    assert len(transport.sent) == 2
+
+    transport.on_error_future.set_exception(Exception("Driver crashed"))
+    for call in calls:
+        with pytest.raises(Exception, match="Driver crashed"):
+            await asyncio.wait_for(call, 1)
+    assert connection._callbacks == {}
+
+    # Calls made after the failure are rejected without being sent.
+    with pytest.raises(Exception, match="Driver crashed"):
+        await root._channel.send("third", None)
+    assert len(transport.sent) == 2
+
+
+async def test_should_cancel_pending_calls_when_the_transport_is_disposed() -> None:
+    connection, transport, root = create_test_connection(asyncio.get_running_loop())
+    call = asyncio.create_task(root._channel.send("noop", None))
+    await asyncio.sleep(0)
+
+    transport.on_error_future.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(call, 1)
+
+
+async def test_should_not_reject_other_calls_when_a_caller_is_cancelled() -> None:
+    connection, transport, root = create_test_connection(asyncio.get_running_loop())
+    cancelled = asyncio.create_task(root._channel.send("cancelled", None))
+    other = asyncio.create_task(root._channel.send("other", None))
+    await asyncio.sleep(0)
+
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    assert cancelled.cancelled()
+    transport.receive({"id": transport.sent[0]["id"], "result": {}})
+    transport.receive({"id": transport.sent[1]["id"], "result": {"value": 1}})
+    assert await asyncio.wait_for(other, 1) == 1
+
+
+async def test_should_not_modify_the_params_of_the_caller() -> None:
+    connection, transport, root = create_test_connection(asyncio.get_running_loop())
+    target = ChannelOwner(root, "Target", "target@1", {})
+    params: Dict[str, Any] = {
+        "timeout": None,
+        "path": Path("file.txt"),
+        "options": {"skipped": None, "list": [1, {"target": target._channel}]},
+        "targets": (target._channel,),
+    }
+    snapshot = copy.copy(params)
+
+    for timeout in [1000, 2000]:
+        call = asyncio.create_task(
+            root._channel.send("noop", lambda value: value or timeout, params)
+        )
+        await asyncio.sleep(0)
+        transport.receive({"id": transport.sent[-1]["id"], "result": {}})
+        await call
+        assert transport.sent[-1]["params"] == {
+            "timeout": timeout,
+            "path": "file.txt",
+            "options": {"list": [1, {"target": {"guid": "target@1"}}]},
+            "targets": [{"guid": "target@1"}],
+        }
+    assert params == snapshot
+    assert params["options"] == {
+        "skipped": None,
+        "list": [1, {"target": target._channel}],
+    }
+
+
+async def test_should_replace_guids_in_results() -> None:
+    connection, transport, root = create_test_connection(asyncio.get_running_loop())
+    target = ChannelOwner(root, "Target", "target@1", {})
+    call = asyncio.create_task(root._channel.send("noop", None))
+    await asyncio.sleep(0)
+    transport.receive(
+        {
+            "id": transport.sent[0]["id"],
+            "result": {
+                "value": {
+                    "targets": [{"guid": "target@1"}, {"guid": "unknown@1"}],
+                    "nested": {"target": {"guid": "target@1"}, "count": 1},
+                }
+            },
+        }
+    )
+    assert await call == {
+        "targets": [target._channel, {"guid": "unknown@1"}],
+        "nested": {"target": target._channel, "count": 1},
+    }
+
+
+async def test_should_create_the_emitter_state_on_the_first_listener() -> None:
+    connection, transport, root = create_test_connection(asyncio.get_running_loop())
+    target = ChannelOwner(root, "Target", "target@1", {})
+    assert "_events" not in target.__dict__
+    assert "_events" not in target._channel.__dict__
+    target.emit("event", 1)
+    target.remove_all_listeners()
+    assert target.listeners("event") == []
+
+    received: List[int] = []
+    target.on("event", received.append)
+    target.emit("event", 1)
+    assert received == [1]
+    # Other objects keep sharing the empty state.
+    assert "_events" not in ChannelOwner(root, "Other", "other@1", {}).__dict__
+    target.remove_all_listeners("event")
+    target.emit("event", 2)
+    assert received == [1]
+
+
+async def test_should_report_errors_of_async_listeners() -> None:
+    connection, transport, root = create_test_connection(asyncio.get_running_loop())
+    target = ChannelOwner(root, "Target", "target@1", {})
+
+    async def listener(params: Any) -> None:
+        raise Exception("listener failed")
+
+    target._channel.on("event", listener)
+    transport.receive({"guid": "target@1", "method": "event", "params": {}})
+    await asyncio.sleep(0.01)
+    assert str(connection._error) == "listener failed"
+    with pytest.raises(Exception, match="listener failed"):
+        await root._channel.send("noop", None)
+
+
+async def test_should_convert_initializers_on_access() -> None:
+    connection, transport, root = create_test_connection(asyncio.get_running_loop())
+    target = ChannelOwner(root, "Target", "target@1", {})
+    headers = [{"name": "guid", "value": "target@1"}]
+    initializer = {
+        "target": {"guid": "target@1"},
+        "headers": headers,
+        "nested": {"list": [{"guid": "target@1"}]},
+    }
+    owner = connection._create_remote_object(root, "Owner", "owner@1", initializer)
+    # References are resolved right away, target may be disposed later on.
+    target._dispose(None)
+    assert owner._initializer["target"] is target._channel
+    assert owner._initializer["nested"] == {"list": [{"guid": "target@1"}]}
+    assert owner._initializer["headers"] is headers
@@ -11,11 +11,13 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import json
+from pathlib import Path
 from typing import Dict
 
 import pytest
 
-from playwright_firefox.async_api import Playwright
+from playwright_firefox.async_api import Playwright, async_playwright
 
 
 @pytest.mark.only_browser("chromium")
@@ -52,3 +54,45 @@ async def test_should_work(playwright: Playwright, launch_arguments: Dict) -> No
     assert device_descriptor["is_mobile"]
 
     await browser.close()
+
+
+async def test_should_return_a_copy_of_the_descriptor(playwright: Playwright) -> None:
+    assert "Pixel 2" in playwright.devices
+    assert len(playwright.devices) == len(list(playwright.devices))
+    device_descriptor = playwright.devices["Pixel 2"]
+    del device_descriptor["default_browser_type"]
+    device_descriptor["viewport"]["width"] = 1
+    assert playwright.devices["Pixel 2"]["default_browser_type"] == "chromium"
+    assert playwright.devices["Pixel 2"]["viewport"]["width"] > 400
+
+
+async def test_should_copy_and_serialize_the_descriptors(
+    playwright: Playwright,
+) -> None:
+    devices = playwright.devices.copy()
+    assert type(devices) is dict
+    assert devices == dict(playwright.devices) == {**playwright.devices}
+    assert devices["Pixel 2"] == playwright.devices["Pixel 2"]
+    assert devices["Pixel 2"]["user_agent"]
+    assert json.loads(json.dumps(playwright.devices)) == devices
+
+
+async def test_should_not_share_the_descriptors_between_instances(
+    assetdir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(
+        "PLAYWRIGHT_REPLAY_PROTOCOL", str(assetdir / "protocol-recording.ndjson")
+    )
+    monkeypatch.setenv("PLAYWRIGHT_SHARED_DRIVER_IDLE_TIMEOUT", "0")
+    async with (
+        async_playwright() as first,
+        async_playwright(shared=True) as second,
+        async_playwright(shared=True) as third,
+    ):
+        # Shared sessions use the same driver and Playwright object.
+        assert second._impl_obj is third._impl_obj
+        first.devices["First"] = {"user_agent": "first"}
+        second.devices["Second"] = {"user_agent": "second"}
+        assert list(first.devices) == ["First"]
+        assert list(second.devices) == ["Second"]
+        assert list(third.devices) == []
@@ -0,0 +1,140 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+from typing import Any, Dict, List, Tuple, cast
+
+from playwright_firefox._impl._connection import (
+    Channel,
+    ChannelOwner,
+    Connection,
+    EventParams,
+)
+from playwright_firefox._impl._helper import LazyDict, ParsedMessagePayload
+from tests.utils import create_test_connection
+
+
+def _connection() -> Tuple[Connection, ChannelOwner, ChannelOwner]:
+    connection, _, root = create_test_connection(asyncio.get_running_loop())
+    return (
+        connection,
+        ChannelOwner(root, "Source", "source@1", {}),
+        ChannelOwner(root, "Target", "target@1", {}),
+    )
+
+
+def _dispatch(connection: Connection, params: Dict) -> None:
+    connection.dispatch(
+        cast(
+            ParsedMessagePayload,
+            {"guid": "source@1", "method": "event", "params": params},
+        )
+    )
+
+
+def _params() -> Dict:
+    return {
+        "target": {"guid": "target@1"},
+        "list": [{"guid": "target@1"}, {"name": "other"}],
+        "name": "event",
+    }
+
+
+async def test_should_not_convert_params_without_listeners() -> None:
+    connection, source, _ = _connection()
+    params = _params()
+    _dispatch(connection, params)
+    assert params == _params()
+
+
+async def test_should_convert_params_on_access() -> None:
+    connection, source, target = _connection()
+    received: List[Any] = []
+    source._channel.on("event", received.append)
+    params = _params()
+    _dispatch(connection, params)
+    assert len(received) == 1
+    event_params = received[0]
+    assert isinstance(event_params, EventParams)
+    # Nothing is walked until it is read.
+    assert params["target"] == {"guid": "target@1"}
+    assert event_params["target"] is target._channel
+    assert event_params.get("list")[0] is target._channel
+    assert event_params.get("missing", 1) == 1
+    assert event_params["name"] == "event"
+
+
+async def test_should_convert_params_when_copied() -> None:
+    connection, source, target = _connection()
+    received: List[Any] = []
+    source._channel.on("event", received.append)
+    for _ in range(5):
+        _dispatch(connection, _params())
+    expected = {
+        "target": target._channel,
+        "list": [target._channel, {"name": "other"}],
+        "name": "event",
+    }
+    assert dict(received[0]) == expected
+    assert {**received[1]} == expected
+    merged: Dict = {}
+    merged.update(received[1])
+    assert merged == expected
+    assert received[2].copy() == expected
+    assert type(received[2].copy()) is dict
+    assert received[3] == expected
+    assert received[4].pop("target") is target._channel
+    assert received[4].setdefault("list") == expected["list"]
+    assert received[4].popitem() == ("name", "event")
+
+
+async def test_should_serialize_params_with_channels() -> None:
+    connection, source, target = _connection()
+    received: List[Any] = []
+    source._channel.on("event", received.append)
+    _dispatch(connection, _params())
+    _dispatch(connection, _params())
+
+    def default(value: Any) -> Any:
+        assert isinstance(value, Channel)
+        return {"channel": value._guid}
+
+    expected = {
+        "target": {"channel": "target@1"},
+        "list": [{"channel": "target@1"}, {"name": "other"}],
+        "name": "event",
+    }
+    assert json.loads(json.dumps(received[0], default=default)) == expected
+    # indent goes through the pure Python encoder instead of the C one.
+    assert json.loads(json.dumps(received[1], default=default, indent=2)) == expected
+
+
+async def test_should_not_convert_replaced_values() -> None:
+    connection, source, _ = _connection()
+    received: List[Any] = []
+    source._channel.on("event", received.append)
+    _dispatch(connection, _params())
+    event_params = received[0]
+    event_params["target"] = {"guid": "target@1"}
+    event_params.update(list=[{"guid": "target@1"}])
+    assert event_params["target"] == {"guid": "target@1"}
+    assert event_params["list"] == [{"guid": "target@1"}]
+
+
+def test_lazy_dict_should_keep_values_without_a_converter() -> None:
+    value = {"guid": "target@1"}
+    lazy = LazyDict({"target": value, "name": "event"}, {"target"})
+    assert lazy["target"] is value
+    assert lazy == {"target": value, "name": "event"}
@@ -22,7 +22,14 @@ from typing import Awaitable, Callable, cast
 
 import pytest
 
-from playwright_firefox.async_api import Browser, BrowserContext, Error, Page, Route, expect
+from playwright_firefox.async_api import (
+    Browser,
+    BrowserContext,
+    Error,
+    Page,
+    Route,
+    expect,
+)
 from tests.server import Server, TestServerRequest
 from tests.utils import must
 
@@ -270,6 +277,16 @@ async def test_should_page_route_from_har_matching_the_method_and_following_redi
     await expect(page.locator("body")).to_have_css("background-color", "rgb(255, 0, 0)")
 
 
+async def test_should_route_from_har_with_the_python_backend(
+    page: Page, assetdir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("PLAYWRIGHT_HAR_BACKEND", "python")
+    await page.route_from_har(har=assetdir / "har-fulfill.har")
+    await page.goto("http://no.playwright/")
+    assert await page.evaluate("window.value") == "foo"
+    await expect(page.locator("body")).to_have_css("background-color", "rgb(255, 0, 0)")
+
+
 async def test_fallback_continue_should_continue_when_not_found_in_har(
     context: BrowserContext, server: Server, assetdir: Path
 ) -> None:
@@ -520,6 +537,72 @@ async def test_should_round_trip_har_zip(
     )
 
 
+async def test_should_round_trip_har_stream(
+    browser: Browser, server: Server, tmp_path: Path
+) -> None:
+    # The directory of the stream is created like the one of a HAR file.
+    har_path = tmp_path / "recordings" / "har.ndjson"
+    context_1 = await browser.new_context(record_har_path=har_path)
+    page_1 = await context_1.new_page()
+    await page_1.goto(server.PREFIX + "/one-style.html")
+    await context_1.close()
+    with open(har_path) as f:
+        urls = [json.loads(line)["request"]["url"] for line in f]
+    assert server.PREFIX + "/one-style.css" in urls
+
+    context_2 = await browser.new_context()
+    await context_2.route_from_har(har=har_path, not_found="abort")
+    page_2 = await context_2.new_page()
+    await page_2.goto(server.PREFIX + "/one-style.html")
+    assert "hello, world!" in await page_2.content()
+    await expect(page_2.locator("body")).to_have_css(
+        "background-color", "rgb(255, 192, 203)"
+    )
+
+
+async def test_should_rotate_har_stream(
+    browser: Browser,
+    server: Server,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("PLAYWRIGHT_HAR_ROTATE_BYTES", "1")
+    har_path = tmp_path / "har.ndjson"
+    context_1 = await browser.new_context(record_har_path=har_path)
+    page_1 = await context_1.new_page()
+    await page_1.goto(server.PREFIX + "/one-style.html")
+    await context_1.close()
+    assert os.path.exists(tmp_path / "har.1.ndjson")
+
+    context_2 = await browser.new_context()
+    await context_2.route_from_har(har=har_path, not_found="abort")
+    page_2 = await context_2.new_page()
+    await page_2.goto(server.PREFIX + "/one-style.html")
+    await expect(page_2.locator("body")).to_have_css(
+        "background-color", "rgb(255, 192, 203)"
+    )
+
+
+async def test_should_reject_options_har_streams_do_not_support(
+    browser: Browser, tmp_path: Path
+) -> None:
+    har_path = tmp_path / "har.ndjson"
+    contexts = browser.contexts
+    with pytest.raises(Error, match='Content "omit" is not supported'):
+        await browser.new_context(
+            record_har_path=har_path, record_har_omit_content=True
+        )
+    with pytest.raises(Error, match='Mode "minimal" is not supported'):
+        await browser.new_context(record_har_path=har_path, record_har_mode="minimal")
+    assert browser.contexts == contexts
+
+    context = await browser.new_context()
+    with pytest.raises(Error, match='Mode "minimal" is not supported'):
+        await context.route_from_har(har_path, update=True, update_mode="minimal")
+    await context.close()
+    assert not har_path.exists()
+
+
 async def test_should_round_trip_har_with_post_data(
     browser: Browser, server: Server, assetdir: Path, tmp_path: Path
 ) -> None:
@@ -0,0 +1,316 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, cast
+
+import pytest
+
+from playwright_firefox._impl._api_structures import HeadersArray
+from playwright_firefox._impl._errors import Error
+from playwright_firefox._impl._har_backend import (
+    HarBackend,
+    is_in_process_har_enabled,
+)
+from playwright_firefox._impl._har_stream import (
+    HarStreamRecorder,
+    har_stream_segments,
+    read_har_stream,
+)
+
+
+class _Request:
+    """The parts of a Request that HarBackend.lookup reads."""
+
+    def __init__(
+        self,
+        url: str,
+        method: str = "GET",
+        headers: Optional[Dict[str, str]] = None,
+        post_data: Optional[bytes] = None,
+        is_navigation: bool = False,
+    ) -> None:
+        self.url = url
+        self.method = method
+        self.post_data_buffer = post_data
+        self._headers: HeadersArray = [
+            {"name": name, "value": value} for name, value in (headers or {}).items()
+        ]
+        self._is_navigation = is_navigation
+
+    async def headers_array(self) -> HeadersArray:
+        return self._headers
+
+    def is_navigation_request(self) -> bool:
+        return self._is_navigation
+
+
+class _Response:
+    status = 200
+    status_text = "OK"
+
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    async def headers_array(self) -> HeadersArray:
+        return [{"name": "content-type", "value": "text/plain"}]
+
+    async def body(self) -> bytes:
+        return self._body
+
+
+class _FinishedRequest(_Request):
+    """The parts of a finished Request that HarStreamRecorder reads."""
+
+    def __init__(self, url: str, body: bytes) -> None:
+        super().__init__(url)
+        self.timing = {
+            "startTime": 0,
+            "requestStart": 1,
+            "responseStart": 2,
+            "responseEnd": 3,
+        }
+        self._response = _Response(body)
+
+    async def response(self) -> _Response:
+        return self._response
+
+
+async def _lookup(backend: HarBackend, request: _Request) -> Dict:
+    return cast(Dict, await backend.lookup(cast(Any, request)))
+
+
+def _entry(
+    url: str,
+    status: int = 200,
+    text: str = "",
+    method: str = "GET",
+    request_headers: Optional[Dict[str, str]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    post_data: Optional[Dict] = None,
+) -> Dict:
+    request: Dict[str, Any] = {
+        "method": method,
+        "url": url,
+        "headers": [
+            {"name": name, "value": value}
+            for name, value in (request_headers or {}).items()
+        ],
+    }
+    if post_data:
+        request["postData"] = post_data
+    return {
+        "request": request,
+        "response": {
+            "status": status,
+            "headers": [
+                {"name": name, "value": value}
+                for name, value in (headers or {}).items()
+            ],
+            "content": {"text": text},
+        },
+    }
+
+
+def _har(entries: List[Dict]) -> Dict:
+    return {"log": {"entries": entries}}
+
+
+async def test_should_follow_a_redirect_chain(assetdir: Path) -> None:
+    backend = await HarBackend.open(str(assetdir / "har-redirect.har"))
+    result = await _lookup(backend, _Request("https://theverge.com/"))
+    assert result["action"] == "fulfill"
+    assert result["status"] == 200
+    assert result["body"] == "<h1>hello</h1>"
+    backend.dispose()
+
+
+async def test_should_redirect_navigations_to_the_final_url(assetdir: Path) -> None:
+    backend = await HarBackend.open(str(assetdir / "har-redirect.har"))
+    result = await _lookup(
+        backend, _Request("https://theverge.com/", is_navigation=True)
+    )
+    assert result == {"action": "redirect", "redirectURL": "https://www.theverge.com/"}
+    backend.dispose()
+
+
+async def test_should_read_attachments_next_to_the_har(assetdir: Path) -> None:
+    backend = await HarBackend.open(str(assetdir / "har-sha1.har"))
+    result = await _lookup(backend, _Request("http://no.playwright/"))
+    assert result["action"] == "fulfill"
+    assert result["body"] == (assetdir / "har-sha1-main-response.txt").read_bytes()
+    assert await _lookup(backend, _Request("http://no.playwright/missing")) == {
+        "action": "noentry"
+    }
+
+
+async def test_should_match_post_data_by_digest() -> None:
+    backend = HarBackend(
+        _har(
+            [
+                _entry(
+                    "http://no.playwright/api",
+                    method="POST",
+                    text="first",
+                    post_data={"mimeType": "text/plain", "text": "one"},
+                ),
+                _entry(
+                    "http://no.playwright/api",
+                    method="POST",
+                    text="second",
+                    post_data={"mimeType": "text/plain", "text": "two"},
+                ),
+            ]
+        )
+    )
+    for post_data, body in [(b"one", "first"), (b"two", "second")]:
+        result = await _lookup(
+            backend,
+            _Request("http://no.playwright/api", method="POST", post_data=post_data),
+        )
+        assert result["body"] == body
+    result = await _lookup(
+        backend,
+        _Request("http://no.playwright/api", method="POST", post_data=b"three"),
+    )
+    assert result == {"action": "noentry"}
+
+
+async def test_should_match_multipart_post_data_without_the_boundary() -> None:
+    body = '--{0}\r\nContent-Disposition: form-data; name="a"\r\n\r\n1\r\n--{0}--\r\n'
+    backend = HarBackend(
+        _har(
+            [
+                _entry(
+                    "http://no.playwright/upload",
+                    method="POST",
+                    text="uploaded",
+                    request_headers={
+                        "content-type": "multipart/form-data; boundary=recorded"
+                    },
+                    post_data={
+                        "mimeType": "multipart/form-data",
+                        "text": body.format("recorded"),
+                    },
+                )
+            ]
+        )
+    )
+    result = await _lookup(
+        backend,
+        _Request(
+            "http://no.playwright/upload",
+            method="POST",
+            headers={"Content-Type": "multipart/form-data; boundary=replayed"},
+            post_data=body.format("replayed").encode(),
+        ),
+    )
+    assert result["body"] == "uploaded"
+
+
+async def test_should_prefer_the_entry_with_the_most_matching_headers() -> None:
+    backend = HarBackend(
+        _har(
+            [
+                _entry("http://no.playwright/", text="en", request_headers={"a": "en"}),
+                _entry("http://no.playwright/", text="fr", request_headers={"a": "fr"}),
+            ]
+        )
+    )
+    result = await _lookup(
+        backend, _Request("http://no.playwright/", headers={"A": "fr"})
+    )
+    assert result["body"] == "fr"
+    # The first entry wins on a tie.
+    result = await _lookup(
+        backend, _Request("http://no.playwright/", headers={"A": "de"})
+    )
+    assert result["body"] == "en"
+
+
+async def test_should_report_redirect_cycles() -> None:
+    backend = HarBackend(
+        _har(
+            [
+                _entry("http://no.playwright/a", 302, headers={"location": "/b"}),
+                _entry("http://no.playwright/b", 302, headers={"location": "/a"}),
+            ]
+        )
+    )
+    result = await _lookup(backend, _Request("http://no.playwright/a"))
+    assert result == {
+        "action": "error",
+        "message": "HAR error: Found redirect cycle for http://no.playwright/a",
+    }
+
+
+async def test_should_fail_the_lookups_of_a_malformed_har() -> None:
+    backend = HarBackend({"log": {}})
+    result = await _lookup(backend, _Request("http://no.playwright/"))
+    assert result["action"] == "error"
+    assert result["message"].startswith("HAR error: Invalid HAR file")
+
+
+async def test_should_throw_when_the_har_cannot_be_read(tmp_path: Path) -> None:
+    with pytest.raises(Error, match="Failed to read HAR file"):
+        await HarBackend.open(str(tmp_path / "missing.har"))
+    (tmp_path / "broken.zip").write_bytes(b"not a zip")
+    with pytest.raises(Error, match="Failed to read HAR file"):
+        await HarBackend.open(str(tmp_path / "broken.zip"))
+    (tmp_path / "broken.har").write_bytes(b"{")
+    with pytest.raises(Error, match="Failed to read HAR file"):
+        await HarBackend.open(str(tmp_path / "broken.har"))
+
+
+def test_should_look_requests_up_in_the_driver_by_default(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.delenv("PLAYWRIGHT_HAR_BACKEND", raising=False)
+    assert not is_in_process_har_enabled()
+    monkeypatch.setenv("PLAYWRIGHT_HAR_BACKEND", "python")
+    assert is_in_process_har_enabled()
+    monkeypatch.setenv("PLAYWRIGHT_HAR_BACKEND", "node")
+    with pytest.raises(Error, match="PLAYWRIGHT_HAR_BACKEND"):
+        is_in_process_har_enabled()
+
+
+async def test_should_stream_entries_in_order_across_segments(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("PLAYWRIGHT_HAR_ROTATE_BYTES", "1000")
+    path = str(tmp_path / "har.ndjson")
+    recorder = HarStreamRecorder(path, "embed")
+    urls = [f"https://example.com/{i}" for i in range(20)]
+    for url in urls:
+        recorder.on_request_finished(cast(Any, _FinishedRequest(url, url.encode())))
+    await recorder.close()
+
+    assert len(list(har_stream_segments(path))) > 1
+    har = read_har_stream(path)
+    assert [entry["request"]["url"] for entry in har["log"]["entries"]] == urls
+    backend = await HarBackend.open(path)
+    result = await _lookup(backend, _Request(urls[7]))
+    assert result["body"] == urls[7]
+    backend.dispose()
+
+
+async def test_should_reject_options_har_streams_do_not_support(
+    tmp_path: Path,
+) -> None:
+    path = str(tmp_path / "har.ndjson")
+    with pytest.raises(Error, match='Content "omit" is not supported'):
+        HarStreamRecorder(path, "omit")
+    with pytest.raises(Error, match='Mode "minimal" is not supported'):
+        HarStreamRecorder(path, "embed", "minimal")
+    assert not (tmp_path / "har.ndjson").exists()
@@ -12,8 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import inspect
+from typing import Any, List
+
+import pytest
+
+from playwright_firefox._impl._async_base import AsyncBase
+from playwright_firefox._impl._connection import ChannelOwner
 from playwright_firefox.async_api import Page, Response
 from tests.server import Server
+from tests.utils import create_test_connection
 
 
 async def test_listeners(page: Page, server: Server) -> None:
@@ -30,3 +39,32 @@ async def test_listeners(page: Page, server: Server) -> None:
     log = []
     await page.goto(f"{server.PREFIX}/input/textarea.html")
     assert len(log) == 0
+
+
+async def test_should_inspect_handlers_when_they_are_registered(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _, _, root = create_test_connection(asyncio.get_running_loop())
+    target = AsyncBase(ChannelOwner(root, "Target", "target@1", {}))
+    inspected: List[Any] = []
+    signature = inspect.signature
+
+    def inspect_signature(obj: Any) -> inspect.Signature:
+        inspected.append(obj)
+        return signature(obj)
+
+    monkeypatch.setattr(inspect, "signature", inspect_signature)
+    received: List[Any] = []
+
+    def handler(value: Any) -> None:
+        received.append(value)
+
+    target.on("event", handler)
+    assert inspected == [handler]
+    target._impl_obj.emit("event", 1, "ignored")
+    target._impl_obj.emit("event", 2, "ignored")
+    assert received == [1, 2]
+    target.remove_listener("event", handler)
+    target._impl_obj.emit("event", 3, "ignored")
+    assert received == [1, 2]
+    assert inspected == [handler]
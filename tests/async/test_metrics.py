@@ -0,0 +1,139 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from playwright_firefox._impl._connection import ChannelOwner
+from playwright_firefox.async_api import Error, async_playwright
+from tests.utils import create_test_connection
+
+
+@pytest.fixture
+def metrics_enabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PLAYWRIGHT_PROTOCOL_METRICS", "1")
+    monkeypatch.setenv("PLAYWRIGHT_JSON_CODEC", "json")
+
+
+def _size(message: Dict) -> int:
+    return len(json.dumps(message).encode())
+
+
+async def test_should_count_the_bytes_of_each_message(metrics_enabled: None) -> None:
+    connection, transport, root = create_test_connection(asyncio.get_running_loop())
+    page = ChannelOwner(root, "Page", "page@1", {})
+    page._channel.on("console", lambda params: None)
+    metrics = connection._metrics
+    assert metrics
+
+    call = asyncio.create_task(page._channel.send("title", None))
+    await asyncio.sleep(0)
+    # An event sent in between must not be attributed to the call.
+    event = {"guid": "page@1", "method": "console", "params": {"text": "hello"}}
+    transport.receive(event)
+    transport.receive({"guid": "page@1", "method": "crash", "params": {}})
+    response = {"id": transport.sent[0]["id"], "result": {"value": "Title"}}
+    transport.receive(response)
+    assert await call == "Title"
+
+    snapshot = metrics.snapshot()
+    assert snapshot["inFlight"] == 0
+    title = snapshot["methods"]["Page.title"]
+    assert title["count"] == 1
+    assert title["errors"] == 0
+    assert title["requestBytes"] == _size(transport.sent[0])
+    assert title["responseBytes"] == _size(response)
+    assert snapshot["events"]["Page.console"]["count"] == 1
+    assert snapshot["events"]["Page.console"]["bytes"] == _size(event)
+    # Events without listeners are counted as well.
+    assert snapshot["events"]["Page.crash"]["count"] == 1
+
+
+async def test_should_notify_listeners_until_removed(metrics_enabled: None) -> None:
+    connection, transport, root = create_test_connection(asyncio.get_running_loop())
+    metrics = connection._metrics
+    assert metrics
+    samples: List[Dict[str, Any]] = []
+
+    def failing_listener(sample: Dict) -> None:
+        raise Exception("exporter failed")
+
+    metrics.add_listener(failing_listener)
+    metrics.add_listener(samples.append)
+
+    async def call(method: str, reply: Dict) -> None:
+        task = asyncio.create_task(root._channel.send(method, None))
+        await asyncio.sleep(0)
+        transport.receive({"id": transport.sent[-1]["id"], **reply})
+        await task
+
+    await call("first", {"result": {}})
+    with pytest.raises(Error, match="boom"):
+        await call(
+            "second",
+            {"error": {"error": {"message": "boom", "name": "Error", "stack": ""}}},
+        )
+    assert [(s["type"], s["method"], s["error"]) for s in samples] == [
+        ("call", "Root.first", False),
+        ("call", "Root.second", True),
+    ]
+
+    metrics.remove_listener(samples.append)
+    metrics.remove_listener(samples.append)
+    await call("third", {"result": {}})
+    assert len(samples) == 2
+    assert metrics.snapshot()["methods"]["Root.third"]["count"] == 1
+
+
+async def test_should_expose_metrics_on_playwright(
+    assetdir: Path, monkeypatch: pytest.MonkeyPatch, metrics_enabled: None
+) -> None:
+    monkeypatch.setenv(
+        "PLAYWRIGHT_REPLAY_PROTOCOL", str(assetdir / "protocol-recording.ndjson")
+    )
+    samples: List[Dict[str, Any]] = []
+
+    def listener(sample: Dict[str, Any]) -> None:
+        samples.append(sample)
+
+    async with async_playwright() as p:
+        p.add_metrics_listener(listener)
+        await p.firefox.launch()
+        p.remove_metrics_listener(listener)
+        with pytest.raises(Error):
+            await p.firefox.launch(executable_path="/nonexistent")
+        metrics = p.metrics()
+    launch = metrics["methods"]["BrowserType.launch"]
+    assert launch["count"] == 2
+    assert launch["errors"] == 1
+    assert launch["requestBytes"] > 0
+    assert launch["responseBytes"] > 0
+    assert sum(launch["latencyHistogram"].values()) == 2
+    assert [sample["method"] for sample in samples] == ["BrowserType.launch"]
+
+
+async def test_should_fail_when_metrics_are_disabled(
+    assetdir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv("PLAYWRIGHT_PROTOCOL_METRICS", raising=False)
+    monkeypatch.setenv(
+        "PLAYWRIGHT_REPLAY_PROTOCOL", str(assetdir / "protocol-recording.ndjson")
+    )
+    async with async_playwright() as p:
+        with pytest.raises(Error, match="PLAYWRIGHT_PROTOCOL_METRICS=1"):
+            p.metrics()
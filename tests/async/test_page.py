@@ -1459,3 +1459,11 @@ async def test_page_should_ignore_deprecated_is_hidden_and_visible_timeout(
     await page.set_content("<div>foo</div>")
     assert await page.is_hidden("div", timeout=10) is False
     assert await page.is_visible("div", timeout=10) is True
+
+
+async def test_viewport_size_should_return_a_copy(page: Page) -> None:
+    await page.set_viewport_size({"width": 456, "height": 789})
+    viewport_size = page.viewport_size
+    assert viewport_size
+    viewport_size["width"] = 1
+    assert page.viewport_size == {"width": 456, "height": 789}
@@ -21,7 +21,7 @@ from typing import Callable, List, Optional
 import pytest
 
 from playwright_firefox._impl._glob import glob_to_regex_pattern
-from playwright_firefox._impl._helper import url_matches
+from playwright_firefox._impl._helper import RouteHandler, RouteIndex, url_matches
 from playwright_firefox.async_api import (
     Browser,
     BrowserContext,
@@ -1178,6 +1178,44 @@ async def test_should_work_with_glob() -> None:
     )
 
 
+async def test_route_handler_should_match_everything_with_an_empty_url() -> None:
+    handler = RouteHandler("https://app.example.com/", "", lambda route: None, False)
+    assert handler.matches("https://example.com/foo/bar?id=123")
+
+
+async def test_route_index_should_keep_the_handler_order() -> None:
+    base_url = "https://app.example.com/"
+    handlers = [
+        RouteHandler(base_url, url, lambda route: None, False)
+        for url in [
+            "https://cdn.example.com/**",
+            "/api/*",
+            re.compile(r"\.js$"),
+            "**/*.js",
+            "https://cdn.example.com/lib/*.js",
+            lambda url: url.endswith(".css"),
+        ]
+    ]
+    index = RouteIndex()
+
+    def first_match(url: str) -> Optional[RouteHandler]:
+        return next(
+            (h for h in index.candidates(handlers, url) if h.matches(url)), None
+        )
+
+    assert first_match("https://cdn.example.com/lib/a.js") is handlers[0]
+    assert first_match("https://app.example.com/api/users") is handlers[1]
+    assert first_match("https://other.example.com/a.js") is handlers[2]
+    assert first_match("https://other.example.com/a.css") is handlers[5]
+    assert first_match("https://other.example.com/") is None
+    # The index is only rebuilt once it was invalidated.
+    removed = handlers.pop(0)
+    assert first_match("https://cdn.example.com/lib/a.js") is removed
+    index.invalidate()
+    assert first_match("https://cdn.example.com/lib/a.js") is handlers[1]
+    assert first_match("https://cdn.example.com/a.png") is None
+
+
 async def test_should_not_support_question_in_glob_pattern(
     page: Page, playwright: Playwright, server: Server
 ) -> None:
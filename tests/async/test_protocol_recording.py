@@ -0,0 +1,45 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+
+import pytest
+
+from playwright_firefox.async_api import Error, async_playwright
+
+
+async def test_should_replay_a_recording(
+    assetdir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(
+        "PLAYWRIGHT_REPLAY_PROTOCOL", str(assetdir / "protocol-recording.ndjson")
+    )
+    async with async_playwright() as p:
+        assert p.firefox.name == "firefox"
+        browser = await p.firefox.launch()
+        assert browser.version == "135.0"
+        with pytest.raises(Error) as exc_info:
+            await p.firefox.launch(executable_path="/nonexistent")
+        assert "executable doesn't exist at /nonexistent" in exc_info.value.message
+
+
+async def test_should_fail_when_the_replay_diverges(
+    assetdir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(
+        "PLAYWRIGHT_REPLAY_PROTOCOL", str(assetdir / "protocol-recording.ndjson")
+    )
+    async with async_playwright() as p:
+        with pytest.raises(Error, match="Replay diverged"):
+            await p.chromium.launch()
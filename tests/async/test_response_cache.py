@@ -0,0 +1,251 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, cast
+
+from playwright_firefox._impl._errors import Error
+from playwright_firefox._impl._response_cache import (
+    ResponseCache,
+    _cache_control,
+    _freshness,
+)
+
+DATE = "Wed, 21 Oct 2015 07:28:00 GMT"
+
+
+class _Response:
+    """The parts of an APIResponse that ResponseCache reads."""
+
+    def __init__(
+        self, headers: Dict[str, str], body: bytes = b"body", status: int = 200
+    ) -> None:
+        self.status = status
+        self.headers = headers
+        self._body = body
+
+    async def body(self) -> bytes:
+        return self._body
+
+
+class _Request:
+    method = "GET"
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.headers: Dict[str, str] = {}
+
+
+class _Route:
+    """The parts of a Route that ResponseCache._handle uses."""
+
+    def __init__(self, url: str, fetch_error: Optional[Error] = None) -> None:
+        self.request = _Request(url)
+        self.fetches: List[Dict] = []
+        self.handled: List[str] = []
+        self._fetch_error = fetch_error
+
+    async def fetch(self, **kwargs: Any) -> _Response:
+        self.fetches.append(kwargs)
+        if self._fetch_error:
+            raise self._fetch_error
+        return _Response(
+            {"cache-control": "max-age=60", "location": "/other"}, b"", 301
+        )
+
+    async def fulfill(self, **kwargs: Any) -> None:
+        self.handled.append("fulfill")
+
+    async def fallback(self) -> None:
+        self.handled.append("fallback")
+
+
+async def _store(
+    cache: ResponseCache,
+    url: str,
+    headers: Dict[str, str],
+    request_headers: Optional[Dict[str, str]] = None,
+    body: bytes = b"body",
+    status: int = 200,
+) -> None:
+    await cache._store(
+        url, request_headers or {}, cast(Any, _Response(headers, body, status))
+    )
+
+
+def test_cache_control_should_parse_directives() -> None:
+    assert _cache_control({}) == {}
+    assert _cache_control(
+        {"cache-control": 'max-age=60, No-Store, private="set-cookie"'}
+    ) == {"max-age": "60", "no-store": None, "private": "set-cookie"}
+
+
+def test_freshness_should_follow_max_age_and_age() -> None:
+    assert _freshness({"cache-control": "max-age=60"}) == 60
+    assert _freshness({"cache-control": "max-age=60", "age": "10"}) == 50
+    assert _freshness({"cache-control": "max-age=60", "age": "100"}) == 0
+    # A shared cache prefers s-maxage.
+    assert _freshness({"cache-control": "max-age=60, s-maxage=120"}) == 120
+    assert (
+        _freshness(
+            {
+                "cache-control": "max-age=60",
+                "date": DATE,
+                "expires": "Wed, 21 Oct 2015 08:28:00 GMT",
+            }
+        )
+        == 60
+    )
+
+
+def test_freshness_should_follow_expires() -> None:
+    assert _freshness({"date": DATE, "expires": "Wed, 21 Oct 2015 07:38:00 GMT"}) == 600
+    assert (
+        _freshness(
+            {"date": DATE, "expires": "Wed, 21 Oct 2015 07:38:00 GMT", "age": "100"}
+        )
+        == 500
+    )
+    # An invalid date means that the response has already expired.
+    assert _freshness({"date": DATE, "expires": "0"}) == 0
+
+
+def test_freshness_should_use_the_last_modified_heuristic() -> None:
+    assert (
+        _freshness({"date": DATE, "last-modified": "Wed, 21 Oct 2015 07:11:20 GMT"})
+        == 100
+    )
+
+
+def test_freshness_should_require_revalidation() -> None:
+    assert _freshness({}) is None
+    assert _freshness({"cache-control": "no-cache, max-age=60"}) is None
+
+
+async def test_should_match_the_variants_of_a_response() -> None:
+    cache = ResponseCache()
+    url = "https://example.com/style.css"
+    headers = {"cache-control": "max-age=60", "vary": "Accept-Language"}
+    await _store(cache, url, headers, {"accept-language": "en"}, b"en")
+    await _store(cache, url, headers, {"accept-language": "fr"}, b"fr")
+    for language in ["en", "fr"]:
+        entry = cache._lookup(url, {"accept-language": language})
+        assert entry and entry.body == language.encode()
+    assert cache._lookup(url, {"accept-language": "de"}) is None
+    assert cache._lookup(url, {}) is None
+    # The same variant replaces the previous one.
+    await _store(cache, url, headers, {"accept-language": "en"}, b"en, again")
+    entry = cache._lookup(url, {"accept-language": "en"})
+    assert entry and entry.body == b"en, again"
+    assert cache.stats()["entries"] == 2
+
+    await _store(cache, "https://example.com/any", {**headers, "vary": "*"})
+    assert cache._lookup("https://example.com/any", {}) is None
+
+
+async def test_should_evict_the_least_recently_used_responses() -> None:
+    cache = ResponseCache(max_bytes=10)
+    headers = {"cache-control": "max-age=60"}
+    await _store(cache, "https://example.com/a", headers, body=b"aaaa")
+    await _store(cache, "https://example.com/b", headers, body=b"bbbb")
+    assert cache._lookup("https://example.com/a", {})
+    await _store(cache, "https://example.com/c", headers, body=b"cccc")
+    assert cache._lookup("https://example.com/a", {})
+    assert cache._lookup("https://example.com/b", {}) is None
+    assert cache._lookup("https://example.com/c", {})
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] == 8
+    # Responses larger than the cache are not stored.
+    await _store(cache, "https://example.com/d", headers, body=b"d" * 11)
+    assert cache._lookup("https://example.com/d", {}) is None
+
+
+async def test_should_not_store_private_responses() -> None:
+    cache = ResponseCache()
+    for index, headers in enumerate(
+        [
+            {"cache-control": "no-store, max-age=60"},
+            {"cache-control": "private, max-age=60"},
+            {},
+        ]
+    ):
+        await _store(cache, f"https://example.com/{index}", headers)
+    await _store(
+        cache,
+        "https://example.com/uncacheable",
+        {"cache-control": "max-age=60"},
+        status=500,
+    )
+    assert cache.stats()["stores"] == 0
+
+
+async def test_should_only_store_authorized_responses_that_are_public() -> None:
+    cache = ResponseCache()
+    authorization = {"authorization": "Bearer token"}
+    await _store(
+        cache, "https://example.com/a", {"cache-control": "max-age=60"}, authorization
+    )
+    assert cache._lookup("https://example.com/a", authorization) is None
+    for index, cache_control in enumerate(["public, max-age=60", "s-maxage=60"]):
+        url = f"https://example.com/{index}"
+        await _store(cache, url, {"cache-control": cache_control}, authorization)
+        assert cache._lookup(url, authorization)
+
+
+async def test_should_not_store_cookies() -> None:
+    cache = ResponseCache()
+    await _store(
+        cache,
+        "https://example.com/",
+        {"cache-control": "max-age=60", "set-cookie": "a=b", "content-length": "4"},
+    )
+    entry = cache._lookup("https://example.com/", {})
+    assert entry and entry.headers == {"cache-control": "max-age=60"}
+
+
+async def test_should_remove_its_files_on_close(tmp_path: Path) -> None:
+    first = ResponseCache(path=tmp_path)
+    second = ResponseCache(path=tmp_path)
+    headers = {"cache-control": "max-age=60"}
+    await _store(first, "https://example.com/", headers, body=b"first")
+    await _store(second, "https://example.com/", headers, body=b"second")
+    # Caches sharing a directory don't overwrite each other's files.
+    assert len(list(tmp_path.iterdir())) == 2
+    for cache, body in [(first, b"first"), (second, b"second")]:
+        entry = cache._lookup("https://example.com/", {})
+        assert entry and await cache._body(entry) == body
+    first.close()
+    assert len(list(tmp_path.iterdir())) == 1
+    assert first.stats()["entries"] == 0
+    second.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_should_fetch_without_following_redirects() -> None:
+    cache = ResponseCache()
+    route = _Route("https://example.com/redirect")
+    await cache._handle(cast(Any, route))
+    assert route.fetches == [{"headers": None, "maxRedirects": 0}]
+    assert route.handled == ["fulfill"]
+    entry = cache._lookup("https://example.com/redirect", {})
+    assert entry and entry.status == 301
+
+
+async def test_should_fall_back_when_the_fetch_fails() -> None:
+    cache = ResponseCache()
+    route = _Route("https://example.com/", Error("net::ERR_NAME_NOT_RESOLVED"))
+    await cache._handle(cast(Any, route))
+    assert route.handled == ["fallback"]
+    assert cache.stats()["misses"] == 0
@@ -0,0 +1,162 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from playwright_firefox._impl._helper import ParsedMessagePayload
+from playwright_firefox._impl._transport import WRITE_HIGH_WATER_MARK, PipeTransport
+
+
+class _Process:
+    """The parts of a driver process that PipeTransport.run reads."""
+
+    def __init__(self, messages: List[Dict]) -> None:
+        self.stdout = asyncio.StreamReader()
+        for message in messages:
+            data = json.dumps(message).encode()
+            self.stdout.feed_data(len(data).to_bytes(4, byteorder="little") + data)
+        self.stdout.feed_eof()
+        self.stdin = object()
+
+    async def communicate(self) -> None:
+        pass
+
+
+async def _run(transport: PipeTransport, messages: List[Dict]) -> None:
+    transport._proc = _Process(messages)  # type: ignore
+    transport._stopped_future = asyncio.get_running_loop().create_future()
+    await transport.run()
+    # The fake driver closes its output after the last message.
+    assert transport.on_error_future.exception()
+
+
+async def test_should_resume_callers_before_dispatching_the_next_message() -> None:
+    transport = PipeTransport(asyncio.get_running_loop())
+    response: asyncio.Future = asyncio.get_running_loop().create_future()
+    listeners: List[Callable[[ParsedMessagePayload], Any]] = []
+    events: List[ParsedMessagePayload] = []
+
+    def on_message(message: ParsedMessagePayload, size: int) -> None:
+        if "id" in message:
+            response.set_result(message)
+            return
+        for listener in listeners:
+            listener(message)
+
+    async def caller() -> None:
+        await response
+        listeners.append(events.append)
+
+    transport.on_message = on_message
+    caller_task = asyncio.create_task(caller())
+    # The response and the event that follows it arrive in the same read.
+    await _run(
+        transport,
+        [
+            {"id": 1, "result": {}},
+            {"guid": "page@1", "method": "console", "params": {}},
+        ],
+    )
+    await caller_task
+    assert [event["method"] for event in events] == ["console"]
+
+
+class _Output:
+    """The parts of the driver's stdin that PipeTransport writes to."""
+
+    def __init__(self) -> None:
+        self.writes: List[bytes] = []
+        self.buffered = 0
+        self.drained = asyncio.Event()
+        self.drain_error: Optional[Exception] = None
+        self.transport = self
+
+    def write(self, data: bytes) -> None:
+        self.writes.append(data)
+
+    def get_write_buffer_size(self) -> int:
+        return self.buffered
+
+    async def drain(self) -> None:
+        if self.drain_error:
+            raise self.drain_error
+        await self.drained.wait()
+        self.buffered = 0
+
+
+def _transport_with_output() -> Tuple[PipeTransport, _Output]:
+    transport = PipeTransport(asyncio.get_running_loop())
+    output = _Output()
+    transport._output = output  # type: ignore
+    return transport, output
+
+
+def _frames(data: bytes) -> List[Dict]:
+    messages = []
+    while data:
+        length = int.from_bytes(data[:4], byteorder="little")
+        end = 4 + length
+        messages.append(json.loads(data[4:end]))
+        data = data[end:]
+    return messages
+
+
+async def test_should_coalesce_messages_sent_in_the_same_iteration() -> None:
+    transport, output = _transport_with_output()
+    flushes: List[int] = []
+    transport.on_flush = lambda messages, buffered: flushes.append(messages)
+    for id in range(1, 5):
+        transport.send({"id": id, "guid": "", "method": "noop", "params": {}})
+    # The first message does not wait for the next loop iteration.
+    assert [_frames(data) for data in output.writes] == [
+        [{"id": 1, "guid": "", "method": "noop", "params": {}}]
+    ]
+    await asyncio.sleep(0)
+    assert len(output.writes) == 2
+    assert [message["id"] for message in _frames(output.writes[1])] == [2, 3, 4]
+    assert flushes == [1, 3]
+
+    transport.send({"id": 5, "guid": "", "method": "noop", "params": {}})
+    assert len(output.writes) == 3
+    await asyncio.sleep(0)
+
+
+async def test_should_wait_for_the_driver_above_the_high_water_mark() -> None:
+    transport, output = _transport_with_output()
+    await asyncio.wait_for(transport.drain(), 1)
+
+    transport.send({"id": 1, "guid": "", "method": "noop", "params": {}})
+    transport.send({"id": 2, "guid": "", "method": "noop", "params": {}})
+    output.buffered = WRITE_HIGH_WATER_MARK + 1
+    drain = asyncio.create_task(transport.drain())
+    await asyncio.sleep(0)
+    # Everything is written before waiting on the pipe.
+    assert len(output.writes) == 2
+    assert not drain.done()
+    output.drained.set()
+    await asyncio.wait_for(drain, 1)
+    assert not transport.on_error_future.done()
+
+
+async def test_should_report_write_errors_to_the_connection() -> None:
+    transport, output = _transport_with_output()
+    output.buffered = WRITE_HIGH_WATER_MARK + 1
+    output.drain_error = BrokenPipeError()
+    await transport.drain()
+    error = transport.on_error_future.exception()
+    assert error
+    assert str(error) == "Connection closed while writing to the driver"
+    assert isinstance(error.__cause__, BrokenPipeError)
@@ -12,9 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import inspect
 import multiprocessing
 import os
-from typing import Any, Callable, Dict
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List
 
 import pytest
 
@@ -24,6 +29,7 @@ from playwright_firefox.sync_api import (
     Dialog,
     Error,
     Page,
+    Route,
     TimeoutError,
     sync_playwright,
 )
@@ -358,3 +364,224 @@ def test_should_return_proper_api_name_on_error(page: Page) -> None:
     except Exception as error:
         # Each browser returns slightly different error messages, but they should all start with "Page.evaluate:", because that was the Playwright method where the error originated
         assert str(error).startswith("Page.evaluate:")
+
+
+def test_batch_should_resolve_all_results(page: Page) -> None:
+    page.set_content('<h1>Title</h1><a href="/next">next</a>')
+    with page.batch() as batch:
+        result = batch.evaluate("1 + 2")
+        heading = batch.text_content("h1")
+        href = batch.get_attribute("a", "href")
+        screenshot = batch.screenshot()
+        with pytest.raises(Error, match="only available after the batch has run"):
+            result.value
+    assert result.value == 3
+    assert heading.value == "Title"
+    assert href.value == "/next"
+    assert screenshot.value.startswith(b"\x89PNG")
+
+
+def test_batch_should_report_errors_per_call(page: Page) -> None:
+    with page.batch() as batch:
+        ok = batch.evaluate("1")
+        failed = batch.evaluate("does_not_exist")
+    assert ok.value == 1
+    with pytest.raises(Error) as exc_info:
+        failed.value
+    assert str(exc_info.value).startswith("Page.evaluate:")
+
+
+def test_batch_should_reject_calls_that_are_not_batchable(page: Page) -> None:
+    with page.batch() as batch:
+        with pytest.raises(Error, match="locator\\(\\) cannot be batched"):
+            batch.locator("h1")
+        with pytest.raises(Error, match="query_selector_all\\(\\) cannot be batched"):
+            batch.query_selector_all("h1")
+        title = batch.title()
+    assert title.value == ""
+
+
+def test_thread_safe_playwright_should_serve_worker_threads(
+    server: Server, browser_name: str, launch_arguments: Dict[str, Any]
+) -> None:
+    with sync_playwright(thread_safe=True) as playwright:
+        browser = playwright[browser_name].launch(**launch_arguments)
+
+        def work(i: int) -> Any:
+            page = browser.new_page()
+            page.goto(server.EMPTY_PAGE)
+            with page.expect_console_message() as message_info:
+                page.evaluate("i => console.log(i * 2)", i)
+            page.close()
+            return message_info.value.text
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            assert list(executor.map(work, range(8))) == [str(i * 2) for i in range(8)]
+        browser.close()
+
+
+def test_thread_safe_playwright_should_run_handlers_in_dispatcher_thread(
+    server: Server, browser_name: str, launch_arguments: Dict[str, Any]
+) -> None:
+    threads: List[str] = []
+    with sync_playwright(thread_safe=True) as playwright:
+        browser = playwright[browser_name].launch(**launch_arguments)
+
+        def work() -> None:
+            page = browser.new_page()
+            page.on(
+                "request", lambda _: threads.append(threading.current_thread().name)
+            )
+            page.goto(server.EMPTY_PAGE)
+            page.close()
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(work).result()
+        browser.close()
+    assert threads == ["playwright-dispatcher"]
+
+
+def test_shared_playwright_should_restart_a_stopped_driver(
+    monkeypatch: pytest.MonkeyPatch,
+    browser_name: str,
+    launch_arguments: Dict[str, Any],
+) -> None:
+    monkeypatch.setenv("PLAYWRIGHT_SHARED_DRIVER_IDLE_TIMEOUT", "0")
+    with sync_playwright(shared=True) as first:
+        with sync_playwright(shared=True) as second:
+            assert first._impl_obj is second._impl_obj
+            browser = second[browser_name].launch(**launch_arguments)
+            browser.close()
+    # The driver was stopped with the last session, a new one is started.
+    with sync_playwright(shared=True) as third:
+        assert third._impl_obj is not first._impl_obj
+        browser = third[browser_name].launch(**launch_arguments)
+        assert browser.is_connected()
+        browser.close()
+
+
+def test_shared_playwright_should_close_the_browsers_of_a_session(
+    monkeypatch: pytest.MonkeyPatch,
+    browser_name: str,
+    launch_arguments: Dict[str, Any],
+) -> None:
+    monkeypatch.setenv("PLAYWRIGHT_SHARED_DRIVER_IDLE_TIMEOUT", "0")
+    with sync_playwright(shared=True) as keeper:
+        kept = keeper[browser_name].launch(**launch_arguments)
+        for _ in range(2):
+            with sync_playwright(shared=True) as playwright:
+                browser = playwright[browser_name].launch(**launch_arguments)
+                context = playwright[browser_name].launch_persistent_context(
+                    "", **launch_arguments
+                )
+            assert not browser.is_connected()
+            with pytest.raises(Error):
+                context.new_page()
+        # Only the browsers of the session that ended are closed.
+        assert kept.is_connected()
+    assert not kept.is_connected()
+
+
+def test_shared_playwright_should_dispose_the_request_contexts_of_a_session(
+    monkeypatch: pytest.MonkeyPatch, server: Server
+) -> None:
+    monkeypatch.setenv("PLAYWRIGHT_SHARED_DRIVER_IDLE_TIMEOUT", "0")
+    with sync_playwright(shared=True) as keeper:
+        kept = keeper.request.new_context()
+        with sync_playwright(shared=True) as playwright:
+            request = playwright.request.new_context()
+            assert request.get(server.EMPTY_PAGE).ok
+        with pytest.raises(Error):
+            request.get(server.EMPTY_PAGE)
+        assert kept.get(server.EMPTY_PAGE).ok
+
+
+def test_greenlet_profile_should_report_the_longest_handler(
+    monkeypatch: pytest.MonkeyPatch,
+    server: Server,
+    browser_name: str,
+    launch_arguments: Dict[str, Any],
+) -> None:
+    monkeypatch.setenv("PLAYWRIGHT_GREENLET_PROFILE", "1")
+    with sync_playwright() as playwright:
+        browser = playwright[browser_name].launch(**launch_arguments)
+        page = browser.new_page()
+
+        def handler(route: Route) -> None:
+            time.sleep(0.1)
+            route.continue_()
+
+        page.route("**/*", handler)
+        page.goto(server.EMPTY_PAGE)
+        profile = playwright.greenlet_profile()
+        browser.close()
+    assert profile["switches"]["RouteGreenlet"] >= 1
+    assert profile["handlerMs"] >= 100
+    longest = profile["longestHandler"]
+    assert longest["greenlet"] == "RouteGreenlet"
+    assert longest["ms"] >= 100
+    assert "test_sync.py" in longest["location"]
+
+
+def test_protocol_metrics_should_count_calls_and_notify_listeners(
+    assetdir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("PLAYWRIGHT_PROTOCOL_METRICS", "1")
+    monkeypatch.setenv(
+        "PLAYWRIGHT_REPLAY_PROTOCOL", str(assetdir / "protocol-recording.ndjson")
+    )
+    samples: List[Dict[str, Any]] = []
+
+    def listener(sample: Dict[str, Any]) -> None:
+        samples.append(sample)
+
+    with sync_playwright() as playwright:
+        playwright.add_metrics_listener(listener)
+        playwright.firefox.launch()
+        playwright.remove_metrics_listener(listener)
+        with pytest.raises(Error):
+            playwright.firefox.launch(executable_path="/nonexistent")
+        metrics = playwright.metrics()
+    launch = metrics["methods"]["BrowserType.launch"]
+    assert launch["count"] == 2
+    assert launch["errors"] == 1
+    assert launch["requestBytes"] > 0
+    assert launch["responseBytes"] > 0
+    assert metrics["inFlight"] == 0
+    # The sync API hands out Playwright before the initialize call completes.
+    launches = [sample for sample in samples if sample["method"] != "Root.initialize"]
+    assert [sample["method"] for sample in launches] == ["BrowserType.launch"]
+    assert launches[0]["error"] is False
+
+
+@pytest.mark.parametrize("lazy_call_sites", [False, True], ids=["eager", "lazy"])
+def test_should_point_errors_at_the_calling_code(
+    assetdir: Path, monkeypatch: pytest.MonkeyPatch, lazy_call_sites: bool
+) -> None:
+    if lazy_call_sites:
+        monkeypatch.setenv("PLAYWRIGHT_LAZY_CALL_SITES", "1")
+    else:
+        monkeypatch.delenv("PLAYWRIGHT_LAZY_CALL_SITES", raising=False)
+    monkeypatch.setenv(
+        "PLAYWRIGHT_REPLAY_PROTOCOL", str(assetdir / "protocol-recording.ndjson")
+    )
+    with sync_playwright() as playwright:
+        transport = playwright._impl_obj._connection._transport
+        sent: List[Dict] = []
+        send = transport.send
+
+        def record(message: Dict) -> int:
+            sent.append(message)
+            return send(message)
+
+        monkeypatch.setattr(transport, "send", record)
+        playwright.firefox.launch()
+        with pytest.raises(Error) as exc_info:
+            playwright.firefox.launch(executable_path="/nonexistent")
+        line = inspect.currentframe().f_lineno - 1  # type: ignore
+    assert sent[-1]["metadata"]["location"] == {
+        "file": __file__,
+        "line": line,
+        "column": 0,
+    }
+    assert f'File "{__file__}", line {line}' in exc_info.value.stack
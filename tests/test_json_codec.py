@@ -0,0 +1,99 @@
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import math
+from typing import Any
+
+import pytest
+
+from playwright_firefox._impl._js_handle import serialize_argument
+from playwright_firefox._impl._json_codec import (
+    JSON_CODECS,
+    JsonCodec,
+    StdlibJsonCodec,
+    get_json_codec,
+)
+
+
+@pytest.fixture(params=list(JSON_CODECS))
+def codec(request: pytest.FixtureRequest) -> JsonCodec:
+    if request.param != "json":
+        pytest.importorskip(request.param)
+    return get_json_codec(request.param)
+
+
+def _evaluate_message(arg: Any) -> dict:
+    return {
+        "id": 7,
+        "guid": "frame@1",
+        "method": "evaluateExpression",
+        "params": {"expression": "a => a", "isFunction": True, "arg": arg},
+        "metadata": {"wallTime": 1700000000000, "apiName": "Page.evaluate"},
+    }
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "héllo wörld 你好 \U0001f600",
+        "\ud800 lone surrogate",
+        'quotes " and \\ and \n control \x00 characters',
+        2**53,
+        2**64,
+        -(2**70),
+        0.1,
+        -0.0,
+        math.nan,
+        math.inf,
+        -math.inf,
+        [1, [2, {"a": None}], True],
+        {"é": "é", "nested": {"list": [1.5, "x"]}},
+    ],
+)
+def test_should_encode_arguments_like_the_stdlib(codec: JsonCodec, value: Any) -> None:
+    message = _evaluate_message(serialize_argument(value))
+    stdlib = StdlibJsonCodec()
+    assert json.loads(codec.encode(message)) == json.loads(stdlib.encode(message))
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        '{"id":1,"result":{"value":{"s":"héllo 你好 \U0001f600"}}}',
+        '{"id":1,"result":{"value":{"s":"\\u00e9\\ud83d\\ude00\\n\\"\\\\"}}}',
+        '{"id":1,"result":{"value":{"n":9007199254740991}}}',
+        '{"id":1,"result":{"value":{"n":18446744073709551615}}}',
+        '{"id":1,"result":{"value":{"n":-9223372036854775808}}}',
+        '{"id":1,"result":{"value":{"n":1.7976931348623157e+308}}}',
+        '{"id":1,"result":{"value":{"n":5e-324}}}',
+        '{"id":1,"result":{"value":{"v":"NaN"}}}',
+        '{"guid":"page@1","method":"console","params":{"text":"","args":[]}}',
+    ],
+)
+def test_should_decode_driver_messages_like_the_stdlib(
+    codec: JsonCodec, data: str
+) -> None:
+    assert codec.decode(data.encode()) == json.loads(data)
+    assert codec.decode(bytearray(data.encode())) == json.loads(data)
+
+
+def test_should_pick_the_codec_from_the_environment(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("PLAYWRIGHT_JSON_CODEC", "json")
+    assert get_json_codec().name == "json"
+    monkeypatch.setenv("PLAYWRIGHT_JSON_CODEC", "yaml")
+    with pytest.raises(ValueError, match="Unknown JSON codec 'yaml'"):
+        get_json_codec()
@@ -12,7 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Optional, TypeVar
+import asyncio
+from typing import Dict, List, Optional, Tuple, TypeVar
+
+from playwright_firefox._impl._connection import (
+    ChannelOwner,
+    Connection,
+    RootChannelOwner,
+)
+from playwright_firefox._impl._transport import Transport
 
 TARGET_CLOSED_ERROR_MESSAGE = "Target page, context or browser has been closed"
 
@@ -33,3 +41,46 @@ def chromium_version_less_than(a: str, b: str) -> bool:
         if left[i] < right[i]:
             return True
     return False
+
+
+class FakeTransport(Transport):
+    """A transport without a driver, it keeps the messages sent to it."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        super().__init__(loop)
+        self.sent: List[Dict] = []
+
+    def request_stop(self) -> None:
+        pass
+
+    async def wait_until_stopped(self) -> None:
+        pass
+
+    async def connect(self) -> None:
+        pass
+
+    async def run(self) -> None:
+        pass
+
+    def send(self, message: Dict) -> int:
+        self.sent.append(message)
+        return len(self.serialize_message(message))
+
+    def receive(self, message: Dict) -> None:
+        data = self._json_codec.encode(message)
+        self.on_message(self.deserialize_message(data), len(data))
+
+
+def _create_channel_owner(
+    parent: ChannelOwner, type: str, guid: str, initializer: Dict
+) -> ChannelOwner:
+    return ChannelOwner(parent, type, guid, initializer)
+
+
+def create_test_connection(
+    loop: asyncio.AbstractEventLoop,
+) -> Tuple[Connection, FakeTransport, ChannelOwner]:
+    """A Connection to a FakeTransport, with its root object."""
+    transport = FakeTransport(loop)
+    connection = Connection(None, _create_channel_owner, transport, loop)
+    return connection, transport, RootChannelOwner(connection)